@@ -22,6 +22,8 @@ import sys
 from pathlib import Path
 from typing import NamedTuple
 
+from module_resolver import ModuleResolver, package_name
+
 # ANSI colours (mirrors pre-deploy-qa.py)
 RED  = "\033[91m"
 GRN  = "\033[92m"
@@ -121,6 +123,366 @@ def fmt_hits(hits: list[tuple[Path, int, str]], n: int = 8) -> str:
     return "\n".join(lines)
 
 
+# Member-line rules for interface/type bodies. Every rule is matched against
+# each member line during a single traversal per file (see type_member_hits),
+# so adding a rule here does not add another pass over src/.
+TYPE_MEMBER_RULES: dict[str, re.Pattern[str]] = {
+    "boolean-props": re.compile(r'\b(?:is|has|show|should)[A-Z]\w*\s*\??:'),
+    "render-props":  re.compile(r'\brender[A-Z]\w+\s*\??\s*:'),
+}
+
+_TYPE_BLOCK_START = re.compile(r'\b(?:interface|type)\b.*\{')
+_type_member_cache: dict[str, list[tuple[Path, int, str]]] | None = None
+
+
+def type_member_hits() -> dict[str, list[tuple[Path, int, str]]]:
+    """Return hits per TYPE_MEMBER_RULES key, computed once for all rules.
+
+    Walks every TSX file once, tracks brace depth to find interface/type
+    bodies, and dispatches each line inside a body to every registered rule.
+    """
+    global _type_member_cache
+    if _type_member_cache is not None:
+        return _type_member_cache
+
+    hits: dict[str, list[tuple[Path, int, str]]] = {key: [] for key in TYPE_MEMBER_RULES}
+    rules = list(TYPE_MEMBER_RULES.items())
+    for p in tsx_files():
+        try:
+            lines = p.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            continue
+        in_type_block = False
+        depth = 0
+        for i, line in enumerate(lines, 1):
+            stripped = line.strip()
+            if _TYPE_BLOCK_START.search(stripped):
+                in_type_block = True
+                depth += stripped.count("{") - stripped.count("}")
+            elif in_type_block:
+                depth += stripped.count("{") - stripped.count("}")
+                if depth <= 0:
+                    in_type_block = False
+                    depth = 0
+            if not in_type_block:
+                continue
+            for key, rx in rules:
+                if rx.search(stripped):
+                    hits[key].append((p, i, stripped))
+    _type_member_cache = hits
+    return hits
+
+
+class JsxTag(NamedTuple):
+    name:   str
+    attrs:  dict[str, str | None]  # value is the raw literal/expression; None for bare attrs
+    line:   int
+    text:   str                    # full opening tag source, may span lines
+    spread: bool = False           # tag contains {...props}, so attrs may be incomplete
+
+
+_JSX_TAG_OPEN = re.compile(r'<([A-Za-z][\w.:-]*)')
+_JSX_ATTR_NAME = re.compile(r'[A-Za-z_$][\w$:.-]*')
+_JSX_KEYWORDS_BEFORE_TAG = {"return", "yield", "await", "case", "default", "else"}
+
+
+def _skip_quoted(text: str, i: int) -> int:
+    """Return the index just past the string literal starting at text[i]."""
+    quote = text[i]
+    i += 1
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == quote:
+            return i + 1
+        i += 1
+    return -1
+
+
+def _skip_braces(text: str, i: int) -> int:
+    """Return the index just past the balanced {...} expression at text[i]."""
+    depth = 0
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c in "\"'`":
+            i = _skip_quoted(text, i)
+            if i < 0:
+                return -1
+            continue
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return -1
+
+
+def _parse_jsx_attrs(text: str, i: int) -> tuple[int, dict[str, str | None], bool] | None:
+    """Parse attributes from text[i] up to the closing > or />.
+
+    Returns (end index, attrs, has_spread), or None if the text does not look
+    like a JSX opening tag (TS generics, comparisons, truncated source).
+    """
+    attrs: dict[str, str | None] = {}
+    spread = False
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c.isspace():
+            i += 1
+            continue
+        if c == ">":
+            return i + 1, attrs, spread
+        if text.startswith("/>", i):
+            return i + 2, attrs, spread
+        if c == "{":
+            end = _skip_braces(text, i)
+            if end < 0:
+                return None
+            spread = spread or text[i + 1:end - 1].lstrip().startswith("...")
+            i = end
+            continue
+        m = _JSX_ATTR_NAME.match(text, i)
+        if not m:
+            return None
+        name = m.group(0)
+        i = m.end()
+        while i < n and text[i].isspace():
+            i += 1
+        if i >= n or text[i] != "=":
+            attrs[name] = None
+            continue
+        i += 1
+        while i < n and text[i].isspace():
+            i += 1
+        if i >= n:
+            return None
+        if text[i] in "\"'":
+            end = _skip_quoted(text, i)
+            if end < 0:
+                return None
+            attrs[name] = text[i + 1:end - 1]
+        elif text[i] == "{":
+            end = _skip_braces(text, i)
+            if end < 0:
+                return None
+            attrs[name] = text[i:end]
+        else:
+            return None
+        i = end
+    return None
+
+
+def _opens_jsx(text: str, start: int) -> bool:
+    """Whether the `<` at text[start] opens a JSX tag rather than a TS generic.
+
+    Decided by the previous non-space character: `(`, `,`, `=`, `>`, `}`, `{`
+    and friends, or a keyword like `return`, put the `<` in expression or
+    children position. An identifier written flush against it (`useState<T>`,
+    `Array<string>`) is a generic. An identifier separated by whitespace is
+    JSX text (`Hello <b>`) when the run of text before it starts right after
+    a tag or `{expr}`.
+    """
+    prev = start - 1
+    while prev >= 0 and text[prev].isspace():
+        prev -= 1
+    if prev < 0 or text[prev] in "(,=>}{?:&|[;":
+        return True
+    if text[prev] in ")]":
+        return False
+    if not (text[prev].isalnum() or text[prev] in "_$"):
+        return True
+    word_start = prev
+    while word_start > 0 and (text[word_start - 1].isalnum() or text[word_start - 1] in "_$"):
+        word_start -= 1
+    if text[word_start:prev + 1] in _JSX_KEYWORDS_BEFORE_TAG:
+        return True
+    if prev == start - 1:
+        return False
+    i = word_start - 1
+    while i >= 0 and text[i] not in "<>{}()=":
+        i -= 1
+    return i >= 0 and text[i] in ">}"
+
+
+def extract_jsx_tags(text: str) -> list[JsxTag]:
+    """Return every complete JSX opening tag in text, in a single linear pass.
+
+    Multi-line tags are handled naturally because attributes are parsed from
+    the character stream rather than line by line. Tags nested inside an
+    attribute expression (icon={<Foo />}) are skipped with that expression.
+    """
+    tags: list[JsxTag] = []
+    pos = 0
+    line = 1
+    counted_to = 0
+    while True:
+        m = _JSX_TAG_OPEN.search(text, pos)
+        if not m:
+            break
+        start = m.start()
+        if not _opens_jsx(text, start):
+            pos = m.end()
+            continue
+        parsed = _parse_jsx_attrs(text, m.end())
+        if parsed is None:
+            pos = m.end()
+            continue
+        end, attrs, spread = parsed
+        line += text.count("\n", counted_to, start)
+        counted_to = start
+        tags.append(JsxTag(m.group(1), attrs, line, text[start:end], spread))
+        pos = end
+    return tags
+
+
+_jsx_tag_cache: dict[str, list[tuple[Path, JsxTag]]] | None = None
+
+
+def jsx_tags_by_element() -> dict[str, list[tuple[Path, JsxTag]]]:
+    """Index every JSX opening tag in src/ by element name, computed once per run."""
+    global _jsx_tag_cache
+    if _jsx_tag_cache is not None:
+        return _jsx_tag_cache
+
+    index: dict[str, list[tuple[Path, JsxTag]]] = {}
+    for p in tsx_files():
+        try:
+            text = p.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        for tag in extract_jsx_tags(text):
+            index.setdefault(tag.name, []).append((p, tag))
+    _jsx_tag_cache = index
+    return index
+
+
+# Longest attribute expression shown in a hit before it is cut with an ellipsis.
+TAG_HIT_VALUE_MAX = 48
+
+
+def tag_hit(p: Path, tag: JsxTag, *attrs: str) -> tuple[Path, int, str]:
+    """Hit line for a tag, showing the attributes that triggered the finding.
+
+    Multi-line tags would otherwise be reported as a bare `<div`.
+    """
+    parts = [f"<{tag.name}"]
+    for name in attrs:
+        if name not in tag.attrs:
+            continue
+        value = tag.attrs[name]
+        if value is None:
+            parts.append(name)
+        elif value.startswith("{"):
+            # Multi-line expressions show their first line only; joining the
+            # lines would run separate statements together.
+            first, _, rest = value.partition("\n")
+            first = first.rstrip()
+            if rest or len(first) > TAG_HIT_VALUE_MAX:
+                first = first[:TAG_HIT_VALUE_MAX].rstrip() + "…}"
+            parts.append(f"{name}={first}")
+        else:
+            if len(value) > TAG_HIT_VALUE_MAX:
+                value = value[:TAG_HIT_VALUE_MAX].rstrip() + "…"
+            parts.append(f'{name}="{value}"')
+    if tag.spread:
+        parts.append("{...}")
+    return (p, tag.line, " ".join(parts) + ">")
+
+
+def _is_client_module(text: str) -> bool:
+    head = text.lstrip()[:40]
+    return head.startswith("'use client'") or head.startswith('"use client"')
+
+
+class ModuleGraph(NamedTuple):
+    edges:  dict[Path, list[Path]]
+    client: set[Path]
+    size:   dict[Path, int]
+
+
+_module_graph_cache: ModuleGraph | None = None
+_resolver: ModuleResolver | None = None
+
+
+def resolver() -> ModuleResolver:
+    """One ModuleResolver per run so resolution memos and caches are shared across checks."""
+    global _resolver
+    if _resolver is None:
+        _resolver = ModuleResolver()
+    return _resolver
+
+
+def module_graph() -> ModuleGraph:
+    """Build the src/ import graph once per run.
+
+    Only static value imports are followed: type-only imports are erased and
+    dynamic import() (next/dynamic) becomes a separate chunk, so neither
+    counts toward first-load JS.
+    """
+    global _module_graph_cache
+    if _module_graph_cache is not None:
+        return _module_graph_cache
+
+    res = resolver()
+    edges: dict[Path, list[Path]] = {}
+    client: set[Path] = set()
+    size: dict[Path, int] = {}
+    pending = [p.resolve() for p in ts_tsx_files()]
+    while pending:
+        p = pending.pop()
+        if p in edges:
+            continue
+        try:
+            raw = p.read_bytes()
+        except OSError:
+            edges[p] = []
+            continue
+        size[p] = len(raw)
+        if _is_client_module(raw[:64].decode("utf-8", errors="replace")):
+            client.add(p)
+        edges[p] = res.dependencies(p)
+        pending.extend(edges[p])
+    res.save()
+    _module_graph_cache = ModuleGraph(edges, client, size)
+    return _module_graph_cache
+
+
+def _closure(graph: ModuleGraph, entries: list[Path]) -> set[Path]:
+    seen: set[Path] = set()
+    stack = list(entries)
+    while stack:
+        p = stack.pop()
+        if p in seen:
+            continue
+        seen.add(p)
+        stack.extend(graph.edges.get(p, []))
+    return seen
+
+
+def route_client_modules(graph: ModuleGraph, entries: list[Path]) -> set[Path]:
+    """Modules shipped to the browser for a route: everything below each 'use client' boundary."""
+    shipped: set[Path] = set()
+    seen: set[Path] = set()
+    stack = list(entries)
+    while stack:
+        p = stack.pop()
+        if p in seen:
+            continue
+        seen.add(p)
+        if p in graph.client:
+            shipped |= _closure(graph, [p])
+        else:
+            stack.extend(graph.edges.get(p, []))
+    return shipped
+
+
 # ==============================================================================
 # SECTION 0 — Agent Doc Cross-Reference Guard
 # ==============================================================================
@@ -206,27 +568,7 @@ def check_no_use_context() -> None:
 
 def check_no_boolean_props() -> None:
     """AGENTS.md: boolean props (is*/has*/show*/should*) violate composition rules."""
-    rx = re.compile(r'\b(?:is|has|show|should)[A-Z]\w*\s*\??:')
-    hits: list[tuple[Path, int, str]] = []
-    for p in tsx_files():
-        try:
-            lines = p.read_text(encoding="utf-8", errors="replace").splitlines()
-        except OSError:
-            continue
-        in_type_block = False
-        depth = 0
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if re.search(r'\b(?:interface|type)\b.*\{', stripped):
-                in_type_block = True
-                depth += stripped.count("{") - stripped.count("}")
-            elif in_type_block:
-                depth += stripped.count("{") - stripped.count("}")
-                if depth <= 0:
-                    in_type_block = False
-                    depth = 0
-            if in_type_block and rx.search(stripped):
-                hits.append((p, i, stripped))
+    hits = type_member_hits()["boolean-props"]
     if hits:
         record(
             "WARN",
@@ -247,27 +589,7 @@ def check_no_boolean_props() -> None:
 
 def check_no_render_props_in_types() -> None:
     """AGENTS.md: render prop pattern in Props violates compound component rules."""
-    rx = re.compile(r'\brender[A-Z]\w+\s*\??\s*:')
-    hits: list[tuple[Path, int, str]] = []
-    for p in tsx_files():
-        try:
-            lines = p.read_text(encoding="utf-8", errors="replace").splitlines()
-        except OSError:
-            continue
-        in_type_block = False
-        depth = 0
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if re.search(r'\b(?:interface|type)\b.*\{', stripped):
-                in_type_block = True
-                depth += stripped.count("{") - stripped.count("}")
-            elif in_type_block:
-                depth += stripped.count("{") - stripped.count("}")
-                if depth <= 0:
-                    in_type_block = False
-                    depth = 0
-            if in_type_block and rx.search(stripped):
-                hits.append((p, i, stripped))
+    hits = type_member_hits()["render-props"]
     if hits:
         record(
             "WARN",
@@ -320,17 +642,10 @@ def check_no_multi_boolean_ternaries() -> None:
 
 def check_div_onclick_needs_role() -> None:
     """<div onClick> without role= is not keyboard-accessible (WCAG 2.2 4.1.2)."""
-    hits: list[tuple[Path, int, str]] = []
-    for p in tsx_files():
-        try:
-            for i, line in enumerate(
-                p.read_text(encoding="utf-8", errors="replace").splitlines(), 1
-            ):
-                if re.search(r'<div\b[^>]*onClick[^>]*>', line):
-                    if not re.search(r'\brole\s*=', line):
-                        hits.append((p, i, line.strip()))
-        except OSError:
-            pass
+    hits = [
+        tag_hit(p, tag, "onClick") for p, tag in jsx_tags_by_element().get("div", [])
+        if "onClick" in tag.attrs and "role" not in tag.attrs and not tag.spread
+    ]
     if hits:
         record(
             "WARN",
@@ -348,26 +663,20 @@ def check_div_onclick_needs_role() -> None:
 def check_img_alt() -> None:
     """<img> without alt= violates WCAG 2.2 1.1.1 (Non-text Content).
 
-    Handles multiline JSX: scans up to 6 lines after the opening <img tag to
-    find the alt attribute (or the closing > / />) before concluding it is absent.
+    Uses the shared JSX tag index, so attributes on any line of a multiline
+    opening tag are seen. An <img {...props}> may receive alt from the spread,
+    so it is only a WARN.
     """
-    missing_alt: list[tuple[Path, int, str]] = []
-    for p in tsx_files():
-        try:
-            lines = p.read_text(encoding="utf-8", errors="replace").splitlines()
-        except OSError:
-            continue
-        for i, line in enumerate(lines):
-            if not re.search(r'<img\b', line):
-                continue
-            # Collect lines up to 6 ahead (covers multiline JSX attributes)
-            window_end = min(i + 7, len(lines))
-            window = "\n".join(lines[i:window_end])
-            # Stop at the tag's closing > or />
-            tag_match = re.search(r'<img\b(.*?)(?:/>|>)', window, re.DOTALL)
-            tag_body = tag_match.group(0) if tag_match else window
-            if not re.search(r'\balt\s*=', tag_body):
-                missing_alt.append((p, i + 1, lines[i].strip()))
+    imgs = [(p, tag) for p, tag in jsx_tags_by_element().get("img", []) if "alt" not in tag.attrs]
+    missing_alt = [tag_hit(p, tag, "src") for p, tag in imgs if not tag.spread]
+    spread_alt = [tag_hit(p, tag, "src") for p, tag in imgs if tag.spread]
+    if spread_alt:
+        record(
+            "WARN",
+            f"<img {{...props}}> without explicit alt= — {len(spread_alt)} location(s)",
+            fmt_hits(spread_alt),
+            hint="Make sure the spread props always carry alt, or set alt= explicitly.",
+        )
     if missing_alt:
         record(
             "FAIL",
@@ -377,7 +686,7 @@ def check_img_alt() -> None:
                 'Add alt="" for decorative images or alt="descriptive text" for informative ones.'
             ),
         )
-    else:
+    elif not spread_alt:
         record("PASS", "All <img> elements have alt= attribute")
 
 
@@ -428,11 +737,11 @@ def check_outline_none_has_focus_ring() -> None:
 
 def check_div_span_cursor_pointer() -> None:
     """cursor-pointer + onClick on <div>/<span> — use <button> for accessibility."""
-    hits = scan(tsx_files(), r'<(?:div|span)\b[^>]*(cursor-pointer|onClick)')
+    index = jsx_tags_by_element()
     refined = [
-        (p, i, line) for p, i, line in hits
-        if "cursor-pointer" in line and "onClick" in line
-        and re.search(r'<(?:div|span)\b', line)
+        tag_hit(p, tag, "onClick", "className")
+        for p, tag in index.get("div", []) + index.get("span", [])
+        if "onClick" in tag.attrs and "cursor-pointer" in (tag.attrs.get("className") or "")
     ]
     if refined:
         record(
@@ -450,21 +759,12 @@ def check_div_span_cursor_pointer() -> None:
 
 def check_anchor_as_button() -> None:
     """<a href='#' onClick> or <a onClick without href> — use <button> instead."""
-    rx_void_href = re.compile(
-        r'<a\b[^>]*onClick[^>]*(?:href\s*=\s*["\']#["\']|href\s*=\s*\{[^}]*void[^}]*\})'
-    )
-    hits: list[tuple[Path, int, str]] = []
-    for p in tsx_files():
-        try:
-            for i, line in enumerate(
-                p.read_text(encoding="utf-8", errors="replace").splitlines(), 1
-            ):
-                if rx_void_href.search(line):
-                    hits.append((p, i, line.strip()))
-                elif re.search(r'<a\b[^>]*onClick[^>]*>', line) and "href" not in line:
-                    hits.append((p, i, line.strip()))
-        except OSError:
-            pass
+    rx_void_href = re.compile(r'^(?:#|\{[^}]*void[^}]*\})$')
+    hits = [
+        tag_hit(p, tag, "href", "onClick") for p, tag in jsx_tags_by_element().get("a", [])
+        if "onClick" in tag.attrs
+        and ("href" not in tag.attrs and not tag.spread or rx_void_href.match(tag.attrs.get("href") or ""))
+    ]
     if hits:
         record(
             "WARN",
@@ -611,6 +911,16 @@ def check_no_magic_zindex() -> None:
         record("PASS", "No magic arbitrary z-index values found")
 
 
+# Client source bytes per route (page + layouts, everything under 'use client').
+# Set just above today's heaviest route (/dokumente, ~410 KB); lower it as routes are split.
+CLIENT_ROUTE_BUDGET_KB = 448
+
+# On-disk size above which a package import from client code is reported.
+HEAVY_CLIENT_PACKAGE_KB = 150
+# Shipped with every page anyway, so importing them adds nothing per route.
+CLIENT_FRAMEWORK_PACKAGES = {"react", "react-dom", "next"}
+
+
 def check_large_client_components() -> None:
     """'use client' components >400 lines are decomposition candidates."""
     threshold = 400
@@ -644,6 +954,121 @@ def check_large_client_components() -> None:
         record("PASS", f"No 'use client' components exceed {threshold} lines")
 
 
+def check_client_bundle_weight() -> None:
+    """Per-route client source weight from the import graph of each page and its layouts.
+
+    Follows relative and tsconfig-aliased imports (including barrel re-exports)
+    below every 'use client' boundary, resolved via module_resolver. Source bytes are a proxy for first-load
+    JS; third-party packages are not counted here.
+    """
+    graph = module_graph()
+    app_dir = (ROOT / "src" / "app").resolve()
+    if not app_dir.exists():
+        record("WARN", "src/app not found — skipping client bundle weight check")
+        return
+
+    def kb(paths: set[Path]) -> float:
+        return sum(graph.size.get(p, 0) for p in paths) / 1024
+
+    entry_weights = sorted(
+        ((p, _closure(graph, [p])) for p in graph.client),
+        key=lambda item: -kb(item[1]),
+    )
+    route_weights: list[tuple[str, float, int]] = []
+    for page in sorted(app_dir.rglob("page.tsx")):
+        entries = [page]
+        for d in [page.parent, *page.parent.parents]:
+            if (d / "layout.tsx").exists():
+                entries.append(d / "layout.tsx")
+            if d == app_dir:
+                break
+        shipped = route_client_modules(graph, entries)
+        route = "/" + page.parent.relative_to(app_dir).as_posix()
+        route_weights.append((route.rstrip(".") or "/", kb(shipped), len(shipped)))
+    route_weights.sort(key=lambda item: -item[1])
+
+    top_entries = "\n".join(
+        f"{p.relative_to(ROOT)}  ({len(mods)} modules, {kb(mods):.1f} KB)"
+        for p, mods in entry_weights[:8]
+    )
+    over = [r for r in route_weights if r[1] > CLIENT_ROUTE_BUDGET_KB]
+    if over:
+        record(
+            "FAIL",
+            f"Route client source over {CLIENT_ROUTE_BUDGET_KB} KB budget — {len(over)} route(s)",
+            "\n".join(f"{route}  ({n} modules, {size:.1f} KB)" for route, size, n in over[:12])
+            + "\nHeaviest client entry points:\n" + top_entries,
+            hint=(
+                "Split heavy client subtrees with next/dynamic, import leaf modules instead of\n"
+                "         barrel files, or move non-interactive parts back to server components."
+            ),
+        )
+    else:
+        heaviest = route_weights[0] if route_weights else ("-", 0.0, 0)
+        record(
+            "PASS",
+            f"All routes within {CLIENT_ROUTE_BUDGET_KB} KB client source budget "
+            f"(heaviest: {heaviest[0]} {heaviest[1]:.1f} KB)",
+            "Heaviest client entry points:\n" + top_entries,
+        )
+
+
+def check_heavy_client_dependencies() -> None:
+    """Client code importing a heavy package root where a subpath or next/dynamic would do.
+
+    Sizes come from the installed node_modules: the resolved entry file plus
+    everything it statically imports inside the package (so barrel roots count
+    in full), cached per version from package-lock.json.
+    """
+    if not (ROOT / "node_modules").is_dir():
+        record("WARN", "node_modules not installed — skipping heavy client dependency check",
+               hint="Run `npm ci` first; CI's agent-rule-guard job installs dependencies for this check.")
+        return
+
+    graph = module_graph()
+    res = resolver()
+    shipped = _closure(graph, sorted(graph.client))
+    importers: dict[str, list[Path]] = {}
+    sizes: dict[str, int] = {}
+    for p in sorted(shipped):
+        for item in res.imports(p):
+            name = package_name(item.spec) if item.kind == "value" else None
+            if not name or name in CLIENT_FRAMEWORK_PACKAGES:
+                continue
+            if item.spec not in sizes:
+                size = res.package_import_bytes(item.spec, p)
+                if size is None:
+                    continue
+                sizes[item.spec] = size
+            importers.setdefault(item.spec, []).append(p)
+    res.save()
+
+    heavy = sorted(
+        (spec for spec in importers if sizes[spec] > HEAVY_CLIENT_PACKAGE_KB * 1024),
+        key=lambda spec: -sizes[spec],
+    )
+    if heavy:
+        detail: list[str] = []
+        for spec in heavy[:10]:
+            files = importers[spec]
+            detail.append(f"{spec}  ({sizes[spec] / 1024:.0f} KB on disk, {len(files)} client file(s))")
+            detail.extend(f"  {f.relative_to(ROOT)}" for f in files[:3])
+            if len(files) > 3:
+                detail.append(f"  ... and {len(files) - 3} more")
+        record(
+            "WARN",
+            f"Heavy package imports in client code (>{HEAVY_CLIENT_PACKAGE_KB} KB) — {len(heavy)} import(s)",
+            "\n".join(detail),
+            hint=(
+                "Import a subpath (e.g. `date-fns/format`) or load the module with next/dynamic\n"
+                "         (PDF, ZIP, QR, crypto helpers) only when the user needs it.\n"
+                "         Large client payloads hurt most on the older devices our senior users have."
+            ),
+        )
+    else:
+        record("PASS", f"No client imports of packages over {HEAVY_CLIENT_PACKAGE_KB} KB")
+
+
 # ==============================================================================
 # MAIN
 # ==============================================================================
@@ -704,6 +1129,8 @@ def main() -> int:
     check_no_hardcoded_hex_colors()
     check_no_magic_zindex()
     check_large_client_components()
+    check_client_bundle_weight()
+    check_heavy_client_dependencies()
 
     n_pass = sum(1 for r in results if r.status == "PASS")
     n_warn = sum(1 for r in results if r.status == "WARN")
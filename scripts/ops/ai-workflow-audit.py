@@ -13,7 +13,7 @@ import sys
 from pathlib import Path
 from typing import NamedTuple
 
-from build_ai_context import CHANGELOG_LINES, OUTPUT, SOURCE_FILES, build_bundle
+from build_ai_context import CHANGELOG_LINES, MANIFEST, OUTPUT, SOURCE_FILES, stale_sources
 
 RED = "\033[91m"
 GRN = "\033[92m"
@@ -71,18 +71,19 @@ def check_context_bundle_exists() -> None:
 
 
 def check_context_bundle_current() -> None:
+    """Compares source hashes with the bundle's sidecar manifest instead of rebuilding it."""
     if not OUTPUT.exists():
         record("FAIL", "Cannot compare generated context bundle because it is missing")
         return
 
-    current = OUTPUT.read_text(encoding="utf-8", errors="replace")
-    expected = build_bundle()
-    if current == expected:
+    stale = stale_sources()
+    if not stale:
         record("PASS", "Generated context bundle is up to date")
     else:
         record(
             "FAIL",
             "Generated context bundle is stale",
+            f"Changed since {MANIFEST.relative_to(ROOT)}: {', '.join(stale)}\n"
             f"Rebuild {OUTPUT.relative_to(ROOT)} after changing AGENTS, .claude rules, or AI docs",
         )
 
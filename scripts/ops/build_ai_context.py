@@ -5,15 +5,32 @@ Build the generated internal AI context bundle for Lebensordner.
 This bundles AGENTS.md, the mandatory .claude rules, AI collaboration docs,
 and the latest changelog entries into one repo-local file that internal prompt
 templates can reference consistently.
+
+A sidecar manifest (repo-guardrails.sources.json) records a content hash per
+source, for the changelog tail, for this generator and for the output. The
+bundle is rebuilt only when one of them changes; the output is replaced
+atomically and left untouched (mtime included) when nothing changed.
+
+Usage:
+    python scripts/ops/build_ai_context.py           # rebuild if a source changed
+    python scripts/ops/build_ai_context.py --force   # rebuild unconditionally
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[2]
 OUTPUT = ROOT / "ai" / "context" / "repo-guardrails.md"
+MANIFEST = OUTPUT.with_suffix(".sources.json")
+CHANGELOG = ROOT / "docs" / "ai-changelog.md"
+MANIFEST_VERSION = 1
 CHANGELOG_LINES = 120
+# Read size when seeking backwards for the changelog tail.
+TAIL_BLOCK_SIZE = 8192
 SEPARATOR = "\n\n---\n\n"
 
 SOURCE_FILES = [
@@ -41,9 +58,32 @@ def render_section(path: Path) -> str:
     return f"{title}\n\n{read_text(path)}"
 
 
+def read_tail_lines(path: Path, count: int, block_size: int = TAIL_BLOCK_SIZE) -> list[str]:
+    """Last `count` lines of path, same as read_text().splitlines()[-count:].
+
+    Seeks backwards in blocks until the buffer holds more than `count` LF
+    bytes, then decodes only what follows the oldest one. The byte after an
+    LF always starts a UTF-8 character, so the cut never splits a multi-byte
+    sequence. Cost depends on the tail length, not on the size of the file.
+    """
+    if count <= 0:   # [-0:] keeps every line
+        return path.read_text(encoding="utf-8", errors="replace").splitlines()
+    with path.open("rb") as fh:
+        pos = fh.seek(0, 2)
+        buf = b""
+        while pos > 0 and buf.count(b"\n") <= count:
+            step = min(block_size, pos)
+            pos -= step
+            fh.seek(pos)
+            buf = fh.read(step) + buf
+    if pos > 0:
+        buf = buf[buf.index(b"\n") + 1:]
+    return buf.decode("utf-8", errors="replace").splitlines()[-count:]
+
+
 def render_changelog_tail(path: Path) -> str:
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
-    tail = "\n".join(lines[-CHANGELOG_LINES:]).strip()
+    lines = read_tail_lines(path, CHANGELOG_LINES)
+    tail = "\n".join(lines).strip()
     return f"## Source: `docs/ai-changelog.md` (latest {CHANGELOG_LINES} lines)\n\n{tail}"
 
 
@@ -60,14 +100,85 @@ def build_bundle() -> str:
     for rel in SOURCE_FILES:
         sections.append(render_section(ROOT / rel))
 
-    sections.append(render_changelog_tail(ROOT / "docs/ai-changelog.md"))
+    sections.append(render_changelog_tail(CHANGELOG))
     return SEPARATOR.join(sections) + "\n"
 
 
+def digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def source_hashes() -> dict[str, str]:
+    """Content hash per bundle input, keyed by source (order matters: it is the bundle order)."""
+    hashes = {"generator": digest(Path(__file__).read_text(encoding="utf-8"))}
+    for rel in SOURCE_FILES:
+        path = ROOT / rel
+        hashes[rel] = digest(read_text(path)) if path.exists() else "missing"
+    hashes[f"docs/ai-changelog.md (latest {CHANGELOG_LINES} lines)"] = (
+        digest(render_changelog_tail(CHANGELOG)) if CHANGELOG.exists() else "missing"
+    )
+    return hashes
+
+
+def read_manifest() -> dict:
+    try:
+        data = json.loads(MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if data.get("version") == MANIFEST_VERSION else {}
+
+
+def stale_sources() -> list[str]:
+    """Inputs whose hash differs from the manifest, plus the output if it was edited; [] when current."""
+    manifest = read_manifest()
+    if not manifest or not OUTPUT.exists():
+        return ["manifest" if not manifest else OUTPUT.relative_to(ROOT).as_posix()]
+    recorded = manifest.get("sources", {})
+    current = source_hashes()
+    stale = [
+        f"{key} (missing)" if current[key] == "missing" else key
+        for key in current if recorded.get(key) != current[key]
+    ]
+    stale += [key for key in recorded if key not in current]
+    if list(recorded) != list(current) and not stale:
+        stale.append("source order")
+    output_text = OUTPUT.read_text(encoding="utf-8", errors="replace")
+    if manifest.get("output") != digest(output_text):
+        stale.append(f"{OUTPUT.relative_to(ROOT).as_posix()} (edited by hand)")
+    return stale
+
+
+def write_atomic(path: Path, text: str) -> bool:
+    """Replace path with text via a temp file; False (and no write) when the content is identical."""
+    if path.exists() and path.read_text(encoding="utf-8", errors="replace") == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8", newline="\n")
+    tmp.replace(path)
+    return True
+
+
 def main() -> int:
-    OUTPUT.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT.write_text(build_bundle(), encoding="utf-8")
-    print(f"Wrote {OUTPUT.relative_to(ROOT)}")
+    parser = argparse.ArgumentParser(description="Build the internal AI context bundle")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if no source changed")
+    args = parser.parse_args()
+
+    stale = stale_sources()
+    if not stale and not args.force:
+        print(f"Up to date: {OUTPUT.relative_to(ROOT)}")
+        return 0
+
+    bundle = build_bundle()
+    wrote = write_atomic(OUTPUT, bundle)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "sources": source_hashes(),
+        "output": digest(bundle),
+    }
+    write_atomic(MANIFEST, json.dumps(manifest, indent=2) + "\n")
+    changed = ", ".join(stale) if stale else "forced"
+    print(f"{'Wrote' if wrote else 'Unchanged'} {OUTPUT.relative_to(ROOT)} ({changed})")
     return 0
 
 
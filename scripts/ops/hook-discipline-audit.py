@@ -4,90 +4,280 @@ Hook-discipline regression guard.
 
 Fails only when manual-hook usage grows above baseline, so teams can
 incrementally refactor without breaking CI today.
+
+The baseline lives in hook-discipline-baseline.json next to this script, with
+totals plus counts per file and component so a regression names where usage
+grew. --update-baseline is a ratchet: it refuses to record any total that
+went up.
+
+Usage:
+    python scripts/ops/hook-discipline-audit.py                    # regression guard
+    python scripts/ops/hook-discipline-audit.py --breakdown        # per-file/component counts
+    python scripts/ops/hook-discipline-audit.py --hotspots         # effect/callback density ranking
+    python scripts/ops/hook-discipline-audit.py --update-baseline  # ratchet baseline down
 """
 
 from __future__ import annotations
 
+import argparse
+import bisect
+import datetime
+import json
+import os
 import re
 import sys
+from collections import Counter
 from pathlib import Path
 
 
 ROOT = Path(__file__).resolve().parents[2]
 SRC_DIR = ROOT / "src"
+BASELINE_FILE = Path(__file__).resolve().parent / "hook-discipline-baseline.json"
 
+SOURCE_SUFFIXES = {".ts", ".tsx", ".js", ".jsx"}
+# Never contain hand-written source; pruned before descending.
+PRUNED_DIRS = {"node_modules", ".next", "dist", "coverage"}
 
-PATTERNS: dict[str, re.Pattern[str]] = {
-    "useMemo(": re.compile(r"\buseMemo(?:<[^>]+>)?\("),
-    "useCallback(": re.compile(r"\buseCallback(?:<[^>]+>)?\("),
-    "useEffect(": re.compile(r"\buseEffect(?:<[^>]+>)?\("),
-    "useRef(": re.compile(r"\buseRef(?:<[^>]+>)?\("),
-    "React.memo(": re.compile(r"React\.memo\("),
-    "React.useMemo(": re.compile(r"React\.useMemo\("),
-    "React.useCallback(": re.compile(r"React\.useCallback\("),
-    "React.useEffect(": re.compile(r"React\.useEffect\("),
-    "React.useRef(": re.compile(r"React\.useRef\("),
-}
+HOOK_KEYS = [
+    "useMemo(",
+    "useCallback(",
+    "useEffect(",
+    "useRef(",
+    "React.memo(",
+    "React.useMemo(",
+    "React.useCallback(",
+    "React.useEffect(",
+    "React.useRef(",
+]
 
+# One alternation for every key, matched with a single finditer per file.
+# `React.useEffect(` counts toward both "useEffect(" and "React.useEffect(",
+# as the baseline was taken with one pattern per key. Generic calls
+# (`useRef<T>(`) only count toward the bare key.
+HOOK_RX = re.compile(
+    r"(?P<react_memo>React\.memo\()"
+    r"|(?P<react_ns>React\.)?\b(?P<hook>useMemo|useCallback|useEffect|useRef)"
+    r"(?P<generic><[^>]+>)?\("
+)
 
-# Baseline refreshed on 2026-03-14 after trusted-access lifecycle hardening.
-BASELINE_COUNTS: dict[str, int] = {
-    "useMemo(": 11,
-    "useCallback(": 61,
-    "useEffect(": 105,
-    "useRef(": 24,
-    "React.memo(": 0,
-    "React.useMemo(": 0,
-    "React.useCallback(": 0,
-    "React.useEffect(": 1,
-    "React.useRef(": 0,
-}
+# Top-level component or custom-hook declarations used to attribute hook calls.
+COMPONENT_RX = re.compile(
+    r"^(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s+(?P<fn>[A-Z]\w*|use[A-Z]\w*)"
+    r"|^(?:export\s+)?(?:const|let)\s+(?P<const>[A-Z]\w*|use[A-Z]\w*)\s*[:=]",
+    re.MULTILINE,
+)
+MODULE_SCOPE = "<module>"
 
 
-def count_pattern(pattern: re.Pattern[str], text: str) -> int:
-    return len(pattern.findall(text))
+# Hooks whose density best predicts re-render and effect-cascade cost.
+HOTSPOT_KEYS = ("useEffect(", "useCallback(")
+# Components shorter than this are left out of the density ranking (tiny hooks skew it).
+HOTSPOT_MIN_LINES = 30
 
+Counts = dict[str, dict[str, Counter[str]]]
 
-def main() -> int:
-    if not SRC_DIR.exists():
-        print("FAIL: src/ directory not found.")
-        return 1
 
-    totals = {key: 0 for key in PATTERNS}
-    for path in SRC_DIR.rglob("*"):
-        if not path.is_file() or path.suffix not in {".ts", ".tsx", ".js", ".jsx"}:
+def source_files(root: Path) -> list[Path]:
+    """Source files under root, pruning build output and dependency dirs."""
+    found: list[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in PRUNED_DIRS and not d.startswith(".")]
+        for name in filenames:
+            if os.path.splitext(name)[1] in SOURCE_SUFFIXES:
+                found.append(Path(dirpath) / name)
+    return sorted(found)
+
+
+def count_hooks(text: str) -> tuple[dict[str, Counter[str]], dict[str, int]]:
+    """Hook counts and line spans per enclosing top-level component/hook for one file."""
+    starts: list[int] = []
+    names: list[str] = []
+    for m in COMPONENT_RX.finditer(text):
+        starts.append(m.start())
+        names.append(m.group("fn") or m.group("const"))
+
+    counts: dict[str, Counter[str]] = {}
+    for m in HOOK_RX.finditer(text):
+        idx = bisect.bisect_right(starts, m.start()) - 1
+        component = names[idx] if idx >= 0 else MODULE_SCOPE
+        bucket = counts.setdefault(component, Counter())
+        if m.group("react_memo"):
+            bucket["React.memo("] += 1
             continue
+        hook = m.group("hook")
+        bucket[f"{hook}("] += 1
+        if m.group("react_ns") and not m.group("generic"):
+            bucket[f"React.{hook}("] += 1
+
+    # A component spans from its declaration to the next top-level declaration.
+    lines: dict[str, int] = {}
+    bounds = starts + [len(text)]
+    for idx, name in enumerate(names):
+        if name in counts:
+            span = text.count("\n", bounds[idx], bounds[idx + 1]) or 1
+            lines[name] = lines.get(name, 0) + span
+    return counts, lines
+
+
+def collect_counts() -> tuple[Counts, dict[tuple[str, str], int]]:
+    """({relative file: {component: Counter}}, {(file, component): lines}) for hook users."""
+    per_file: Counts = {}
+    spans: dict[tuple[str, str], int] = {}
+    for path in source_files(SRC_DIR):
         try:
             content = path.read_text(encoding="utf-8")
         except UnicodeDecodeError:
             continue
-        for key, pattern in PATTERNS.items():
-            totals[key] += count_pattern(pattern, content)
+        counts, lines = count_hooks(content)
+        if counts:
+            rel = path.relative_to(ROOT).as_posix()
+            per_file[rel] = counts
+            for component, n in lines.items():
+                spans[(rel, component)] = n
+    return per_file, spans
+
+
+def file_totals(per_file: Counts) -> dict[str, Counter[str]]:
+    return {
+        rel: sum(components.values(), Counter())
+        for rel, components in per_file.items()
+    }
+
+
+def load_baseline() -> tuple[Counter[str], Counts]:
+    """(totals, per file/component counts) from BASELINE_FILE."""
+    data = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+    totals = Counter({key: int(data["totals"].get(key, 0)) for key in HOOK_KEYS})
+    per_file = {
+        rel: {component: Counter(counts) for component, counts in components.items()}
+        for rel, components in data.get("files", {}).items()
+    }
+    return totals, per_file
+
+
+def write_baseline(totals: Counter[str], per_file: Counts) -> None:
+    data = {
+        "updated": datetime.date.today().isoformat(),
+        "totals": {key: totals[key] for key in HOOK_KEYS},
+        "files": {
+            rel: {
+                component: {key: counts[key] for key in HOOK_KEYS if counts[key]}
+                for component, counts in sorted(components.items())
+            }
+            for rel, components in sorted(per_file.items())
+        },
+    }
+    tmp = BASELINE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    tmp.replace(BASELINE_FILE)
 
-    regressions: list[str] = []
+
+def growth_sites(current: Counts, baseline: Counts, key: str, n: int = 5) -> list[str]:
+    """File/component entries whose count for key is above their baseline entry."""
+    rows = []
+    for rel, components in current.items():
+        for component, counts in components.items():
+            before = baseline.get(rel, {}).get(component, Counter())[key]
+            if counts[key] > before:
+                rows.append((counts[key] - before, f"{rel} ({component}): {before} -> {counts[key]}"))
+    rows.sort(key=lambda row: (-row[0], row[1]))
+    return [label for _, label in rows[:n]]
+
+
+def hotspots(
+    per_file: Counts, spans: dict[tuple[str, str], int], n: int = 15
+) -> list[str]:
+    """Components ranked by useEffect/useCallback calls per 100 lines."""
+    rows = []
+    for rel, components in per_file.items():
+        for component, counts in components.items():
+            lines = spans.get((rel, component), 0)
+            hooks = sum(counts[key] for key in HOTSPOT_KEYS)
+            if lines < HOTSPOT_MIN_LINES or not hooks:
+                continue
+            rows.append((hooks * 100 / lines, hooks, lines, f"{rel} ({component})"))
+    rows.sort(key=lambda row: (-row[0], row[3]))
+    return [
+        f"{density:5.1f}/100 lines  {hooks:3d} hooks  {lines:5d} lines  {label}"
+        for density, hooks, lines, label in rows[:n]
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Hook-discipline regression guard")
+    parser.add_argument(
+        "--breakdown",
+        action="store_true",
+        help="Print hook counts per file and component",
+    )
+    parser.add_argument(
+        "--hotspots",
+        action="store_true",
+        help="Rank components by useEffect/useCallback density per 100 lines",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Record current counts as the new baseline (refused if any total grew)",
+    )
+    args = parser.parse_args()
+
+    if not SRC_DIR.exists():
+        print("FAIL: src/ directory not found.")
+        return 1
+    if not BASELINE_FILE.exists():
+        print(f"FAIL: baseline file not found: {BASELINE_FILE.relative_to(ROOT)}")
+        return 1
+
+    per_file, spans = collect_counts()
+    totals: Counter[str] = sum(file_totals(per_file).values(), Counter())
+    baseline_totals, baseline_files = load_baseline()
+
+    regressions: list[tuple[str, list[str]]] = []
     print("Hook Discipline Audit (regression guard)")
     print("Counts (current / baseline):")
-    for key in PATTERNS:
+    for key in HOOK_KEYS:
         current = totals[key]
-        baseline = BASELINE_COUNTS[key]
+        baseline = baseline_totals[key]
         print(f"- {key}: {current} / {baseline}")
         if current > baseline:
-            regressions.append(f"{key} grew from {baseline} to {current}")
+            regressions.append(
+                (f"{key} grew from {baseline} to {current}", growth_sites(per_file, baseline_files, key))
+            )
+
+    if args.breakdown:
+        print("\nPer file / component:")
+        for rel, components in sorted(per_file.items()):
+            print(f"- {rel}")
+            for component, counts in sorted(components.items()):
+                summary = ", ".join(f"{key} {counts[key]}" for key in HOOK_KEYS if counts[key])
+                print(f"    {component}: {summary}")
+
+    if args.hotspots:
+        print(f"\nHotspots ({' + '.join(HOTSPOT_KEYS)} per 100 lines, components >= {HOTSPOT_MIN_LINES} lines):")
+        for line in hotspots(per_file, spans):
+            print(f"- {line}")
 
     if regressions:
         print("\nFAIL: Hook usage regression detected.")
-        for item in regressions:
+        for item, sites in regressions:
             print(f"- {item}")
+            for line in sites:
+                print(f"    {line}")
         print(
             "\nRefactor policy: case-by-case benchmarked cleanup (see GitHub issue #26)."
         )
+        if args.update_baseline:
+            print("Baseline not updated: the ratchet only accepts counts that stay equal or go down.")
         return 1
 
+    if args.update_baseline:
+        write_baseline(totals, per_file)
+        print(f"\nBaseline updated: {BASELINE_FILE.relative_to(ROOT)}")
+
     print("\nPASS: Hook usage did not grow beyond baseline.")
     return 0
 
 
 if __name__ == "__main__":
     sys.exit(main())
-
-
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Lexical helpers for the JS/TS sources scanned by the ops audit scripts.
+
+The audits match regexes against src/ files. Run them on mask_code(text)
+so that a `for (` in a comment or a `.from('` inside a string literal does
+not count as code. The masked text has the same length and line breaks as
+the original, so match offsets and line numbers carry over unchanged.
+
+Usage from another audit script in scripts/ops/:
+    from js_source import mask_code
+    masked = mask_code(text)
+"""
+
+from __future__ import annotations
+
+
+def mask_code(text: str) -> str:
+    """text with comments, string/template contents and regex literals blanked (same length).
+
+    `${...}` interpolations inside template literals stay visible (their own
+    strings and comments masked), so calls made from a template still count.
+    """
+    out = list(text)
+    i, n = 0, len(text)
+    prev = ""
+    # Brace depth inside each open `${` interpolation, innermost last.
+    interpolations: list[int] = []
+
+    def blank(start: int, end: int) -> None:
+        for j in range(start, min(end, n)):
+            if out[j] != "\n":
+                out[j] = " "
+
+    while i < n:
+        c = text[i]
+        if c == "`" or (c == "}" and interpolations and interpolations[-1] == 0):
+            # Template text runs to the closing backtick or the next `${`.
+            if c == "}":
+                interpolations.pop()
+            end = i + 1
+            while end < n and text[end] != "`" and not text.startswith("${", end):
+                end += 2 if text[end] == "\\" else 1
+            blank(i + 1, end)
+            if end < n and text[end] == "`":
+                prev = "x"
+                i = end + 1
+            else:
+                interpolations.append(0)
+                prev = "{"
+                i = end + 2
+            continue
+        if text.startswith("//", i) or text.startswith("/*", i):
+            end = text.find("\n" if text[i + 1] == "/" else "*/", i + 2)
+            end = n if end < 0 else end + (1 if text[i + 1] == "/" else 2)
+        elif c in "'\"":
+            end = i + 1
+            while end < n and text[end] != c:
+                end += 2 if text[end] == "\\" else 1
+            end += 1
+        elif c == "/" and prev in "(,=:[!&|?{};+-*%<>~^":
+            end = i + 1
+            in_class = False
+            while end < n and text[end] != "\n" and (in_class or text[end] != "/"):
+                in_class = (in_class or text[end] == "[") and text[end] != "]"
+                end += 2 if text[end] == "\\" else 1
+            end += 1
+        else:
+            if interpolations and c in "{}":
+                interpolations[-1] += 1 if c == "{" else -1
+            if not c.isspace():
+                prev = c
+            i += 1
+            continue
+        blank(i + 1, end - 1)
+        prev = "x"
+        i = end
+    return "".join(out)
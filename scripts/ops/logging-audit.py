@@ -7,19 +7,116 @@ Enforces:
   - Structured logger supports warn/info levels
   - Auth expected outcomes are not logged as error-level events
   - Grafana "Error Spike" alert remains level="error" only
+  - Promtail does not promote high-cardinality structured-logger fields to
+    Loki labels (warns on fields of unknown or medium cardinality)
+  - Estimated log lines per request (route handlers) and per job (workers)
+    stay within budget, or at least do not grow above
+    logging-volume-baseline.json (--update-baseline is a ratchet)
+
+Warns (without failing) when Loki limits do not fit the expected log volume:
+ingestion and per-stream rate limits, chunk sizing and retention disk use.
+
+The log-volume estimate counts console.* and emitStructured* calls reachable
+from each handler: its own body, same-file helpers and imported src/
+functions it calls, transitively. Every branch is counted (error paths too),
+and calls inside loops are weighted by --loop-multiplier per nesting level,
+so the figure is an upper bound meant for comparing changes in review.
+The baseline records its multiplier; runs with a different --loop-multiplier
+print estimates but skip the ratchet and never rewrite the baseline.
+
+Usage:
+    python scripts/ops/logging-audit.py
+    python scripts/ops/logging-audit.py --log-lines-per-day 2000000   # size Loki limits
+    python scripts/ops/logging-audit.py --log-volume         # every route/job estimate
+    python scripts/ops/logging-audit.py --update-baseline    # ratchet log-volume baseline down
 """
 
 from __future__ import annotations
 
+import argparse
+import datetime
+import json
 import re
 import sys
 from pathlib import Path
+from typing import NamedTuple
+
+from js_source import mask_code
+from module_resolver import ModuleResolver
+from yaml_subset import flow_list, load_yaml
 
 
 ROOT = Path(__file__).resolve().parents[2]
 API_DIR = ROOT / "src" / "app" / "api"
 LOGGER_FILE = ROOT / "src" / "lib" / "errors" / "structured-logger.ts"
 ALERT_RULES_FILE = ROOT / "deploy" / "grafana" / "provisioning" / "alerting" / "alert-rules.yml"
+PROMTAIL_CONFIG = ROOT / "deploy" / "promtail" / "promtail-config.yml"
+LOKI_CONFIG = ROOT / "deploy" / "loki" / "loki-config.yml"
+COMPOSE_FILE = ROOT / "deploy" / "docker-compose.yml"
+QUEUE_DIR = ROOT / "src" / "lib" / "queue"
+VOLUME_BASELINE_FILE = Path(__file__).resolve().parent / "logging-volume-baseline.json"
+
+# Structured-logger payload fields by number of distinct values. Anything
+# unique per event must stay in the log line (or structured_metadata).
+BOUNDED_LOG_FIELDS = {"level", "queue", "error_type"}
+MEDIUM_LOG_FIELDS = {"endpoint"}               # one value per route; acceptable only with care
+HIGH_CARDINALITY_LOG_FIELDS = {"error_id", "timestamp", "error_message", "stack", "metadata"}
+# Docker service-discovery labels that change on every container recreate.
+HIGH_CARDINALITY_META = re.compile(r"__meta_docker_container_id|__meta_docker_network_ip|__meta_docker_port_")
+
+# Estimated log lines per request/job above which a handler needs a baseline entry.
+LOG_LINES_BUDGET = 8
+# Assumed iterations per loop level when a log call sits inside for/while/map/forEach.
+LOOP_MULTIPLIER_DEFAULT = 10
+HTTP_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+LOG_CALL_RX = re.compile(r"\b(?:console\.(?:log|info|warn|error|debug)|emitStructured(?:Log|Error|Warn|Info))\s*\(")
+_FUNCTION_RX = re.compile(
+    r"(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*(?P<fn>\w+)\s*(?:<[^>]*>)?\s*\("
+    r"|(?:export\s+)?(?:const|let)\s+(?P<const>\w+)\s*(?::[^=]+)?=\s*(?:async\s+)?"
+    r"(?:\([^()]*(?:\([^()]*\)[^()]*)*\)|\w+)\s*(?::[^=]+?)?=>"
+)
+_LOOP_RX = re.compile(r"\b(?:for|while)\s*\(|\.(?:map|forEach|flatMap|reduce|filter|some|every)\s*\(")
+_NAMED_IMPORT_RX = re.compile(r"""import\s+(?:type\s+)?\{(?P<names>[^}]*)\}\s*from\s*['"](?P<spec>[^'"]+)['"]""")
+_CALL_RX = re.compile(r"\b(\w+)\s*\(")
+_WORKER_RX = re.compile(r"""\bnew\s+Worker\s*\(\s*['"`](?P<queue>[^'"`]+)['"`]\s*,""")
+_CALLBACK_RX = re.compile(r"\s*(?:async\s*)?\(")
+_WORKER_EVENT_RX = re.compile(r"""\.on\(\s*['"](?:completed|failed|active|progress)['"]\s*,""")
+# Logger internals are the sink, not extra lines.
+LOG_SINK_FILES = {LOGGER_FILE}
+
+
+class FunctionSpan(NamedTuple):
+    name:  str
+    start: int   # body start (inside the braces, or the expression for `=> expr`)
+    end:   int
+
+
+class LogEstimate(NamedTuple):
+    entry: str     # "POST /api/documents/upload" or "worker emails"
+    path:  Path
+    line:  int
+    lines: float   # estimated log lines per request/job
+
+
+# Expected volume across all scraped containers; override with --log-lines-per-day.
+LOG_LINES_PER_DAY_DEFAULT = 500_000
+# Average JSON line incl. Docker wrapper; structured-logger payloads run 250-500 bytes.
+LOG_LINE_BYTES = 400
+# Peak-to-average ratio for bursts (deploys, cron fan-out, error storms).
+LOG_PEAK_FACTOR = 20
+# Typical snappy/gzip ratio on JSON log chunks.
+LOG_COMPRESSION_RATIO = 8
+# Loki 3.x defaults for settings left unset.
+LOKI_DEFAULTS = {
+    "limits_config.ingestion_rate_mb": "4",
+    "limits_config.ingestion_burst_size_mb": "6",
+    "limits_config.per_stream_rate_limit": "3MB",
+    "limits_config.retention_period": "0s",
+    "ingester.chunk_target_size": "1572864",
+    "ingester.chunk_idle_period": "30m",
+    "ingester.max_chunk_age": "2h",
+}
 
 
 def read(path: Path) -> str:
@@ -35,7 +132,292 @@ def pass_msg(message: str) -> None:
     print(f"PASS: {message}")
 
 
+def warn_msg(message: str, details: list[str] | None = None) -> None:
+    print(f"WARN: {message}")
+    for line in details or []:
+        print(f"    {line}")
+
+
+def cfg_get(cfg: dict, path: str, default: str | None = None) -> str | None:
+    node: object = cfg
+    for key in path.split("."):
+        node = node.get(key) if isinstance(node, dict) else None
+    return str(node) if node not in (None, "") else default
+
+
+def parse_bytes(value: str | None) -> float:
+    """'3MB' / '1572864' / '512KB' -> bytes."""
+    m = re.fullmatch(r"\s*([\d.]+)\s*([kmgt]?)i?b?\s*", value or "", re.IGNORECASE)
+    if not m:
+        return 0.0
+    return float(m.group(1)) * 1024 ** "_kmgt".index(m.group(2).lower() or "_")
+
+
+def parse_seconds(value: str | None) -> float:
+    """'30m' / '2h' / '30d' / '1h30m' -> seconds."""
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800, "y": 31536000}
+    return sum(float(n) * units[u] for n, u in re.findall(r"([\d.]+)(ms|[smhdwy])", value or ""))
+
+
+def logger_fields(logger: str) -> set[str]:
+    """JSON keys the structured logger writes: writeLog({...}) literals plus optionalFields.*."""
+    fields = set(re.findall(r"optionalFields\.(\w+)\s*=", logger))
+    for m in re.finditer(r"writeLog\(\{(.*?)\}\)", logger, re.DOTALL):
+        fields |= set(re.findall(r"^\s*(\w+)\s*[:,]", m.group(1), re.MULTILINE))
+    return fields
+
+
+def promtail_labels(cfg: dict) -> list[tuple[str, str, str]]:
+    """(job, label, source) for every label Promtail attaches to a stream."""
+    found: list[tuple[str, str, str]] = []
+    for job in cfg.get("scrape_configs") or []:
+        if not isinstance(job, dict):
+            continue
+        name = str(job.get("job_name", "?"))
+        for static in job.get("static_configs") or []:
+            for label in (static.get("labels") or {}) if isinstance(static, dict) else {}:
+                if not label.startswith("__"):
+                    found.append((name, label, "static"))
+        for relabel in job.get("relabel_configs") or []:
+            if isinstance(relabel, dict) and relabel.get("target_label"):
+                if relabel.get("action", "replace") == "replace":
+                    sources = ",".join(flow_list(relabel.get("source_labels")))
+                    found.append((name, str(relabel["target_label"]), f"relabel {sources}"))
+        extracted: dict[str, str] = {}
+        for stage in job.get("pipeline_stages") or []:
+            if not isinstance(stage, dict):
+                continue
+            for kind, body in stage.items():
+                if kind in ("json", "logfmt") and isinstance(body, dict):
+                    for key, expr in (body.get("expressions") or {}).items():
+                        extracted[key] = f"{kind} {expr or key}"
+                elif kind == "regex" and isinstance(body, dict):
+                    for group in re.findall(r"\?P<(\w+)>", str(body.get("expression", ""))):
+                        extracted[group] = f"regex {group}"
+                elif kind == "labels" and isinstance(body, dict):
+                    for label, source in body.items():
+                        field = source or label
+                        found.append((name, label, extracted.get(field, f"extracted {field}")))
+    return found
+
+
+def label_field(source: str) -> str:
+    """Logger field behind a label source ('json metadata.user_id' -> 'metadata')."""
+    return re.split(r"[.\[]", source.split(" ", 1)[-1].strip("'\""))[0]
+
+
+def match_brace(masked: str, open_idx: int) -> int:
+    """Index of the bracket closing masked[open_idx] ( ( [ or { )."""
+    pairs = {"(": ")", "[": "]", "{": "}"}
+    opener, closer = masked[open_idx], pairs[masked[open_idx]]
+    depth = 0
+    for j in range(open_idx, len(masked)):
+        if masked[j] == opener:
+            depth += 1
+        elif masked[j] == closer:
+            depth -= 1
+            if depth == 0:
+                return j
+    return len(masked) - 1
+
+
+def body_after(masked: str, idx: int) -> tuple[int, int]:
+    """Span of the `{...}` body (or single expression) of a function/arrow starting at idx."""
+    if masked[idx - 1] == "(":
+        idx = match_brace(masked, idx - 1) + 1
+    m = re.compile(r"\s*(?::[^{=]*)?\s*(=>)?\s*").match(masked, idx)
+    j = m.end() if m else idx
+    if j < len(masked) and masked[j] == "{":
+        return j + 1, match_brace(masked, j)
+    end = j
+    while end < len(masked) and masked[end] not in ";\n":
+        if masked[end] in "([{":
+            end = match_brace(masked, end)
+        end += 1
+    return j, end
+
+
+def function_spans(masked: str) -> list[FunctionSpan]:
+    """Every named function/arrow in the file, nested ones included, in source order."""
+    spans = []
+    for m in _FUNCTION_RX.finditer(masked):
+        start, end = body_after(masked, m.end())
+        spans.append(FunctionSpan(m.group("fn") or m.group("const"), start, end))
+    return spans
+
+
+def loop_spans(masked: str) -> list[tuple[int, int]]:
+    """Body spans of for/while loops and array-iteration callbacks."""
+    spans = []
+    for m in _LOOP_RX.finditer(masked):
+        close = match_brace(masked, m.end() - 1)
+        if m.group(0).startswith("."):
+            spans.append((m.end(), close))
+            continue
+        start, end = body_after(masked, close + 1)
+        spans.append((m.end(), end))
+    return spans
+
+
+class ParsedSource(NamedTuple):
+    text:      str
+    masked:    str                             # mask_code(text), sliced per span
+    spans:     dict[str, FunctionSpan]         # first definition of each name
+    nested:    list[FunctionSpan]              # every definition, for span exclusion
+    loops:     list[tuple[int, int]]
+    imports:   dict[str, tuple[Path, str]]     # local name -> (file, exported name)
+
+
+class LogVolumeEstimator:
+    """Memoized log-lines-per-call estimate for functions across src/.
+
+    Log calls inside a function defined within the span being counted are
+    left to that function: they count once per call to it, not again as
+    text of the enclosing handler.
+    """
+
+    def __init__(self, loop_multiplier: float) -> None:
+        self.loop_multiplier = loop_multiplier
+        self.resolver = ModuleResolver()
+        self._files: dict[Path, ParsedSource] = {}
+        self._memo: dict[tuple[Path, int], float] = {}
+
+    def parse(self, path: Path) -> ParsedSource:
+        if path not in self._files:
+            text = read(path)
+            masked = mask_code(text)
+            imports: dict[str, tuple[Path, str]] = {}
+            for m in _NAMED_IMPORT_RX.finditer(text):
+                target = self.resolver.resolve_import(m.group("spec"), path)
+                if not target or "node_modules" in target.parts or target in LOG_SINK_FILES:
+                    continue
+                for item in m.group("names").split(","):
+                    original, _, alias = item.strip().removeprefix("type ").partition(" as ")
+                    if original:
+                        imports[(alias or original).strip()] = (target, original.strip())
+            nested = function_spans(masked)
+            spans: dict[str, FunctionSpan] = {}
+            for span in nested:
+                spans.setdefault(span.name, span)
+            self._files[path] = ParsedSource(text, masked, spans, nested, loop_spans(masked), imports)
+        return self._files[path]
+
+    def weight(self, loops: list[tuple[int, int]], offset: int, lo: int) -> float:
+        depth = sum(1 for start, end in loops if lo <= start <= offset < end)
+        return self.loop_multiplier ** depth
+
+    def span_lines(self, path: Path, start: int, end: int, stack: tuple = ()) -> float:
+        """Weighted log calls in text[start:end] plus the functions it calls."""
+        src = self.parse(path)
+        inner = [s for s in src.nested if start <= s.start and s.end <= end and (s.start, s.end) != (start, end)]
+
+        def in_inner(offset: int) -> bool:
+            return any(s.start <= offset < s.end for s in inner)
+
+        body = src.masked[start:end]
+        total = 0.0
+        for m in LOG_CALL_RX.finditer(body):
+            if not in_inner(start + m.start()):
+                total += self.weight(src.loops, start + m.start(), start)
+        for m in _CALL_RX.finditer(body):
+            name, offset = m.group(1), start + m.start()
+            if in_inner(offset):
+                continue
+            # A helper defined in this span shadows a same-named one elsewhere in the file.
+            local = [s for s in inner if s.name == name and s.start < offset]
+            if local:
+                callee = (path, local[-1])
+            elif name in src.spans and not src.spans[name].start <= offset < src.spans[name].end:
+                callee = (path, src.spans[name])
+            elif name in src.imports:
+                target, exported = src.imports[name]
+                span = self.parse(target).spans.get(exported)
+                if not span:
+                    continue
+                callee = (target, span)
+            else:
+                continue
+            total += self.weight(src.loops, offset, start) * self.function_lines(*callee, stack=stack)
+        return total
+
+    def function_lines(self, path: Path, span: FunctionSpan, stack: tuple = ()) -> float:
+        key = (path, span.start)
+        if key in self._memo:
+            return self._memo[key]
+        if key in stack or len(stack) > 12:
+            return 0.0
+        lines = self.span_lines(path, span.start, span.end, stack + (key,))
+        self._memo[key] = lines
+        return lines
+
+
+def estimate_log_volume(loop_multiplier: float) -> list[LogEstimate]:
+    est = LogVolumeEstimator(loop_multiplier)
+    estimates: list[LogEstimate] = []
+    for route in sorted(API_DIR.rglob("route.ts")):
+        src = est.parse(route)
+        url = "/" + route.parent.relative_to(ROOT / "src" / "app").as_posix()
+        for method in HTTP_METHODS:
+            if method in src.spans and re.search(rf"export\s+(?:async\s+)?function\s+{method}\b", src.text):
+                estimates.append(LogEstimate(
+                    f"{method} {url}", route, src.text.count("\n", 0, src.spans[method].start) + 1,
+                    est.function_lines(route, src.spans[method]),
+                ))
+    for path in sorted(QUEUE_DIR.rglob("*.ts")) if QUEUE_DIR.exists() else []:
+        text, masked = est.parse(path)[:2]
+        # worker.on('completed' | 'failed' ...) listeners run once per job on top of the processor.
+        per_job_events = 0.0
+        for m in _WORKER_EVENT_RX.finditer(text):
+            callback = _CALLBACK_RX.match(masked, m.end())
+            if callback:
+                per_job_events += est.span_lines(path, *body_after(masked, callback.end()))
+        for m in _WORKER_RX.finditer(text):
+            callback = _CALLBACK_RX.match(masked, m.end())
+            if not callback:
+                continue
+            start, end = body_after(masked, callback.end())
+            estimates.append(LogEstimate(
+                f"worker {m.group('queue')}", path, text.count("\n", 0, m.start()) + 1,
+                est.span_lines(path, start, end) + per_job_events,
+            ))
+    est.resolver.save()
+    return estimates
+
+
+def load_volume_baseline() -> tuple[float, dict[str, float]]:
+    """(loop multiplier the baseline was recorded with, {entry: lines})."""
+    if not VOLUME_BASELINE_FILE.exists():
+        return LOOP_MULTIPLIER_DEFAULT, {}
+    data = json.loads(VOLUME_BASELINE_FILE.read_text(encoding="utf-8"))
+    multiplier = float(data.get("loop_multiplier", LOOP_MULTIPLIER_DEFAULT))
+    return multiplier, {entry: float(n) for entry, n in data.get("entries", {}).items()}
+
+
+def write_volume_baseline(estimates: list[LogEstimate], loop_multiplier: float) -> None:
+    data = {
+        "updated": datetime.date.today().isoformat(),
+        "budget": LOG_LINES_BUDGET,
+        "loop_multiplier": loop_multiplier,
+        "entries": {e.entry: round(e.lines, 1) for e in sorted(estimates) if e.lines > LOG_LINES_BUDGET},
+    }
+    tmp = VOLUME_BASELINE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    tmp.replace(VOLUME_BASELINE_FILE)
+
+
 def main() -> int:
+    parser = argparse.ArgumentParser(description="Logging policy audit")
+    parser.add_argument("--log-lines-per-day", type=int, default=LOG_LINES_PER_DAY_DEFAULT,
+                        help=f"Expected log lines per day across all containers (default {LOG_LINES_PER_DAY_DEFAULT:,})")
+    parser.add_argument("--loop-multiplier", type=float, default=None,
+                        help="Assumed iterations per loop level in the log-volume estimate (default: the "
+                             f"baseline's, {LOOP_MULTIPLIER_DEFAULT} without one); other values skip the ratchet")
+    parser.add_argument("--log-volume", action="store_true",
+                        help="Print the log-lines estimate for every route handler and worker job")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Record current over-budget log-volume estimates (refused if any grew)")
+    args = parser.parse_args()
+
     if not API_DIR.exists():
         return fail(f"Missing API directory: {API_DIR}")
 
@@ -110,6 +492,154 @@ def main() -> int:
         else:
             pass_msg('Error Spike alert remains constrained to level="error"')
 
+    # 5) Promtail labels must not come from per-event logger fields.
+    if not PROMTAIL_CONFIG.exists():
+        errors.append(f"Missing promtail config: {PROMTAIL_CONFIG.relative_to(ROOT)}")
+    else:
+        fields = logger_fields(read(LOGGER_FILE)) if LOGGER_FILE.exists() else set()
+        labels = promtail_labels(load_yaml(PROMTAIL_CONFIG))
+        errors_before = len(errors)
+        risky: list[str] = []
+        for job, label, source in labels:
+            if source.startswith("relabel"):
+                if HIGH_CARDINALITY_META.search(source):
+                    errors.append(f"promtail job {job}: label {label} from {source} changes per container")
+                continue
+            if source == "static":
+                continue
+            field = label_field(source)
+            if field in HIGH_CARDINALITY_LOG_FIELDS:
+                errors.append(
+                    f"promtail job {job}: label {label} from {source} is unique per event -- "
+                    "keep it in the line (| json) or use structured_metadata"
+                )
+            elif field not in BOUNDED_LOG_FIELDS:
+                kind = "per-route" if field in MEDIUM_LOG_FIELDS else \
+                    "not a structured-logger field" if field not in fields else "unclassified"
+                risky.append(f"{job}: {label} <- {source} ({kind})")
+        unclassified = fields - BOUNDED_LOG_FIELDS - MEDIUM_LOG_FIELDS - HIGH_CARDINALITY_LOG_FIELDS
+        if risky:
+            warn_msg("Promtail labels with unbounded or per-route values", risky)
+        if unclassified:
+            warn_msg("structured-logger.ts writes fields not classified by cardinality in logging-audit.py",
+                     sorted(unclassified))
+        if len(errors) == errors_before:
+            label_list = ", ".join(sorted({label for _, label, _ in labels}))
+            pass_msg(f"Promtail stream labels are bounded ({label_list})")
+
+    # 6) Loki limits vs expected volume (warnings only).
+    if LOKI_CONFIG.exists():
+        loki = load_yaml(LOKI_CONFIG)
+        value = {key: cfg_get(loki, key, default) for key, default in LOKI_DEFAULTS.items()}
+        retention_days = parse_seconds(value["limits_config.retention_period"]) / 86400
+        streams = 2 * len(re.findall(r"^\s+container_name:", read(COMPOSE_FILE), re.MULTILINE))
+        bytes_per_day = args.log_lines_per_day * LOG_LINE_BYTES
+        peak_mb_s = bytes_per_day / 86400 * LOG_PEAK_FACTOR / 1024 ** 2
+        rate_mb = float(value["limits_config.ingestion_rate_mb"] or 0)
+        per_stream = parse_bytes(value["limits_config.per_stream_rate_limit"]) / 1024 ** 2
+        chunk_target = parse_bytes(value["ingester.chunk_target_size"])
+        max_age_s = parse_seconds(value["ingester.max_chunk_age"])
+        idle_s = parse_seconds(value["ingester.chunk_idle_period"])
+
+        def chunk_fill(lines_per_day: float) -> tuple[float, str]:
+            """(compressed bytes per flushed chunk, setting that flushes it) for one stream.
+
+            A stream quieter than one line per chunk_idle_period goes idle
+            between lines, so its chunks are cut after min(max_chunk_age,
+            chunk_idle_period) holding at least one line.
+            """
+            if lines_per_day <= 0:
+                return 0.0, "max_chunk_age"
+            window, setting = max_age_s, "max_chunk_age"
+            if 86400 / lines_per_day > idle_s and idle_s < max_age_s:
+                window, setting = idle_s, "chunk_idle_period"
+            lines = max(1.0, lines_per_day * window / 86400)
+            return lines * LOG_LINE_BYTES / LOG_COMPRESSION_RATIO, setting
+
+        # Busiest stream (the app) carries about half the volume; the rest is
+        # spread over the other streams.
+        app_chunk, app_flush = chunk_fill(args.log_lines_per_day / 2)
+        quiet_chunk, quiet_flush = chunk_fill(args.log_lines_per_day / 2 / max(1, streams - 1))
+        disk_gb = bytes_per_day / LOG_COMPRESSION_RATIO * retention_days / 1024 ** 3
+        details = [
+            f"expected {args.log_lines_per_day:,} lines/day x {LOG_LINE_BYTES} B = {bytes_per_day / 1024 ** 2:.0f} MB/day,"
+            f" peak ~{peak_mb_s:.2f} MB/s (x{LOG_PEAK_FACTOR}) over ~{streams} streams",
+            f"ingestion_rate_mb {rate_mb:g}, per_stream_rate_limit {value['limits_config.per_stream_rate_limit']},"
+            f" chunk_target_size {chunk_target / 1024:.0f} KB, max_chunk_age {value['ingester.max_chunk_age']},"
+            f" chunk_idle_period {value['ingester.chunk_idle_period']}",
+            f"retention {value['limits_config.retention_period']} -> ~{disk_gb:.1f} GB on disk"
+            f" (~{LOG_COMPRESSION_RATIO}x compression)",
+        ]
+        problems = []
+        if peak_mb_s > rate_mb * 0.5:
+            problems.append(f"peak {peak_mb_s:.2f} MB/s is over half of ingestion_rate_mb {rate_mb:g} -- bursts get 429s")
+        if peak_mb_s / 2 > per_stream:
+            problems.append(f"app stream peak {peak_mb_s / 2:.2f} MB/s exceeds per_stream_rate_limit")
+        for stream, fill, flush in (("app stream", app_chunk, app_flush),
+                                    ("other streams", quiet_chunk, quiet_flush)):
+            if chunk_target and fill < chunk_target * 0.1:
+                problems.append(
+                    f"{stream} fill ~{fill / 1024:.1f} KB per {flush}; chunks flush far below"
+                    f" chunk_target_size (many small files) -- raise chunk_idle_period/max_chunk_age"
+                )
+        if retention_days <= 0:
+            problems.append("retention_period unset: the compactor never deletes logs")
+        elif cfg_get(loki, "compactor.retention_enabled") != "true":
+            problems.append("retention_period set but compactor.retention_enabled is not true")
+        if problems:
+            warn_msg("Loki limits vs expected log volume", problems + details)
+        else:
+            pass_msg(f"Loki limits fit expected log volume ({details[0]})")
+
+    # 7) Log lines per request/job within budget or baseline.
+    # The baseline is only comparable at the multiplier it was recorded with.
+    baseline_multiplier, baseline = load_volume_baseline()
+    if args.loop_multiplier is None:
+        args.loop_multiplier = baseline_multiplier
+    comparable = not VOLUME_BASELINE_FILE.exists() or args.loop_multiplier == baseline_multiplier
+    estimates = estimate_log_volume(args.loop_multiplier)
+    if not comparable:
+        baseline = {}
+    grown = [
+        e for e in estimates
+        if e.lines > LOG_LINES_BUDGET and e.lines > baseline.get(e.entry, LOG_LINES_BUDGET) + 1e-6
+    ]
+    ranked = sorted(estimates, key=lambda e: (-e.lines, e.entry))
+    print(f"\nLog volume (estimated lines per request/job, budget {LOG_LINES_BUDGET}, "
+          f"loop x{args.loop_multiplier:g}; current / baseline):")
+    for e in ranked if args.log_volume else ranked[:10]:
+        base = baseline.get(e.entry)
+        print(f"- {e.lines:7.1f} / {f'{base:.1f}' if base is not None else '-':>6}  {e.entry}"
+              f"  ({e.path.relative_to(ROOT)}:{e.line})")
+    if not args.log_volume and len(ranked) > 10:
+        print(f"  ... {len(ranked) - 10} more (--log-volume)")
+    over = [e for e in estimates if e.lines > LOG_LINES_BUDGET]
+    if not comparable:
+        warn_msg(f"Log-volume ratchet skipped: --loop-multiplier {args.loop_multiplier:g} differs from the "
+                 f"baseline's x{baseline_multiplier:g}" + (" (baseline not updated)" if args.update_baseline else ""))
+    elif not VOLUME_BASELINE_FILE.exists():
+        if args.update_baseline:
+            write_volume_baseline(estimates, args.loop_multiplier)
+            print(f"Baseline created: {VOLUME_BASELINE_FILE.relative_to(ROOT)}")
+        else:
+            errors.append(f"Missing log-volume baseline: {VOLUME_BASELINE_FILE.relative_to(ROOT)} "
+                          "(create it with --update-baseline)")
+    elif grown:
+        errors.append(
+            "Log volume above budget and baseline:\n  - " + "\n  - ".join(
+                f"{e.entry}: {e.lines:.1f} lines (baseline {baseline.get(e.entry, LOG_LINES_BUDGET):.1f})"
+                f"  {e.path.relative_to(ROOT)}:{e.line}" for e in grown
+            ) + "\n  Drop per-item logs inside loops or fold them into one summary line."
+        )
+        if args.update_baseline:
+            print("Baseline not updated: the ratchet only accepts estimates that stay or go down.")
+    else:
+        if args.update_baseline:
+            write_volume_baseline(estimates, args.loop_multiplier)
+            print(f"Baseline updated: {VOLUME_BASELINE_FILE.relative_to(ROOT)}")
+        pass_msg(f"Log volume within budget or baseline ({len(over)} of {len(estimates)} handlers over "
+                 f"{LOG_LINES_BUDGET} lines are baselined)")
+
     if errors:
         print("\nLogging audit failed:")
         for err in errors:
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Shared TS/Node module resolution for the ops audit scripts.
+
+Import-following checks (client bundle weight, heavy client dependencies,
+worker/server-only leakage) all need the same answer to "which file does this
+specifier load?". This module reads tsconfig.json (or tsconfig.worker.json,
+following `extends`), applies `baseUrl`/`paths` aliases, probes extensions and
+`index.*` files, and resolves bare specifiers to package entry points in
+node_modules.
+
+Caches keep repeated audits cheap:
+  - specifier -> path resolutions are memoized per resolver instance
+  - each file's import edges (parsed specifiers and the files they resolve
+    to) are persisted in .cache/ops-audit/import-edges.json. Specifiers are
+    keyed by content hash; resolved targets additionally by a hash of the
+    effective tsconfig and package-lock.json, so only changed files are
+    re-parsed and unchanged edges skip the filesystem probes. A cached
+    target that no longer exists, or a specifier that did not resolve, is
+    resolved again.
+  - on-disk package import sizes are persisted in
+    .cache/ops-audit/package-sizes.json keyed by the package-lock.json version
+
+Usage from another audit script in scripts/ops/:
+    from module_resolver import ModuleResolver
+    resolver = ModuleResolver()
+    deps = resolver.dependencies(path)
+    resolver.save()
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+ROOT = Path(__file__).resolve().parents[2]
+EDGE_CACHE = ROOT / ".cache" / "ops-audit" / "import-edges.json"
+PACKAGE_SIZE_CACHE = ROOT / ".cache" / "ops-audit" / "package-sizes.json"
+# Bump when _IMPORT_RX or a cache entry shape changes so stale entries are dropped.
+CACHE_VERSION = 2
+# Upper bound on files walked inside one package when sizing an import.
+PACKAGE_WALK_LIMIT = 5000
+
+SOURCE_EXTS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs", ".json")
+# ESM-style TS imports name the emitted file (`./foo.js`) for a `foo.ts` source.
+_TS_SOURCE_FOR_JS = {".js": (".ts", ".tsx"), ".jsx": (".tsx",), ".mjs": (".mts",), ".cjs": (".cts",)}
+
+# Static `import ... from` / `export ... from` / side-effect imports.
+_IMPORT_RX = re.compile(
+    r'''^\s*(?:import|export)\s+(?P<type_only>type\s+)?(?:[\w*{}\s,$]+?\s+from\s+)?['"](?P<spec>[^'"]+)['"]''',
+    re.MULTILINE,
+)
+_DYNAMIC_IMPORT_RX = re.compile(r'''\bimport\(\s*['"](?P<spec>[^'"]+)['"]\s*\)''')
+_REQUIRE_RX = re.compile(r'''\brequire\(\s*['"](?P<spec>[^'"]+)['"]\s*\)''')
+
+# Conditions checked in package.json "exports", browser/ESM first to match
+# what Next.js bundles for client code.
+_EXPORT_CONDITIONS = ("browser", "import", "module", "default", "require", "node")
+
+
+class Import(NamedTuple):
+    spec: str
+    kind: str  # value | type | dynamic
+
+
+def package_name(spec: str) -> str | None:
+    """`@scope/pkg/sub` -> `@scope/pkg`, `pkg/sub` -> `pkg`; None for relative specifiers."""
+    if spec.startswith((".", "/")) or spec.startswith("node:"):
+        return None
+    parts = spec.split("/")
+    if spec.startswith("@"):
+        return "/".join(parts[:2]) if len(parts) >= 2 else None
+    return parts[0]
+
+
+def parse_imports(text: str) -> list[Import]:
+    """Return every import specifier in text, in source order per kind."""
+    found: list[Import] = []
+    for m in _IMPORT_RX.finditer(text):
+        found.append(Import(m.group("spec"), "type" if m.group("type_only") else "value"))
+    for m in _DYNAMIC_IMPORT_RX.finditer(text):
+        found.append(Import(m.group("spec"), "dynamic"))
+    for m in _REQUIRE_RX.finditer(text):
+        found.append(Import(m.group("spec"), "value"))
+    return found
+
+
+def _strip_jsonc(text: str) -> str:
+    """Drop // and /* */ comments and trailing commas (tsconfig allows both)."""
+    out: list[str] = []
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if c == '"':
+            j = i + 1
+            while j < n and text[j] != '"':
+                j += 2 if text[j] == "\\" else 1
+            out.append(text[i:j + 1])
+            i = j + 1
+        elif text.startswith("//", i):
+            while i < n and text[i] != "\n":
+                i += 1
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+        else:
+            out.append(c)
+            i += 1
+    return re.sub(r",(\s*[}\]])", r"\1", "".join(out))
+
+
+def load_tsconfig(path: Path) -> dict:
+    """Load a tsconfig, merging compilerOptions from its `extends` chain.
+
+    `paths` entries are rewritten to absolute directories here, because TS
+    resolves them against the `baseUrl` of the config that declares them.
+    """
+    try:
+        config = json.loads(_strip_jsonc(path.read_text(encoding="utf-8", errors="replace")))
+    except (OSError, json.JSONDecodeError):
+        return {"compilerOptions": {}}
+    opts: dict = {}
+    parent = config.get("extends")
+    if isinstance(parent, str) and parent.startswith("."):
+        opts.update(load_tsconfig((path.parent / parent).resolve()).get("compilerOptions", {}))
+    own = dict(config.get("compilerOptions", {}))
+    if "baseUrl" in own:
+        own["baseUrl"] = str((path.parent / own["baseUrl"]).resolve())
+    if "paths" in own:
+        base = Path(own.get("baseUrl") or opts.get("baseUrl") or path.parent)
+        own["paths"] = {
+            pattern: [str((base / target).resolve()) for target in targets]
+            for pattern, targets in own["paths"].items()
+        }
+    opts.update(own)
+    return {**config, "compilerOptions": opts}
+
+
+class ModuleResolver:
+    """Memoizing resolver for one tsconfig; share one instance per audit run."""
+
+    def __init__(self, tsconfig: str = "tsconfig.json", root: Path = ROOT) -> None:
+        self.root = root
+        opts = load_tsconfig(root / tsconfig).get("compilerOptions", {})
+        base_url = opts.get("baseUrl")
+        self.base_url = Path(base_url) if base_url else None
+        # "@/*": ["./src/*"] -> ("@/*", "@/", "", ["/abs/src/*"]); longest prefix wins, as in tsc.
+        self.aliases: list[tuple[str, str, str, list[str]]] = []
+        for pattern, targets in opts.get("paths", {}).items():
+            prefix, _, suffix = pattern.partition("*")
+            self.aliases.append((pattern, prefix, suffix, targets))
+        self.aliases.sort(key=lambda alias: -len(alias[1]))
+        self._resolved: dict[tuple[str, Path], Path | None] = {}
+        lock = root / "package-lock.json"
+        self.config_hash = hashlib.sha1(
+            json.dumps(opts, sort_keys=True).encode()
+            + (hashlib.sha1(lock.read_bytes()).digest() if lock.is_file() else b"")
+        ).hexdigest()[:16]
+        self._edges: dict[str, dict] = self._load_edges()
+        self._edge_entries: dict[Path, dict | None] = {}
+        self._edges_dirty = False
+        self._locked: dict[str, str] | None = None
+        self._package_sizes: dict[str, int] = _load_cache(PACKAGE_SIZE_CACHE)
+        self._package_sizes_dirty = False
+
+    # -- Resolution ---------------------------------------------------------
+
+    def resolve(self, spec: str, importer: Path) -> Path | None:
+        """Resolve spec as imported from importer; None for builtins and unknown modules."""
+        key = (spec, importer.parent)
+        if key not in self._resolved:
+            self._resolved[key] = self._resolve_uncached(spec, importer.parent)
+        return self._resolved[key]
+
+    def _resolve_uncached(self, spec: str, from_dir: Path) -> Path | None:
+        if spec.startswith("."):
+            return self._probe((from_dir / spec).resolve())
+        for pattern, prefix, suffix, targets in self.aliases:
+            if "*" in pattern:
+                if not (spec.startswith(prefix) and spec.endswith(suffix)):
+                    continue
+                star = spec[len(prefix):len(spec) - len(suffix)]
+            elif spec != pattern:
+                continue
+            else:
+                star = ""
+            for target in targets:
+                hit = self._probe(Path(target.replace("*", star, 1)))
+                if hit:
+                    return hit
+        if self.base_url:
+            hit = self._probe(self.base_url / spec)
+            if hit:
+                return hit
+        return self._resolve_package(spec, from_dir)
+
+    def _probe(self, base: Path) -> Path | None:
+        if base.is_file():
+            return base
+        for ext in _TS_SOURCE_FOR_JS.get(base.suffix, ()):
+            candidate = base.with_suffix(ext)
+            if candidate.is_file():
+                return candidate
+        for ext in SOURCE_EXTS:
+            candidate = base.with_name(base.name + ext)
+            if candidate.is_file():
+                return candidate
+        if base.is_dir():
+            for ext in SOURCE_EXTS:
+                candidate = base / f"index{ext}"
+                if candidate.is_file():
+                    return candidate
+        return None
+
+    def package_dir(self, name: str, from_dir: Path) -> Path | None:
+        """Nearest node_modules/<name> walking up from from_dir (stops at the repo root)."""
+        for d in [from_dir, *from_dir.parents]:
+            candidate = d / "node_modules" / name
+            if candidate.is_dir():
+                return candidate
+            if d == self.root:
+                break
+        return None
+
+    def _resolve_package(self, spec: str, from_dir: Path) -> Path | None:
+        name = package_name(spec)
+        if not name:
+            return None
+        pkg_dir = self.package_dir(name, from_dir)
+        if not pkg_dir:
+            return None
+        subpath = spec[len(name):].lstrip("/")
+        manifest = read_package_json(pkg_dir)
+        target = _exports_target(manifest.get("exports"), "./" + subpath if subpath else ".")
+        if target:
+            hit = self._probe(pkg_dir / target)
+            if hit:
+                return hit
+        if subpath:
+            return self._probe(pkg_dir / subpath)
+        for field in ("module", "main"):
+            if isinstance(manifest.get(field), str):
+                hit = self._probe(pkg_dir / manifest[field])
+                if hit:
+                    return hit
+        return self._probe(pkg_dir / "index")
+
+    # -- Package weight -----------------------------------------------------
+
+    def package_import_bytes(self, spec: str, importer: Path) -> int | None:
+        """Bytes on disk of the package files a bare import statically pulls in.
+
+        Walks the resolved entry file and its static imports within the same
+        package directory, so a barrel entry (e.g. an icon set root) counts
+        every module it re-exports. Cached per `spec@version`; None when the
+        package is not installed.
+        """
+        name = package_name(spec)
+        pkg_dir = self.package_dir(name, importer.parent) if name else None
+        if not pkg_dir:
+            return None
+        version = self._lock_versions().get(name) or read_package_json(pkg_dir).get("version", "0")
+        key = f"{spec}@{version}"
+        if key not in self._package_sizes:
+            self._package_sizes[key] = self._package_closure_bytes(spec, importer, pkg_dir)
+            self._package_sizes_dirty = True
+        return self._package_sizes[key]
+
+    def _package_closure_bytes(self, spec: str, importer: Path, pkg_dir: Path) -> int:
+        entry = self.resolve(spec, importer)
+        if not entry:
+            return 0
+        seen: set[Path] = set()
+        stack = [entry]
+        total = 0
+        while stack and len(seen) < PACKAGE_WALK_LIMIT:
+            f = stack.pop()
+            if f in seen:
+                continue
+            seen.add(f)
+            try:
+                raw = f.read_bytes()
+            except OSError:
+                continue
+            total += len(raw)
+            if f.suffix == ".json":
+                continue
+            for item in parse_imports(raw.decode("utf-8", errors="replace")):
+                if item.kind != "value":
+                    continue
+                target = self.resolve(item.spec, f)
+                if target and pkg_dir in target.parents:
+                    stack.append(target)
+        return total
+
+    def _lock_versions(self) -> dict[str, str]:
+        if self._locked is None:
+            try:
+                lock = json.loads((self.root / "package-lock.json").read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                lock = {}
+            self._locked = {
+                key[len("node_modules/"):]: entry.get("version", "")
+                for key, entry in lock.get("packages", {}).items()
+                if key.startswith("node_modules/") and "/node_modules/" not in key
+            }
+        return self._locked
+
+    # -- Import edges -------------------------------------------------------
+
+    def _cache_key(self, path: Path) -> str:
+        try:
+            return path.resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path.resolve())
+
+    def _edge_entry(self, path: Path) -> dict | None:
+        """Cache entry for path, re-parsed when its content hash changed (read once per run)."""
+        if path in self._edge_entries:
+            return self._edge_entries[path]
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            self._edge_entries[path] = None
+            return None
+        digest = hashlib.sha1(raw).hexdigest()
+        key = self._cache_key(path)
+        entry = self._edges.get(key)
+        if not entry or entry.get("hash") != digest:
+            found = parse_imports(raw.decode("utf-8", errors="replace"))
+            entry = {"hash": digest, "imports": [list(item) for item in found], "resolved": {}}
+            self._edges[key] = entry
+            self._edges_dirty = True
+        self._edge_entries[path] = entry
+        return entry
+
+    def imports(self, path: Path) -> list[Import]:
+        """Parsed import specifiers for path, reused from the cache when its hash matches."""
+        entry = self._edge_entry(path)
+        return [Import(spec, kind) for spec, kind in entry["imports"]] if entry else []
+
+    def resolve_import(self, spec: str, importer: Path) -> Path | None:
+        """resolve(), reusing the target persisted for importer's import edge when still valid."""
+        entry = self._edge_entry(importer)
+        if entry is None:
+            return self.resolve(spec, importer)
+        resolved = entry.setdefault("resolved", {}).setdefault(self.config_hash, {})
+        cached = resolved.get(spec)
+        if cached:
+            target = Path(cached) if Path(cached).is_absolute() else self.root / cached
+            if target.is_file():
+                return target
+        target = self.resolve(spec, importer)
+        if target and resolved.get(spec) != self._cache_key(target):
+            resolved[spec] = self._cache_key(target)
+            self._edges_dirty = True
+        return target
+
+    def dependencies(
+        self,
+        path: Path,
+        *,
+        kinds: tuple[str, ...] = ("value",),
+        packages: bool = False,
+    ) -> list[Path]:
+        """Resolved, de-duplicated dependencies of path.
+
+        Type-only and dynamic imports are excluded by default; node_modules
+        targets only when packages=True.
+        """
+        deps: list[Path] = []
+        for item in self.imports(path):
+            if item.kind not in kinds:
+                continue
+            target = self.resolve_import(item.spec, path)
+            if not target or target in deps:
+                continue
+            if not packages and "node_modules" in target.parts:
+                continue
+            deps.append(target)
+        return deps
+
+    def _load_edges(self) -> dict[str, dict]:
+        return _load_cache(EDGE_CACHE)
+
+    def save(self) -> None:
+        """Persist caches that changed during this run; failures are non-fatal."""
+        if self._edges_dirty:
+            # Another resolver (e.g. tsconfig.worker.json) may have saved since
+            # we loaded; keep its resolved targets for files whose hash agrees.
+            for key, theirs in self._load_edges().items():
+                ours = self._edges.get(key)
+                if ours is None:
+                    self._edges[key] = theirs
+                elif ours.get("hash") == theirs.get("hash"):
+                    for config, targets in theirs.get("resolved", {}).items():
+                        ours.setdefault("resolved", {}).setdefault(config, {}).update(
+                            {s: t for s, t in targets.items() if s not in ours["resolved"][config]})
+            live = {key: entry for key, entry in self._edges.items() if (self.root / key).exists()}
+            self._edges_dirty = not _write_cache(EDGE_CACHE, live)
+        if self._package_sizes_dirty:
+            self._package_sizes_dirty = not _write_cache(PACKAGE_SIZE_CACHE, self._package_sizes)
+
+
+def _load_cache(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("entries", {})
+
+
+def _write_cache(path: Path, entries: dict) -> bool:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"version": CACHE_VERSION, "entries": entries}, sort_keys=True),
+            encoding="utf-8",
+        )
+        tmp.replace(path)
+        return True
+    except OSError:
+        return False
+
+
+def read_package_json(pkg_dir: Path) -> dict:
+    try:
+        return json.loads((pkg_dir / "package.json").read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _exports_target(exports: object, subpath: str) -> str | None:
+    """Pick the file for subpath from a package.json "exports" field (no pattern keys)."""
+    if exports is None:
+        return None
+    if isinstance(exports, str):
+        return exports if subpath == "." else None
+    if isinstance(exports, list):
+        for entry in exports:
+            hit = _exports_target(entry, subpath)
+            if hit:
+                return hit
+        return None
+    if not isinstance(exports, dict):
+        return None
+    if any(key.startswith(".") for key in exports):
+        return _condition_target(exports.get(subpath))
+    return _condition_target(exports) if subpath == "." else None
+
+
+def _condition_target(entry: object) -> str | None:
+    if isinstance(entry, str):
+        return entry
+    if isinstance(entry, list):
+        for item in entry:
+            hit = _condition_target(item)
+            if hit:
+                return hit
+    if isinstance(entry, dict):
+        for condition in _EXPORT_CONDITIONS:
+            if condition in entry:
+                hit = _condition_target(entry[condition])
+                if hit:
+                    return hit
+    return None
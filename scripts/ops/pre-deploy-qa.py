@@ -9,21 +9,42 @@ Catches the classes of bugs that have caused production incidents:
   - Server-only env vars leaking into client bundles
   - Optional chaining pitfalls (obj?.prop.sub crashes if prop is undefined)
   - Fail-open not applied to critical endpoints
+  - Supabase query performance (N+1 calls in loops, select('*') over-fetch,
+    unbounded list reads, independent sequential awaits, index coverage)
+  - BullMQ queue settings (retention, retries, concurrency), worker loopback
+    fetches, Redis connection fan-out and memory policy vs job retention
+  - Host capacity (compose memory/CPU limits vs host size, healthcheck load,
+    Postgres memory/connection settings vs container memory and pool demand)
+  - Caddy edge settings per site (static caching, encoding order, stream
+    route flushing, HTTP/3)
+  - next.config.js against a production profile (standalone output,
+    compression, source maps, image formats, package import optimization)
+  - Prometheus label cardinality of the /api/metrics families
   - TypeScript errors
 
 Usage:
     python scripts/ops/pre-deploy-qa.py            # full audit
     python scripts/ops/pre-deploy-qa.py --no-tsc   # skip tsc (faster)
     python scripts/ops/pre-deploy-qa.py --strict   # treat WARNs as failures
+    python scripts/ops/pre-deploy-qa.py --host-memory 16g --host-cpus 4   # size the compose budget
+    python scripts/ops/pre-deploy-qa.py --jobs-per-day 5000   # size Redis job retention
+    python scripts/ops/pre-deploy-qa.py --job-failure-rate 0.1   # share of those jobs that fail
 """
 
 import argparse
+import fnmatch
 import re
 import subprocess
 import sys
+from math import prod
 from pathlib import Path
 from typing import NamedTuple
 
+from js_source import mask_code
+from module_resolver import ModuleResolver
+from sql_schema import covering_index, load_schema
+from yaml_subset import load_yaml, yaml_scalar
+
 # ANSI colours
 RED  = "\033[91m"
 GRN  = "\033[92m"
@@ -659,6 +680,2021 @@ def check_critical_endpoints_fail_open() -> None:
         record("PASS", "Critical endpoints (consent/health/vault) have error handling")
 
 
+# -- Query Performance --------------------------------------------------------
+
+# Supabase round-trips: PostgREST table reads/writes, RPCs and storage calls.
+# Builders are usually chained on the next line, so the client receiver is
+# not required; Buffer.from / Array.from (and typed arrays) are excluded.
+QUERY_CALL_RX = re.compile(r"(?<!Buffer)(?<!Array)\.(?:from|rpc)\(\s*['\"`]")
+# Loop heads whose body runs once per element. `.map(async` fans out in
+# parallel (N concurrent queries); the others run sequentially. Both patterns
+# are matched on mask_code() text so comments and strings do not count.
+LOOP_HEAD_RX = re.compile(
+    r"\bfor\s*(?:await\s*)?\(|\bwhile\s*\(|\.forEach\(|\.(?:map|flatMap)\(\s*async\b"
+)
+_FUNC_DECL_RX = re.compile(
+    r"^export\s+(?:default\s+)?(?:async\s+)?function\s+(\w+)\s*[<(]"
+    r"|^export\s+const\s+(\w+)\s*=\s*(?:async\s*)?(?:\([^)]*\)|\w+)\s*(?::[^=]+)?=>",
+    re.MULTILINE,
+)
+
+
+def match_close(text: str, i: int) -> int:
+    """Index of the bracket closing text[i] ('(', '{' or '['), skipping strings and comments.
+
+    Returns len(text) when unbalanced so callers treat the rest of the file as the span.
+    """
+    pairs = {"(": ")", "{": "}", "[": "]"}
+    stack: list[str] = []
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c in "'\"`":
+            j = i + 1
+            while j < n and text[j] != c:
+                j += 2 if text[j] == "\\" else 1
+            i = j + 1
+            continue
+        if text.startswith("//", i):
+            nl = text.find("\n", i)
+            i = n if nl < 0 else nl
+            continue
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        if c in pairs:
+            stack.append(pairs[c])
+        elif stack and c == stack[-1]:
+            stack.pop()
+            if not stack:
+                return i
+        i += 1
+    return n
+
+
+def line_at(text: str, idx: int) -> int:
+    return text.count("\n", 0, idx) + 1
+
+
+def function_bodies(text: str) -> list[tuple[str, int, int]]:
+    """(name, body start, body end) for each exported top-level function in text."""
+    out = []
+    for m in _FUNC_DECL_RX.finditer(text):
+        brace = text.find("{", m.end() if m.group(2) else match_close(text, text.find("(", m.start())))
+        if brace < 0:
+            continue
+        out.append((m.group(1) or m.group(2), brace, match_close(text, brace)))
+    return out
+
+
+def server_query_files() -> list[Path]:
+    """API route handlers plus server components (page/layout without 'use client')."""
+    app = ROOT / "src" / "app"
+    files = sorted((app / "api").rglob("route.ts")) if (app / "api").exists() else []
+    for name in ("page.tsx", "layout.tsx"):
+        for p in sorted(app.rglob(name)):
+            if "api" in p.relative_to(app).parts:
+                continue
+            head = p.read_text(encoding="utf-8", errors="replace").lstrip()[:40]
+            if not head.startswith(("'use client'", '"use client"')):
+                files.append(p)
+    return files
+
+
+_query_helper_cache: dict[str, str] | None = None
+
+
+def query_helpers() -> dict[str, str]:
+    """{function name: defining file} for exported src/lib helpers that hit Supabase.
+
+    Resolved to a fixpoint, so a helper that only calls another query helper
+    counts too.
+    """
+    global _query_helper_cache
+    if _query_helper_cache is not None:
+        return _query_helper_cache
+    bodies: list[tuple[str, str, str]] = []
+    lib = ROOT / "src" / "lib"
+    for p in sorted(lib.rglob("*.ts")) if lib.exists() else []:
+        text = p.read_text(encoding="utf-8", errors="replace")
+        rel = str(p.relative_to(ROOT))
+        masked = mask_code(text)
+        bodies.extend((name, rel, masked[start:end]) for name, start, end in function_bodies(text))
+    helpers = {name: rel for name, rel, body in bodies if QUERY_CALL_RX.search(body)}
+    changed = True
+    while changed:
+        changed = False
+        if not helpers:
+            break
+        call_rx = re.compile(r"\b(?:" + "|".join(map(re.escape, helpers)) + r")\s*\(")
+        for name, rel, body in bodies:
+            if name not in helpers and call_rx.search(body):
+                helpers[name] = rel
+                changed = True
+    _query_helper_cache = helpers
+    return helpers
+
+
+def loop_spans(text: str) -> list[tuple[int, int, bool]]:
+    """(start, end, parallel) for each loop body in masked text; nested loops are listed separately."""
+    spans = []
+    for m in LOOP_HEAD_RX.finditer(text):
+        head = m.group(0)
+        if head.startswith(("for", "while")):
+            header_close = match_close(text, m.end() - 1)
+            rest = text[header_close + 1:header_close + 200].lstrip()
+            if rest.startswith("{"):
+                body_start = text.index("{", header_close)
+                spans.append((body_start, match_close(text, body_start), False))
+            else:
+                line_end = text.find(";", header_close)
+                spans.append((header_close, len(text) if line_end < 0 else line_end, False))
+        else:
+            paren = m.start() + head.index("(")
+            spans.append((paren, match_close(text, paren), not head.startswith(".forEach")))
+    return spans
+
+
+def check_n_plus_one_queries() -> None:
+    """
+    Supabase calls inside loops cost one Kong/PostgREST round-trip per element.
+    Cron routes that iterate over users (send-reminders, process-email-queue)
+    pay this per run. Batch with .in(), a join in the select, or an RPC.
+    Calls through exported src/lib helpers that query Supabase count as well.
+    """
+    helpers = query_helpers()
+    helper_rx = (
+        re.compile(r"(?<![.\w])(" + "|".join(map(re.escape, helpers)) + r")\s*\(")
+        if helpers else None
+    )
+    sequential: list[tuple[Path, int, str]] = []
+    parallel: list[tuple[Path, int, str]] = []
+    for p in server_query_files():
+        text = p.read_text(encoding="utf-8", errors="replace")
+        lines = text.splitlines()
+        masked = mask_code(text)
+        seen: set[int] = set()
+        for start, end, is_parallel in loop_spans(masked):
+            body = masked[start:end]
+            calls = [(m.start(), "") for m in QUERY_CALL_RX.finditer(body)]
+            if helper_rx:
+                calls += [(m.start(), f" [via {m.group(1)}()]") for m in helper_rx.finditer(body)]
+            for offset, via in calls:
+                lineno = line_at(text, start + offset)
+                if lineno in seen:
+                    continue
+                seen.add(lineno)
+                target = parallel if is_parallel else sequential
+                target.append((p, lineno, lines[lineno - 1].strip() + via))
+    if sequential or parallel:
+        detail_parts = []
+        if sequential:
+            detail_parts.append(f"Sequential (for/while/forEach) -- {len(sequential)}:\n" + fmt_hits(sequential))
+        if parallel:
+            detail_parts.append(f"Parallel fan-out (.map(async)) -- {len(parallel)}:\n" + fmt_hits(parallel))
+        record("WARN",
+               f"Supabase calls inside loops (N+1) -- {len(sequential) + len(parallel)} location(s)",
+               "\n".join(detail_parts) +
+               "\nFetch the set once with .in('id', ids) or a joined select, then loop in memory.")
+    else:
+        record("PASS", "No Supabase calls inside loops in API routes or server components")
+
+
+# select('*') in src/app/api allowed before the check FAILs. 28 is the count in
+# src/app/api when the check was added (2026-10-19), not a target: lower it
+# whenever a route switches to an explicit column list (the WARN prints the
+# current count) and never raise it for new code.
+SELECT_STAR_API_BUDGET = 28
+
+SELECT_STAR_RX = re.compile(r"\.select\(\s*(['\"`])\*\1\s*(?P<opts>,[^)]*)?\)")
+_CHAIN_FROM_RX = re.compile(r"\.from\(\s*['\"`](\w+)['\"`]\s*\)")
+_BINDING_RX = re.compile(
+    r"(?:const|let|var)\s+(?P<bind>\{[^{}]*\}|\w+)\s*=\s*(?P<await>await\s+)?[\w.]+\s*$"
+)
+# Members of the array/result wrapper rather than table columns.
+_NON_COLUMN_MEMBERS = {
+    "length", "map", "filter", "forEach", "find", "findIndex", "some", "every",
+    "reduce", "slice", "sort", "includes", "indexOf", "concat", "flatMap", "push",
+    "join", "at", "keys", "values", "entries", "then", "toString",
+}
+_ITERATOR_METHODS = "map|flatMap|forEach|filter|find|findIndex|some|every|sort"
+
+
+def block_end(text: str, i: int) -> int:
+    """Index where the block enclosing text[i] closes (first unmatched closer)."""
+    depth = 0
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c in "'\"`":
+            j = i + 1
+            while j < n and text[j] != c:
+                j += 2 if text[j] == "\\" else 1
+            i = j + 1
+            continue
+        if c in "({[":
+            depth += 1
+        elif c in ")}]":
+            depth -= 1
+            if depth < 0:
+                return i
+        i += 1
+    return n
+
+
+def _result_name(binding: str) -> str | None:
+    """Variable holding the rows: `{ data: rows }` -> rows, `{ data }` -> data, `res` -> res.data."""
+    if not binding.startswith("{"):
+        return rf"{re.escape(binding)}\??\.data"
+    m = re.search(r"\bdata\s*(?::\s*(\w+))?", binding)
+    if not m:
+        return None
+    return re.escape(m.group(1) or "data")
+
+
+def infer_used_columns(region: str, name_rx: str) -> tuple[set[str], bool]:
+    """(columns read, escapes) for the rows bound to name_rx within region.
+
+    escapes is True when the rows (or one element) are returned, spread or
+    passed to another function, so every column may be needed downstream.
+    """
+    columns: set[str] = set()
+    escapes = False
+    names = [name_rx]
+    for m in re.finditer(rf"for\s*\(\s*(?:const|let)\s+(\w+)\s+of\s+{name_rx}\b", region):
+        names.append(re.escape(m.group(1)))
+    for m in re.finditer(
+        rf"{name_rx}\??\.(?:{_ITERATOR_METHODS})\(\s*(?:async\s*)?\(?\s*(?:(\w+)|\{{([^}}]*)\}})",
+        region,
+    ):
+        if m.group(1):
+            names.append(re.escape(m.group(1)))
+        else:
+            columns.update(_destructured_keys(m.group(2)))
+    for name in names:
+        for m in re.finditer(rf"(?<![\w.]){name}\??\.(\w+)", region):
+            if m.group(1) not in _NON_COLUMN_MEMBERS:
+                columns.add(m.group(1))
+        for m in re.finditer(rf"\{{([^{{}}]*)\}}\s*=\s*{name}\b", region):
+            keys = _destructured_keys(m.group(1))
+            escapes = escapes or "..." in m.group(1)
+            columns.update(keys)
+        for m in re.finditer(
+            rf"(?:[(,:=]|\?\?|\.\.\.|\breturn)\s*{name}\s*(?:[),}}\];]|\|\||\?\?|\bas\b|$)",
+            region,
+            re.MULTILINE,
+        ):
+            before = region[max(0, m.start() - 4):m.start() + 1]
+            if not re.search(r"\b(?:if|while)\s*\($", before):
+                escapes = True
+    return columns, escapes
+
+
+def _destructured_keys(pattern: str) -> set[str]:
+    keys = set()
+    for part in pattern.split(","):
+        key = part.strip().split(":")[0].split("=")[0].strip()
+        if key and not key.startswith("..."):
+            keys.add(key)
+    return keys
+
+
+def check_select_star_overfetch() -> None:
+    """
+    select('*') pulls every column, including encrypted blobs, through Kong and
+    PostgREST. For each call we follow the bound result through the rest of the
+    enclosing block and suggest the column list it actually reads.
+    Count-only queries ({ head: true }) return no rows and are skipped.
+    """
+    api_dir = ROOT / "src" / "app" / "api"
+    found: list[tuple[Path, int, str]] = []
+    api_count = 0
+    for p in ts_files():
+        if "tests" in p.parts or "__tests__" in p.parts:
+            continue
+        text = p.read_text(encoding="utf-8", errors="replace")
+        for m in SELECT_STAR_RX.finditer(text):
+            if re.search(r"\bhead\s*:\s*true", m.group("opts") or ""):
+                continue
+            chain_head = text[max(0, m.start() - 400):m.start()]
+            tables = _CHAIN_FROM_RX.findall(chain_head)
+            table = tables[-1] if tables else "?"
+            from_at = chain_head.rfind(".from(")
+            binding = _BINDING_RX.search(chain_head[:from_at]) if from_at >= 0 else None
+            name_rx = _result_name(binding.group("bind")) if binding else None
+            if binding and not binding.group("await"):
+                suggestion = "query builder awaited later -- list the columns its consumers read"
+            elif not name_rx:
+                suggestion = "result not bound to a variable -- list columns explicitly"
+            else:
+                region = text[m.end():block_end(text, m.end())]
+                columns, escapes = infer_used_columns(region, name_rx)
+                if escapes:
+                    suggestion = "rows are returned/passed on -- list the columns the caller needs"
+                elif columns:
+                    suggestion = f"select('{', '.join(sorted(columns))}')"
+                else:
+                    suggestion = "no column reads found -- select('id') or a count query may do"
+            found.append((p, line_at(text, m.start()), f"{table}: {suggestion}"))
+            if api_dir in p.parents:
+                api_count += 1
+    if api_count > SELECT_STAR_API_BUDGET:
+        record("FAIL",
+               f"select('*') in API routes over budget: {api_count} > {SELECT_STAR_API_BUDGET}",
+               fmt_hits(found, n=12) +
+               "\nNew API queries must list columns explicitly; see suggestions above.")
+    elif found:
+        record("WARN",
+               f"select('*') over-fetch -- {len(found)} location(s), "
+               f"{api_count}/{SELECT_STAR_API_BUDGET} in API routes",
+               fmt_hits(found, n=12) +
+               (f"\nAPI count is below budget -- lower SELECT_STAR_API_BUDGET to {api_count}."
+                if api_count < SELECT_STAR_API_BUDGET else ""))
+    else:
+        record("PASS", "No select('*') queries found")
+
+
+class QueryChain(NamedTuple):
+    table: str
+    start: int                     # offset of `.from(`
+    end:   int                     # offset just past the last chained call
+    calls: list[tuple[str, str]]   # (method, raw argument text) after .from()
+
+
+_CHAINED_CALL_RX = re.compile(r"\s*(?://[^\n]*\s*)*\??\.(\w+)\s*(?:<[^>]*>)?\(")
+
+
+def query_chains(text: str) -> list[QueryChain]:
+    """Every PostgREST builder chain (`.from('t').select(...).eq(...)...`) in text.
+
+    Chains are followed across lines and comments; storage `.from(bucket)` is skipped.
+    """
+    chains = []
+    for m in _CHAIN_FROM_RX.finditer(text):
+        if text[max(0, m.start() - 12):m.start()].rstrip().endswith("storage"):
+            continue
+        calls: list[tuple[str, str]] = []
+        i = m.end()
+        while True:
+            call = _CHAINED_CALL_RX.match(text, i)
+            if not call:
+                break
+            close = match_close(text, call.end() - 1)
+            calls.append((call.group(1), text[call.end():close]))
+            i = close + 1
+        chains.append(QueryChain(m.group(1), m.start(), i, calls))
+    return chains
+
+
+def _first_string_arg(args: str) -> str:
+    m = re.match(r"\s*['\"`]([^'\"`]*)['\"`]", args)
+    return m.group(1) if m else ""
+
+
+# .eq()/.in() on one of these selects at most a handful of rows.
+UNIQUE_KEY_COLUMNS = {
+    "id", "token", "token_hash", "invitation_token",
+    "stripe_customer_id", "stripe_subscription_id",
+}
+_ROW_LIMITING_CALLS = {"limit", "range", "single", "maybeSingle"}
+_MUTATING_CALLS = {"insert", "update", "upsert", "delete"}
+
+
+def chain_is_bounded(chain: QueryChain) -> bool:
+    for method, args in chain.calls:
+        if method in _ROW_LIMITING_CALLS:
+            return True
+        if method == "select" and re.search(r"\bhead\s*:\s*true", args):
+            return True
+        if method in ("eq", "in", "match") and _first_string_arg(args) in UNIQUE_KEY_COLUMNS:
+            return True
+    return False
+
+
+def _describe_chain(chain: QueryChain) -> str:
+    parts = []
+    for method, args in chain.calls:
+        col = _first_string_arg(args) if method not in ("select",) else ""
+        parts.append(f".{method}({col})" if col else f".{method}()")
+    return f"{chain.table}{''.join(parts)}"
+
+
+def _is_background_path(p: Path) -> bool:
+    rel = p.relative_to(ROOT).as_posix()
+    return (
+        rel.startswith("src/app/api/cron/")
+        or rel.startswith("src/lib/queue/")
+        or rel == "src/worker-entrypoint.ts"
+    )
+
+
+def check_unbounded_list_queries() -> None:
+    """
+    A select chain without .limit()/.range()/.single()/.maybeSingle() or an
+    .eq()/.in() on a unique key returns every matching row -- user-scoped
+    filters like .eq('user_id') included, since those grow with each upload.
+    Builders assigned to a variable are bounded if a later `var.limit(...)`
+    etc. appears in the same block.
+    """
+    request_path: list[tuple[Path, int, str]] = []
+    background: list[tuple[Path, int, str]] = []
+    for p in ts_files():
+        if "tests" in p.parts or "__tests__" in p.parts:
+            continue
+        text = p.read_text(encoding="utf-8", errors="replace")
+        if ".from(" not in text:
+            continue
+        for chain in query_chains(text):
+            methods = {method for method, _ in chain.calls}
+            if "select" not in methods or methods & _MUTATING_CALLS or chain_is_bounded(chain):
+                continue
+            binding = _BINDING_RX.search(text[max(0, chain.start - 200):chain.start])
+            if binding and not binding.group("await") and not binding.group("bind").startswith("{"):
+                var = re.escape(binding.group("bind"))
+                later = text[chain.end:block_end(text, chain.end)]
+                limited = "|".join(sorted(_ROW_LIMITING_CALLS))
+                if re.search(rf"\b{var}\s*(?:=\s*{var}\s*)?\.(?:{limited})\(", later):
+                    continue
+            hit = (p, line_at(text, chain.start), _describe_chain(chain)[:110])
+            (background if _is_background_path(p) else request_path).append(hit)
+    hint = "\nAdd .limit()/.range() (paginate) or filter on a unique key; returned rows grow with table size."
+    if request_path:
+        record("WARN",
+               f"Unbounded list queries on request paths -- {len(request_path)} location(s)",
+               fmt_hits(request_path, n=10) + hint)
+    else:
+        record("PASS", "All request-path list queries are bounded")
+    if background:
+        record("WARN",
+               f"Unbounded list queries in cron/worker code -- {len(background)} location(s)",
+               fmt_hits(background, n=10) +
+               "\nCron batches should page through rows (.range) instead of loading all at once.")
+    else:
+        record("PASS", "All cron/worker list queries are bounded")
+
+
+# Awaited expressions that cost a network round-trip (Kong/PostgREST, GoTrue,
+# storage, Stripe, Resend, outbound fetch).
+NETWORK_AWAIT_RX = re.compile(
+    r"\.(?:from|rpc)\(|\.auth\.|\.storage\b|\bstripe\.|\bresend\.|\bfetch\("
+)
+# Side effects: the statements around these may depend on their ordering.
+WRITE_CALL_RX = re.compile(
+    r"\.(?:insert|update|upsert|delete|remove|upload|create|del|cancel|send)\("
+    r"|method\s*:\s*['\"](?:POST|PUT|PATCH|DELETE)"
+)
+_DECL_START_RX = re.compile(r"^[ \t]*(?:const|let)\s+", re.MULTILINE)
+_DECL_REST_RX = re.compile(r"\s*(?::[^=;\n]+)?=\s*await\s")
+
+
+class AwaitStmt(NamedTuple):
+    start: int
+    end:   int
+    names: set[str]   # identifiers bound by the declaration
+    expr:  str        # text after `= await`
+
+
+def statement_end(text: str, i: int) -> int:
+    """End of the statement containing text[i]: `;`, or a newline that does not continue the expression."""
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c in "({[":
+            i = match_close(text, i) + 1
+            continue
+        if c in "'\"`":
+            j = i + 1
+            while j < n and text[j] != c:
+                j += 2 if text[j] == "\\" else 1
+            i = j + 1
+            continue
+        if c == ";":
+            return i + 1
+        if c in ")}]":
+            return i
+        if c == "\n":
+            j = i
+            while j < n and text[j] in " \t\r\n":
+                j += 1
+            if j < n and text[j] in ".?:|&+-*/":
+                i = j
+                continue
+            return i
+        i += 1
+    return n
+
+
+def _bound_names(pattern: str) -> set[str]:
+    """Identifiers a declaration binds: `{ data: { user }, error }` -> {user, error}."""
+    pattern = re.sub(r"=\s*[^,}\]]+", "", pattern)
+    return {
+        m.group(1) for m in re.finditer(r"\b([A-Za-z_$][\w$]*)\b(?!\s*:)", pattern)
+    }
+
+
+def await_statements(text: str) -> list[AwaitStmt]:
+    """`const|let <binding> = await ...` declarations in text, in source order."""
+    stmts = []
+    for m in _DECL_START_RX.finditer(text):
+        i = m.end()
+        if i < len(text) and text[i] in "{[":
+            pat_end = match_close(text, i) + 1
+        else:
+            word = re.match(r"[A-Za-z_$][\w$]*", text[i:])
+            if not word:
+                continue
+            pat_end = i + word.end()
+        rest = _DECL_REST_RX.match(text, pat_end)
+        if not rest:
+            continue
+        end = statement_end(text, rest.end())
+        stmts.append(AwaitStmt(m.start(), end, _bound_names(text[i:pat_end]), text[rest.end():end]))
+    return stmts
+
+
+def await_runs(text: str) -> list[list[AwaitStmt]]:
+    """Runs of adjacent await declarations, split at writes (whose ordering matters)."""
+    runs: list[list[AwaitStmt]] = []
+    current: list[AwaitStmt] = []
+    prev_end = -1
+    for stmt in await_statements(text):
+        # Declarations nested inside the previous one (e.g. in a .map(async) callback) start a new run.
+        gap = text[prev_end:stmt.start] if 0 <= prev_end <= stmt.start else None
+        adjacent = gap is not None and not re.sub(r"//[^\n]*|[\s;]", "", gap)
+        if not adjacent or WRITE_CALL_RX.search(stmt.expr):
+            if len(current) > 1:
+                runs.append(current)
+            current = []
+        if not WRITE_CALL_RX.search(stmt.expr):
+            current.append(stmt)
+        prev_end = stmt.end
+    if len(current) > 1:
+        runs.append(current)
+    return runs
+
+
+def waterfall_savings(run: list[AwaitStmt], is_network) -> tuple[int, int]:
+    """(network round-trips as written, round-trips on the critical path with Promise.all)."""
+    depth: list[int] = []
+    for k, stmt in enumerate(run):
+        deps = [
+            depth[j] for j in range(k)
+            if any(re.search(rf"(?<![\w$.]){re.escape(name)}\b", stmt.expr) for name in run[j].names)
+        ]
+        depth.append(max(deps, default=0) + (1 if is_network(stmt.expr) else 0))
+    sequential = sum(1 for stmt in run if is_network(stmt.expr))
+    return sequential, max(depth, default=0)
+
+
+def check_sequential_await_waterfalls() -> None:
+    """
+    `const a = await x(); const b = await y()` pays two round-trips even when
+    y() never reads a. Within each run of adjacent await declarations, the
+    critical path follows binding references; everything else could share a
+    Promise.all. Writes end a run since callers usually rely on their order.
+    Scoped to API route handlers and async page.tsx server components.
+    """
+    helpers = query_helpers()
+    helper_rx = (
+        re.compile(r"(?<![.\w])(?:" + "|".join(map(re.escape, helpers)) + r")\s*\(")
+        if helpers else None
+    )
+
+    def is_network(expr: str) -> bool:
+        return bool(NETWORK_AWAIT_RX.search(expr) or (helper_rx and helper_rx.search(expr)))
+
+    files = [
+        p for p in server_query_files()
+        if p.name == "route.ts"
+        or (p.name == "page.tsx" and re.search(
+            r"export\s+default\s+async\s+function", p.read_text(encoding="utf-8", errors="replace")))
+    ]
+    hits: list[tuple[Path, int, str]] = []
+    saved_total = 0
+    for p in files:
+        text = p.read_text(encoding="utf-8", errors="replace")
+        for run in await_runs(text):
+            sequential, critical = waterfall_savings(run, is_network)
+            if sequential - critical < 1:
+                continue
+            saved_total += sequential - critical
+            names = ", ".join(sorted(set().union(*(stmt.names for stmt in run)) - {"error"}))[:60]
+            hits.append((
+                p, line_at(text, run[0].start),
+                f"{sequential} awaits -> {critical} round-trip(s) with Promise.all ({names})",
+            ))
+    if hits:
+        record("WARN",
+               f"Sequential independent awaits -- {len(hits)} run(s), ~{saved_total} round-trip(s) saved",
+               fmt_hits(hits) +
+               "\nWrap independent awaits in Promise.all([...]); each saved round-trip is one network hop off the response time.")
+    else:
+        record("PASS", "No independent sequential awaits in route handlers or server components")
+
+
+# Builder methods whose first argument is a column the database filters on.
+_FILTER_CALLS = {"eq", "in", "gte", "lte", "gt", "lt"}
+_EQUALITY_CALLS = {"eq", "in"}
+# Calls that constrain a column enough to satisfy a partial-index predicate on it.
+_PINNING_CALLS = _FILTER_CALLS | {"is", "not", "neq", "like", "ilike"}
+
+
+def check_index_coverage() -> None:
+    """
+    Joins the migration schema (supabase/legacy-bootstrap.sql, supabase/migration_0*.sql,
+    supabase/migrations/*.sql) with the columns each query chain filters
+    (.eq/.in/.gte/.lte/.gt/.lt) and sorts (.order) on. A chain is served when at
+    least one filter column leads an index (or follows equality-pinned keys);
+    otherwise each filter column is reported. Sort columns are reported when no
+    index covers them behind the chain's equality filters. Tables with a
+    user_id column are listed first -- they grow with every account.
+    """
+    schema = load_schema()
+    if not schema.tables:
+        record("WARN", "Index coverage skipped -- no CREATE TABLE found in supabase/ migrations")
+        return
+    missing: dict[tuple[str, str, str], list[tuple[Path, int]]] = {}
+    unknown_tables: set[str] = set()
+    for p in ts_files():
+        if "tests" in p.parts or "__tests__" in p.parts:
+            continue
+        text = p.read_text(encoding="utf-8", errors="replace")
+        if ".from(" not in text:
+            continue
+        for chain in query_chains(text):
+            filters = [(m, _first_string_arg(a)) for m, a in chain.calls if m in _FILTER_CALLS]
+            orders = [_first_string_arg(a) for m, a in chain.calls if m == "order"]
+            filters = [(m, col) for m, col in filters if col and "." not in col]
+            orders = [col for col in orders if col and "." not in col]
+            if not filters and not orders:
+                continue
+            if chain.table not in schema.tables:
+                unknown_tables.add(chain.table)
+                continue
+            indexes = schema.indexes_on(chain.table)
+            equality = {col for m, col in filters if m in _EQUALITY_CALLS}
+            pinned = {_first_string_arg(a) for m, a in chain.calls if m in _PINNING_CALLS} - {""}
+            site = (p, line_at(text, chain.start))
+            served = any(covering_index(indexes, col, equality - {col}, pinned) for _, col in filters)
+            if not served:
+                for m, col in filters:
+                    missing.setdefault((chain.table, col, "filter"), []).append(site)
+            for col in orders:
+                if not covering_index(indexes, col, equality, pinned):
+                    missing.setdefault((chain.table, col, "order"), []).append(site)
+
+    def user_scoped(table: str) -> bool:
+        return "user_id" in schema.tables[table].columns
+
+    rows = sorted(
+        missing.items(),
+        key=lambda item: (item[0][2] != "filter", not user_scoped(item[0][0]), -len(item[1]), item[0]),
+    )
+    hits = [
+        (sites[0][0], sites[0][1],
+         f"{table}.{col} [{kind}] {len(sites)} site(s){' (user_id-scoped)' if user_scoped(table) else ''}")
+        for (table, col, kind), sites in rows
+    ]
+    note = (f"\nTables not created in supabase/ migrations (not checked): {', '.join(sorted(unknown_tables))}"
+            if unknown_tables else "")
+    if hits:
+        n_filter = sum(1 for (_, _, kind) in missing if kind == "filter")
+        record("WARN",
+               f"Query columns without a covering index -- {n_filter} filter, {len(hits) - n_filter} order",
+               fmt_hits(hits, n=12) + note +
+               "\nAdd a migration with CREATE INDEX on the filter column (equality keys first, then the sort key).")
+    else:
+        record("PASS", f"All filter/order columns have a covering index ({len(schema.tables)} tables)" + note)
+
+
+# -- Background Jobs ----------------------------------------------------------
+
+QUEUE_DIR = "src/lib/queue"
+
+
+def split_args(text: str) -> list[str]:
+    """Top-level comma-separated parts of an argument list or object body."""
+    parts: list[str] = []
+    start = i = 0
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c in "({[":
+            i = match_close(text, i) + 1
+            continue
+        if c in "'\"`":
+            j = i + 1
+            while j < n and text[j] != c:
+                j += 2 if text[j] == "\\" else 1
+            i = j + 1
+            continue
+        if text.startswith("//", i):
+            nl = text.find("\n", i)
+            i = n if nl < 0 else nl
+            continue
+        if c == ",":
+            parts.append(text[start:i].strip())
+            start = i + 1
+        i += 1
+    if text[start:].strip():
+        parts.append(text[start:].strip())
+    return parts
+
+
+def object_entries(literal: str) -> dict[str, str]:
+    """{key: raw value} for the top level of a JS object literal (`{ a: 1, b: { c: 2 } }`)."""
+    body = literal.strip()
+    if not body.startswith("{"):
+        return {}
+    body = body[1:match_close(body, 0)]
+    entries: dict[str, str] = {}
+    for part in split_args(body):
+        m = re.match(r"""\s*(?:(['"])(?P<q>[^'"]+)\1|(?P<k>[\w$]+))\s*:\s*(?P<v>.*)$""", part, re.DOTALL)
+        if m:
+            entries[m.group("q") or m.group("k")] = m.group("v").strip()
+        elif re.fullmatch(r"[\w$]+", part.strip()):
+            entries[part.strip()] = part.strip()   # shorthand property
+    return entries
+
+
+def object_path(literal: str, path: str) -> str | None:
+    """Raw value at a dotted key path (`defaultJobOptions.backoff`), or None."""
+    value: str | None = literal
+    for key in path.split("."):
+        value = object_entries(value).get(key) if value is not None else None
+    return value
+
+
+class BullConstruct(NamedTuple):
+    kind:    str   # Worker | Queue
+    queue:   str
+    path:    Path
+    line:    int
+    handler: str   # processor source (Worker only)
+    options: str   # options object literal source
+
+
+_BULL_NEW_RX = re.compile(r"\bnew\s+(Worker|Queue)\s*(?:<[^>]*>)?\(")
+
+
+def bull_constructs() -> list[BullConstruct]:
+    """Every `new Worker(name, processor, opts)` / `new Queue(name, opts)` under src/lib/queue."""
+    found = []
+    qdir = ROOT / QUEUE_DIR
+    for p in sorted(qdir.rglob("*.ts")) if qdir.exists() else []:
+        text = p.read_text(encoding="utf-8", errors="replace")
+        for m in _BULL_NEW_RX.finditer(text):
+            args = split_args(text[m.end():match_close(text, m.end() - 1)])
+            if not args:
+                continue
+            name = re.match(r"""\s*['"`]([^'"`]+)['"`]""", args[0])
+            kind = m.group(1)
+            opts_idx = 2 if kind == "Worker" else 1
+            found.append(BullConstruct(
+                kind, name.group(1) if name else args[0], p, line_at(text, m.start()),
+                args[1] if kind == "Worker" and len(args) > 1 else "",
+                args[opts_idx] if len(args) > opts_idx else "",
+            ))
+    return found
+
+
+_LOOPBACK_URL_RX = re.compile(r"NEXTJS_INTERNAL_URL|localhost|127\.0\.0\.1")
+
+
+def fetch_calls(text: str) -> list[tuple[int, str, str]]:
+    """(offset, url argument, init argument) for each fetch(...) call in text."""
+    calls = []
+    for m in re.finditer(r"(?<![\w.])fetch\s*\(", text):
+        args = split_args(text[m.end():match_close(text, m.end() - 1)])
+        if args:
+            calls.append((m.start(), args[0], args[1] if len(args) > 1 else ""))
+    return calls
+
+
+def check_bullmq_config() -> None:
+    """
+    Reports each queue's worker concurrency/limiter and job retention/retry
+    settings (Queue defaultJobOptions merged with the Worker for the same
+    name). removeOnComplete/removeOnFail left unset keeps every job hash in
+    Redis forever; no attempts/backoff means one transient error drops the job.
+    """
+    constructs = bull_constructs()
+    if not constructs:
+        record("WARN", f"No BullMQ Worker/Queue construction found under {QUEUE_DIR}")
+        return
+    queues = sorted({c.queue for c in constructs})
+    for queue in queues:
+        workers = [c for c in constructs if c.queue == queue and c.kind == "Worker"]
+        defs = [c for c in constructs if c.queue == queue and c.kind == "Queue"]
+        issues: list[str] = []
+        lines: list[str] = []
+        for w in workers:
+            concurrency = object_path(w.options, "concurrency") or "1 (default)"
+            limiter = object_path(w.options, "limiter")
+            lines.append(f"Worker {w.path.relative_to(ROOT)}:{w.line}  concurrency={concurrency}"
+                         f"  limiter={' '.join(limiter.split()) if limiter else 'none'}")
+        for q in defs:
+            job = object_path(q.options, "defaultJobOptions") or ""
+            settings = {
+                key: object_path(job, key) if job else None
+                for key in ("attempts", "backoff", "removeOnComplete", "removeOnFail")
+            }
+            lines.append(f"Queue  {q.path.relative_to(ROOT)}:{q.line}  " + "  ".join(
+                f"{key}={' '.join(v.split()) if v else 'unset'}" for key, v in settings.items()))
+            for key in ("removeOnComplete", "removeOnFail"):
+                if settings[key] in (None, "false"):
+                    issues.append(f"{key} unset -- jobs accumulate in Redis")
+            if settings["attempts"] in (None, "0", "1"):
+                issues.append("no retries (attempts <= 1)")
+            elif not settings["backoff"]:
+                issues.append("retries without backoff")
+        if not workers:
+            issues.append("no Worker consumes this queue")
+        if not defs:
+            issues.append("no Queue definition -- producer uses BullMQ defaults (no retention limit)")
+        record("WARN" if issues else "PASS",
+               f"BullMQ '{queue}': " + ("; ".join(issues) if issues else "retention, retries and backoff set"),
+               "\n".join(lines))
+
+
+def check_worker_loopback_fetches() -> None:
+    """
+    Worker handlers that fetch back into Next.js (NEXTJS_INTERNAL_URL/api/...)
+    hold a worker slot and an HTTP socket for the full route duration and
+    double-count the work in both processes. A fetch without an AbortSignal
+    can hang the job until BullMQ's lock expires and the job is re-run.
+    """
+    loopback: list[tuple[Path, int, str]] = []
+    no_timeout: list[tuple[Path, int, str]] = []
+    qdir = ROOT / QUEUE_DIR
+    files = sorted(qdir.rglob("*.ts")) if qdir.exists() else []
+    entry = ROOT / "src" / "worker-entrypoint.ts"
+    if entry.exists():
+        files.append(entry)
+    # (file, handler start, handler end) -> queue name, to attribute each fetch.
+    handlers: dict[tuple[Path, int, int], str] = {}
+    for c in bull_constructs():
+        if c.kind == "Worker":
+            start = c.path.read_text(encoding="utf-8", errors="replace").find(c.handler)
+            if start >= 0:
+                handlers[(c.path, start, start + len(c.handler))] = c.queue
+    for p in files:
+        text = p.read_text(encoding="utf-8", errors="replace")
+        for offset, url, init in fetch_calls(text):
+            lineno = line_at(text, offset)
+            span = next(((a, b) for (hp, a, b) in handlers if hp == p and a <= offset < b), None)
+            queue = handlers[(p, *span)] if span else None
+            # A templated path (`${endpoint}`) resolves to the /api literals in the handler.
+            endpoints = re.findall(r"/api/[\w/\-\[\]]+", url) or (
+                sorted(set(re.findall(r"['\"`](/api/[\w/\-\[\]]+)", text[span[0]:span[1]]))) if span else [])
+            target = " | ".join(endpoints) if endpoints else " ".join(url.split())[:60]
+            if _LOOPBACK_URL_RX.search(url):
+                loopback.append((p, lineno, f"{target}" + (f"  [queue '{queue}']" if queue else "")))
+            if not re.search(r"\bsignal\s*:|AbortSignal\.timeout", init):
+                no_timeout.append((p, lineno, f"fetch({target}) has no signal/timeout"))
+    if loopback:
+        record("WARN",
+               f"Worker jobs call back into Next.js over HTTP -- {len(loopback)} loopback fetch(es)",
+               fmt_hits(loopback) +
+               "\nMove the cron logic into src/lib and call it directly from the worker.")
+    else:
+        record("PASS", "Worker jobs run in-process (no HTTP loopback to Next.js)")
+    if no_timeout:
+        record("WARN",
+               f"fetch() without timeout in worker code -- {len(no_timeout)} call(s)",
+               fmt_hits(no_timeout) +
+               "\nPass signal: AbortSignal.timeout(ms) shorter than the BullMQ lock duration (30s default).")
+    else:
+        record("PASS", "All worker fetch() calls set a timeout signal")
+
+
+REDIS_DEFAULT_MAXCLIENTS = 10000
+# Sockets opened per construction: a Worker holds a second, blocking
+# connection for BZPOPMIN unless it is handed a shared IORedis instance.
+REDIS_SOCKETS = {"Redis": 1, "Queue": 1, "QueueEvents": 1, "FlowProducer": 1, "Worker": 2}
+
+_REDIS_NEW_RX = re.compile(
+    r"(?:\b(?P<assign>[\w$.]+)\s*=\s*)?\bnew\s+(?P<cls>Redis|IORedis|Cluster|Queue|QueueEvents|Worker|FlowProducer)\s*(?:<[^>]*>)?\("
+)
+_FUNC_OPEN_RX = re.compile(r"\bfunction\b[^{;]*?\)\s*(?::[^{;=]+)?\{|=>\s*\{")
+
+
+class RedisConstruct(NamedTuple):
+    path:  Path
+    line:  int
+    cls:   str
+    scope: str   # module | singleton | per-call
+
+
+def redis_constructs() -> list[RedisConstruct]:
+    """Redis clients and BullMQ objects constructed in src/, with where they run.
+
+    module: top-level, once per process that imports the file.
+    singleton: inside a function but assigned to a module-level `let`.
+    per-call: a new connection each time the enclosing function runs.
+    """
+    found = []
+    for p in ts_files():
+        if "tests" in p.parts or "__tests__" in p.parts:
+            continue
+        text = p.read_text(encoding="utf-8", errors="replace")
+        if not re.search(r"\bnew\s+(?:Redis|IORedis|Cluster|Queue|QueueEvents|Worker|FlowProducer)\b", text):
+            continue
+        if not re.search(r"""from\s+['"](?:ioredis|bullmq|redis)['"]""", text):
+            continue
+        spans = [(m.end() - 1, match_close(text, m.end() - 1)) for m in _FUNC_OPEN_RX.finditer(text)]
+        module_lets = set(re.findall(r"^(?:let|var)\s+([\w$]+)", text, re.MULTILINE))
+        for m in _REDIS_NEW_RX.finditer(text):
+            cls = "Redis" if m.group("cls") in ("IORedis", "Cluster") else m.group("cls")
+            enclosing = [(a, b) for a, b in spans if a < m.start() < b]
+            # `if (started) return` on a module-level flag makes the function run once.
+            guard = enclosing and re.match(
+                r"\{\s*if\s*\(\s*!?\s*([\w$]+)\s*\)\s*return\b", text[enclosing[0][0]:enclosing[0][1]])
+            if not enclosing:
+                scope = "module"
+            elif m.group("assign") in module_lets or (guard and guard.group(1) in module_lets):
+                scope = "singleton"
+            else:
+                scope = "per-call"
+            found.append(RedisConstruct(p, line_at(text, m.start()), cls, scope))
+    return found
+
+
+def import_closure(entries: list[Path], res: ModuleResolver) -> set[Path]:
+    """Source files loaded by entries (static and dynamic imports, no node_modules)."""
+    seen: set[Path] = set()
+    stack = [p.resolve() for p in entries]
+    while stack:
+        p = stack.pop()
+        if p in seen or not p.exists():
+            continue
+        seen.add(p)
+        stack.extend(res.dependencies(p, kinds=("value", "dynamic")))
+    return seen
+
+
+def check_redis_connection_fanout() -> None:
+    """
+    Every Redis client, Queue and Worker opens its own socket(s) on the one
+    redis container. Counts constructions per module, separates the ones
+    created per call from process-wide ones, and sums the expected
+    connections for the nextjs and worker processes against maxclients.
+    """
+    constructs = redis_constructs()
+    if not constructs:
+        record("PASS", "No Redis clients or BullMQ objects constructed in src/")
+        return
+    compose = read("deploy/docker-compose.yml")
+    maxclients_m = re.search(r"--maxclients\s+(\d+)", compose)
+    maxclients = int(maxclients_m.group(1)) if maxclients_m else REDIS_DEFAULT_MAXCLIENTS
+
+    app = ROOT / "src" / "app"
+    next_entries = [p for p in ts_files() if app in p.parents]
+    next_entries += [ROOT / "src" / f"{name}.ts" for name in ("middleware", "proxy", "instrumentation")]
+    next_res, worker_res = ModuleResolver(), ModuleResolver("tsconfig.worker.json")
+    processes = {
+        "nextjs": import_closure(next_entries, next_res),
+        "worker": import_closure([ROOT / "src" / "worker-entrypoint.ts"], worker_res),
+    }
+    next_res.save()
+    worker_res.save()
+
+    lines: list[str] = []
+    per_call: list[tuple[Path, int, str]] = []
+    for c in constructs:
+        loaded_by = [name for name, files in processes.items() if c.path.resolve() in files]
+        lines.append(f"{c.path.relative_to(ROOT)}:{c.line}  new {c.cls}  {c.scope}"
+                     f"  ({', '.join(loaded_by) or 'not imported'})")
+        if c.scope == "per-call":
+            per_call.append((c.path, c.line, f"new {c.cls} inside a function -- one connection per call"))
+
+    totals = []
+    for name, files in processes.items():
+        n = sum(REDIS_SOCKETS[c.cls] for c in constructs if c.path.resolve() in files)
+        totals.append(f"{name} ~{n}")
+    total = sum(
+        REDIS_SOCKETS[c.cls] for c in constructs for files in processes.values() if c.path.resolve() in files
+    )
+
+    conn_file = ROOT / QUEUE_DIR / "connection.ts"
+    conn_text = conn_file.read_text(encoding="utf-8", errors="replace") if conn_file.exists() else ""
+    if re.search(r"\bnew\s+(?:Redis|IORedis)\b", conn_text):
+        lines.append(f"{QUEUE_DIR}/connection.ts shares one IORedis instance across Queues/Workers")
+    elif conn_text:
+        lines.append(f"{QUEUE_DIR}/connection.ts exports ConnectionOptions -- each Queue/Worker opens its own socket(s)")
+    summary = (f"Expected Redis connections: {', '.join(totals)} (total ~{total} of maxclients {maxclients}"
+               f"{'' if maxclients_m else ' default'})")
+
+    if per_call:
+        record("WARN", f"Redis connections opened per call -- {len(per_call)} site(s)",
+               fmt_hits(per_call) + "\nHoist the client/Queue to module scope or a lazy singleton.")
+    if total > maxclients * 0.8:
+        record("FAIL", summary, "\n".join(lines))
+    else:
+        record("PASS", summary, "\n".join(lines))
+
+
+# Ad-hoc jobs added per queue per day on top of repeatable jobs; override with --jobs-per-day.
+JOBS_PER_DAY_DEFAULT = 1000
+# Approximate Redis footprint of one retained BullMQ job hash (data, opts,
+# timestamps, returnvalue); failed jobs also keep stacktraces.
+JOB_BYTES = {"completed": 2048, "failed": 6144}
+# Share of jobs that end up failed (after retries); override with --job-failure-rate.
+JOB_FAILURE_RATE = 0.02
+# Horizon used to size retention that has no count/age bound.
+UNBOUNDED_RETENTION_DAYS = 30
+REDIS_MEMORY_WARN_RATIO = 0.7
+
+
+def cron_runs_per_day(pattern: str) -> float:
+    """Runs per day for a 5-field cron pattern (minute and hour fields only)."""
+    fields = pattern.split()
+    if len(fields) < 2:
+        return 0
+
+    def expand(field: str, span: int) -> int:
+        hits: set[int] = set()
+        for part in field.split(","):
+            rng, _, step = part.partition("/")
+            if rng == "*":
+                lo, hi = 0, span - 1
+            elif "-" in rng:
+                lo, hi = (int(x) for x in rng.split("-", 1))
+            else:
+                lo = hi = int(rng)
+                if step:
+                    hi = span - 1
+            hits.update(range(lo, hi + 1, int(step) if step else 1))
+        return len(hits)
+
+    try:
+        return expand(fields[0], 60) * expand(fields[1], 24)
+    except ValueError:
+        return 0
+
+
+def scheduled_jobs_per_day() -> dict[str, float]:
+    """{queue name: repeatable job runs per day} from src/lib/queue."""
+    qdir = ROOT / QUEUE_DIR
+    files = sorted(qdir.rglob("*.ts")) if qdir.exists() else []
+    texts = {p: p.read_text(encoding="utf-8", errors="replace") for p in files}
+    var_to_queue = {
+        m.group(1): m.group(2)
+        for text in texts.values()
+        for m in re.finditer(r"""(?:const|let)\s+(\w+)\s*=\s*new\s+Queue\(\s*['"`]([^'"`]+)""", text)
+    }
+    runs: dict[str, float] = {}
+    for text in texts.values():
+        for m in re.finditer(r"\b(\w+)\.add\(", text):
+            queue = var_to_queue.get(m.group(1))
+            args = text[m.end():match_close(text, m.end() - 1)]
+            pattern = re.search(r"""pattern\s*:\s*['"`]([^'"`]+)""", args)
+            every = re.search(r"\bevery\s*:\s*([\d_]+)", args)
+            if not queue or not (pattern or every):
+                continue
+            per_day = (cron_runs_per_day(pattern.group(1)) if pattern
+                       else 86_400_000 / int(every.group(1).replace("_", "")))
+            runs[queue] = runs.get(queue, 0) + per_day
+    return runs
+
+
+def retained_jobs(setting: str | None, per_day: float) -> float:
+    """Steady-state job hashes kept for a removeOnComplete/removeOnFail value.
+
+    `N` and `{ count: N }` mean the same thing; both are capped at what the
+    queue produces over UNBOUNDED_RETENTION_DAYS.
+    """
+    horizon = per_day * UNBOUNDED_RETENTION_DAYS
+    if setting is None or setting.strip() == "false":
+        return horizon
+    setting = setting.strip()
+    if setting == "true":
+        return 0
+    if re.fullmatch(r"\d+", setting):
+        return min(int(setting), horizon)
+    count = object_path(setting, "count")
+    age = object_path(setting, "age")
+    bounds = [horizon]
+    if count and count.isdigit():
+        bounds.append(int(count))
+    if age and age.isdigit():
+        bounds.append(per_day * int(age) / 86_400)
+    return min(bounds)
+
+
+def check_redis_memory_policy(jobs_per_day: int, failure_rate: float) -> None:
+    """
+    Redis holds BullMQ job hashes alongside TTL'd rate-limit keys. Under
+    `--maxmemory-policy noeviction` a full Redis rejects every write, so
+    queue.add() and job completion fail and all background processing stops.
+    Estimates the retained completed/failed jobs per queue from the
+    defaultJobOptions retention, repeatable jobs in the scheduler and
+    --jobs-per-day, split into completed and failed by --job-failure-rate,
+    and compares with --maxmemory.
+    """
+    services = compose_services()
+    redis_svc = next((svc for svc in services.values()
+                      if str(svc.config.get("image", "")).startswith("redis")), None)
+    if not redis_svc:
+        record("WARN", f"No redis service in {COMPOSE_FILE}")
+        return
+    cmd = " ".join(service_command(redis_svc))
+    maxmemory_m = re.search(r"--maxmemory\s+(\S+)", cmd)
+    policy_m = re.search(r"--maxmemory-policy\s+(\S+)", cmd)
+    maxmemory = parse_mem_mb(maxmemory_m.group(1)) if maxmemory_m else None
+    policy = policy_m.group(1) if policy_m else "noeviction"
+
+    scheduled = scheduled_jobs_per_day()
+    lines: list[str] = []
+    unbounded: list[str] = []
+    total_mb = 0.0
+    for q in (c for c in bull_constructs() if c.kind == "Queue"):
+        job = object_path(q.options, "defaultJobOptions") or ""
+        per_day = scheduled.get(q.queue, 0) + jobs_per_day
+        queue_mb = 0.0
+        parts = []
+        volumes = {"completed": per_day * (1 - failure_rate), "failed": per_day * failure_rate}
+        for state, key in (("completed", "removeOnComplete"), ("failed", "removeOnFail")):
+            setting = object_path(job, key) if job else None
+            kept = retained_jobs(setting, volumes[state])
+            if setting is None or setting.strip() == "false":
+                unbounded.append(f"{q.queue}.{key}")
+            queue_mb += kept * JOB_BYTES[state] / 1024 ** 2
+            parts.append(f"{state} ~{kept:,.0f}")
+        total_mb += queue_mb
+        lines.append(f"{q.queue:<10} {per_day:,.0f} jobs/day ({scheduled.get(q.queue, 0):g} scheduled)"
+                     f"  {'  '.join(parts)}  ~{queue_mb:.1f} MB")
+
+    head = (f"Redis {maxmemory_m.group(1) if maxmemory_m else 'no maxmemory'} {policy}: "
+            f"retained jobs ~{total_mb:.1f} MB at {jobs_per_day:,}/queue/day ad hoc, "
+            f"{failure_rate:.0%} failing")
+    hint = (f"\nSizing: {JOB_BYTES['completed']} B/completed, {JOB_BYTES['failed']} B/failed job; "
+            f"unbounded retention sized over {UNBOUNDED_RETENTION_DAYS} days.")
+    if policy != "noeviction":
+        record("FAIL", f"{head} -- BullMQ requires noeviction; eviction silently drops job keys",
+               "\n".join(lines) + hint)
+    elif maxmemory is None:
+        record("WARN", f"{head} -- no --maxmemory, Redis can grow until the host OOM-kills it",
+               "\n".join(lines) + hint)
+    elif unbounded or total_mb > maxmemory * REDIS_MEMORY_WARN_RATIO:
+        reasons = [f"unbounded retention: {', '.join(unbounded)}"] if unbounded else []
+        if total_mb > maxmemory * REDIS_MEMORY_WARN_RATIO:
+            reasons.append(f"over {REDIS_MEMORY_WARN_RATIO:.0%} of maxmemory -- writes will be rejected when full")
+        record("WARN", f"{head} -- {'; '.join(reasons)}", "\n".join(lines) + hint)
+    else:
+        record("PASS", f"{head} ({total_mb / maxmemory:.1%} of maxmemory)", "\n".join(lines) + hint)
+
+
+# -- Host Capacity ------------------------------------------------------------
+
+COMPOSE_FILE = "deploy/docker-compose.yml"
+# Production host per docs/ai-context.md (Hetzner CPX32); override with --host-memory/--host-cpus.
+HOST_MEMORY_DEFAULT = "32g"
+HOST_CPUS_DEFAULT = 8.0
+# Headroom left for the kernel, page cache and dockerd.
+HOST_MEMORY_HEADROOM = 0.8
+# Healthchecks more frequent than this add steady load for little signal.
+HEALTHCHECK_MIN_INTERVAL_S = 10
+# Typical steady-state RSS per image, used only for services without a memory limit.
+IMAGE_MEMORY_ESTIMATE_MB = {
+    "supabase/postgres": 1024, "kong": 256, "supabase/gotrue": 64, "postgrest/postgrest": 64,
+    "supabase/realtime": 256, "supabase/storage-api": 128, "darthsim/imgproxy": 256,
+    "supabase/studio": 256, "supabase/postgres-meta": 96, "redis": 256, "caddy": 64,
+    "prom/prometheus": 512, "grafana/loki": 256, "grafana/promtail": 64,
+    "oliver006/redis_exporter": 16, "prometheuscommunity/postgres-exporter": 32,
+    "prom/node-exporter": 32, "grafana/grafana": 128,
+    "ghcr.io/christofboermel/lebensordner/nextjs": 512,
+    "ghcr.io/christofboermel/lebensordner/worker": 256,
+}
+
+
+class ComposeService(NamedTuple):
+    name:   str
+    line:   int
+    config: dict
+
+
+def compose_services() -> dict[str, ComposeService]:
+    """Services in deploy/docker-compose.yml, parsed by indentation (block mappings,
+    block/flow lists and scalars -- the subset compose files use; no PyYAML in CI)."""
+    text = read(COMPOSE_FILE)
+    services = load_yaml(ROOT / COMPOSE_FILE).get("services")
+    if not isinstance(services, dict):
+        return {}
+    starts = {m.group(1): line_at(text, m.start()) for m in re.finditer(r"^  ([\w.-]+):", text, re.MULTILINE)}
+    return {
+        name: ComposeService(name, starts.get(name, 0), cfg if isinstance(cfg, dict) else {})
+        for name, cfg in services.items()
+    }
+
+
+def compose_get(cfg: dict, path: str) -> object:
+    node: object = cfg
+    for key in path.split("."):
+        node = node.get(key) if isinstance(node, dict) else None
+    return node
+
+
+def parse_mem_mb(value: str | None) -> float | None:
+    """'512m' / '1.5g' / '256mb' / '1073741824' -> megabytes."""
+    if not value:
+        return None
+    m = re.fullmatch(r"\s*([\d.]+)\s*([kmgt]?)i?b?\s*", str(value), re.IGNORECASE)
+    if not m:
+        return None
+    scale = {"": 1 / 1024 ** 2, "k": 1 / 1024, "m": 1, "g": 1024, "t": 1024 ** 2}[m.group(2).lower()]
+    return float(m.group(1)) * scale
+
+
+def parse_duration_s(value: str | None) -> float | None:
+    """Compose durations ('1m30s', '5s', '250ms') -> seconds."""
+    if not value:
+        return None
+    parts = re.findall(r"([\d.]+)(ms|us|h|m|s)", str(value))
+    units = {"h": 3600, "m": 60, "s": 1, "ms": 0.001, "us": 0.000001}
+    return sum(float(n) * units[u] for n, u in parts) if parts else None
+
+
+def service_command(svc: ComposeService) -> list[str]:
+    cmd = svc.config.get("command")
+    if isinstance(cmd, list):
+        return [str(c) for c in cmd]
+    if isinstance(cmd, str) and cmd.startswith("["):
+        return [yaml_scalar(c) for c in split_args(cmd.strip()[1:-1])]
+    return cmd.split() if isinstance(cmd, str) else []
+
+
+def service_limits(svc: ComposeService) -> tuple[float | None, float | None, float | None]:
+    """(memory limit MB, memory reservation MB, cpu limit) from deploy.resources or the v2 keys."""
+    cfg = svc.config
+    mem = parse_mem_mb(compose_get(cfg, "deploy.resources.limits.memory") or cfg.get("mem_limit"))
+    res = parse_mem_mb(compose_get(cfg, "deploy.resources.reservations.memory") or cfg.get("mem_reservation"))
+    cpus_raw = compose_get(cfg, "deploy.resources.limits.cpus") or cfg.get("cpus")
+    try:
+        cpus = float(cpus_raw) if cpus_raw else None
+    except ValueError:
+        cpus = None
+    return mem, res, cpus
+
+
+def image_estimate_mb(svc: ComposeService) -> float:
+    image = str(svc.config.get("image", "")).split("@")[0].rsplit(":", 1)[0]
+    return IMAGE_MEMORY_ESTIMATE_MB.get(image, 128)
+
+
+def check_compose_resource_budget(host_memory: str, host_cpus: float) -> None:
+    """
+    Every service shares one host. Without mem_limit/deploy.resources a single
+    leaking container (Node heap, Prometheus TSDB, Postgres work_mem spikes)
+    can push the kernel into OOM-killing Postgres. Sums declared limits, or a
+    typical footprint for the image where none is set, against the host.
+    """
+    services = compose_services()
+    if not services:
+        record("WARN", f"{COMPOSE_FILE} not found or has no services")
+        return
+    host_mb = parse_mem_mb(host_memory) or 0
+    rows: list[str] = []
+    unlimited: list[str] = []
+    declared_mb = planned_mb = cpu_total = 0.0
+    for svc in services.values():
+        mem, reservation, cpus = service_limits(svc)
+        planned = mem if mem is not None else image_estimate_mb(svc)
+        planned_mb += planned
+        declared_mb += mem or 0
+        cpu_total += cpus or 0
+        if mem is None:
+            unlimited.append(svc.name)
+        cmd = service_command(svc)
+        flags = cmd[1:] if cmd and not cmd[0].startswith("-") else cmd
+        interval = compose_get(svc.config, "healthcheck.interval")
+        rows.append(
+            f"{svc.name:<18} mem {f'{mem:.0f}M' if mem else f'~{planned:.0f}M est'}"
+            f"{f' (res {reservation:.0f}M)' if reservation else ''}"
+            f"  cpus {cpus if cpus else '-'}"
+            f"  health {interval or '-'}"
+            + (f"  flags {' '.join(flags)[:70]}" if flags else "")
+        )
+    budget = host_mb * HOST_MEMORY_HEADROOM
+    summary = (f"{len(services)} services: ~{planned_mb / 1024:.1f} GB planned "
+               f"({declared_mb / 1024:.1f} GB declared limits) of {host_mb / 1024:.0f} GB host, "
+               f"cpus {cpu_total:g}/{host_cpus:g}")
+    detail = "\n".join(rows)
+    if declared_mb > host_mb:
+        record("FAIL", f"Memory limits exceed host -- {summary}", detail)
+    elif unlimited or planned_mb > budget:
+        reasons = []
+        if unlimited:
+            reasons.append(f"{len(unlimited)} service(s) without a memory limit")
+        if planned_mb > budget:
+            reasons.append(f"over {HOST_MEMORY_HEADROOM:.0%} of host memory")
+        record("WARN", f"Compose resource budget: {'; '.join(reasons)} -- {summary}",
+               detail + "\nSet deploy.resources.limits.memory (and cpus) per service; "
+                        f"unlimited: {', '.join(unlimited)}")
+    else:
+        record("PASS", f"Compose resource budget -- {summary}", detail)
+
+
+def check_compose_healthcheck_load() -> None:
+    """Healthchecks run a process in the container on every interval, forever."""
+    services = compose_services()
+    fast: list[tuple[Path, int, str]] = []
+    probes_per_min = 0.0
+    for svc in services.values():
+        interval = parse_duration_s(compose_get(svc.config, "healthcheck.interval"))
+        if compose_get(svc.config, "healthcheck.test") is None:
+            continue
+        interval = interval or 30   # Docker default
+        probes_per_min += 60 / interval
+        if interval < HEALTHCHECK_MIN_INTERVAL_S:
+            fast.append((ROOT / COMPOSE_FILE, svc.line,
+                         f"{svc.name}: interval {interval:g}s ({60 / interval:.0f} probes/min)"))
+    if fast:
+        record("WARN",
+               f"Healthchecks under {HEALTHCHECK_MIN_INTERVAL_S}s -- {len(fast)} service(s), "
+               f"{probes_per_min:.0f} probes/min total",
+               fmt_hits(fast) + "\nUse interval 30s with start_period/start_interval for fast boot detection.")
+    else:
+        record("PASS", f"Healthcheck intervals >= {HEALTHCHECK_MIN_INTERVAL_S}s "
+                       f"({probes_per_min:.0f} probes/min total)")
+
+
+# Effective values when neither `-c` flags nor a mounted config override them
+# (PostgreSQL defaults, which the supabase/postgres image keeps for these keys).
+POSTGRES_DEFAULTS = {
+    "max_connections": "100", "shared_buffers": "128MB", "effective_cache_size": "4GB",
+    "work_mem": "4MB", "maintenance_work_mem": "64MB", "random_page_cost": "4",
+    "autovacuum_max_workers": "3", "superuser_reserved_connections": "3",
+}
+# (image prefix, pool-size env var, pool size when unset) for services holding Postgres connections.
+POSTGRES_CLIENT_POOLS = [
+    ("postgrest/postgrest", "PGRST_DB_POOL", 10),
+    ("supabase/gotrue", "GOTRUE_DB_MAX_POOL_SIZE", 10),
+    ("supabase/realtime", "DB_POOL_SIZE", 5),
+    ("supabase/storage-api", "DATABASE_MAX_CONNECTIONS", 20),
+    ("supabase/postgres-meta", None, 5),
+    ("prometheuscommunity/postgres-exporter", None, 1),
+]
+# Realtime also holds replication/tenant connections outside DB_POOL_SIZE; backups and psql sessions need spares.
+POSTGRES_EXTRA_CONNECTIONS = 10
+# Sort/hash nodes that may each take work_mem in one busy query.
+WORK_MEM_PER_CONNECTION = 2
+
+
+def pg_setting_mb(key: str, value: str) -> float | None:
+    """Postgres memory setting -> MB; bare numbers use the GUC's unit (8kB pages or kB)."""
+    value = value.strip().strip("'\"")
+    if re.fullmatch(r"\d+", value):
+        unit_kb = 8 if key in ("shared_buffers", "effective_cache_size") else 1
+        return int(value) * unit_kb / 1024
+    return parse_mem_mb(value)
+
+
+def postgres_settings(svc: ComposeService) -> tuple[dict[str, str], dict[str, str]]:
+    """({key: value}, {key: where it was set}) from mounted *.conf files, then `-c` flags."""
+    settings: dict[str, str] = {}
+    origin: dict[str, str] = {}
+    for volume in svc.config.get("volumes") or []:
+        src, _, dst = str(volume).partition(":")
+        dst = dst.split(":")[0]
+        if not (dst.endswith(".conf") or dst.startswith("/etc/postgresql")):
+            continue
+        path = (ROOT / COMPOSE_FILE).parent / src
+        confs = sorted(path.glob("*.conf")) if path.is_dir() else [path] if path.is_file() else []
+        for conf in confs:
+            for line in conf.read_text(encoding="utf-8", errors="replace").splitlines():
+                m = re.match(r"\s*(\w+)\s*=?\s*('[^']*'|[^#\s]+)", line)
+                if m:
+                    settings[m.group(1).lower()] = m.group(2).strip("'")
+                    origin[m.group(1).lower()] = conf.name
+    cmd = service_command(svc)
+    for i, token in enumerate(cmd):
+        flag = cmd[i + 1] if token == "-c" and i + 1 < len(cmd) else token[2:] if token.startswith("-c") else ""
+        if "=" in flag:
+            key, _, value = flag.partition("=")
+            settings[key.strip().lower()] = value.strip()
+            origin[key.strip().lower()] = "command -c"
+    return settings, origin
+
+
+def service_env(svc: ComposeService) -> dict[str, str]:
+    env = svc.config.get("environment") or {}
+    if isinstance(env, list):
+        env = dict(str(item).partition("=")[::2] for item in env)
+    return {str(k): str(v) for k, v in env.items()}
+
+
+def check_postgres_tuning(host_memory: str) -> None:
+    """
+    Compares the db container's memory and connection settings with its memory
+    limit (or its share of the host when unlimited) and the pools of the
+    services that connect to it. shared_buffers plus work_mem for every
+    connection must fit, or a burst of sorts gets Postgres OOM-killed.
+    """
+    services = compose_services()
+    db = next((svc for svc in services.values()
+               if str(svc.config.get("image", "")).startswith("supabase/postgres:")), None)
+    if not db:
+        record("WARN", f"No supabase/postgres service in {COMPOSE_FILE}")
+        return
+    settings, origin = postgres_settings(db)
+    value = {key: settings.get(key, default) for key, default in POSTGRES_DEFAULTS.items()}
+
+    mem_limit = service_limits(db)[0]
+    host_mb = parse_mem_mb(host_memory) or 0
+    others_mb = sum(image_estimate_mb(svc) if service_limits(svc)[0] is None else service_limits(svc)[0]
+                    for svc in services.values() if svc is not db)
+    pg_mb = mem_limit or max(host_mb * HOST_MEMORY_HEADROOM - others_mb, 1024)
+    basis = f"limit {pg_mb:.0f}M" if mem_limit else f"no limit, ~{pg_mb / 1024:.1f} GB host share"
+
+    demand_rows: list[str] = []
+    demand = POSTGRES_EXTRA_CONNECTIONS
+    for svc in services.values():
+        image = str(svc.config.get("image", ""))
+        for prefix, env_key, default in POSTGRES_CLIENT_POOLS:
+            if image.startswith(prefix):
+                raw = service_env(svc).get(env_key or "", "")
+                pool = int(raw) if raw.isdigit() else default
+                demand += pool
+                demand_rows.append(f"{svc.name:<18} {pool:>3}"
+                                   + (f"  ({env_key}{'' if raw.isdigit() else ' unset, default'})"
+                                      if env_key else "  (fixed)"))
+
+    max_conn = int(value["max_connections"])
+    usable_conn = max_conn - int(value["superuser_reserved_connections"])
+    shared = pg_setting_mb("shared_buffers", value["shared_buffers"]) or 0
+    work = pg_setting_mb("work_mem", value["work_mem"]) or 0
+    maint = pg_setting_mb("maintenance_work_mem", value["maintenance_work_mem"]) or 0
+    cache = pg_setting_mb("effective_cache_size", value["effective_cache_size"]) or 0
+    worst_mb = shared + max_conn * work * WORK_MEM_PER_CONNECTION + maint * int(value["autovacuum_max_workers"])
+
+    rec_conn = max(100, -(-demand * 3 // 2 // 10) * 10)
+    rec_shared = pg_mb * 0.25
+    rec_work = min(64.0, max(4.0, (pg_mb - rec_shared) / (rec_conn * WORK_MEM_PER_CONNECTION * 2)))
+    recommended = {
+        "max_connections": str(rec_conn),
+        "shared_buffers": f"{rec_shared:.0f}MB",
+        "effective_cache_size": f"{pg_mb * 0.75:.0f}MB",
+        "work_mem": f"{rec_work:.0f}MB",
+        "maintenance_work_mem": f"{min(1024.0, max(64.0, pg_mb * 0.05)):.0f}MB",
+        "random_page_cost": "1.1",   # NVMe-backed volume
+    }
+    rows = [f"{key:<22} {value[key]:<8} ({origin.get(key, 'default')})  recommended {recommended[key]}"
+            for key in recommended]
+    detail = "\n".join(rows + ["Connection demand:"] + demand_rows
+                       + [f"{'spare/tenants':<18} {POSTGRES_EXTRA_CONNECTIONS:>3}",
+                          f"Worst case: shared_buffers + max_connections x {WORK_MEM_PER_CONNECTION} x work_mem"
+                          f" + autovacuum x maintenance_work_mem = {worst_mb:.0f}M vs {basis}",
+                          "Set via `command: postgres -c key=value ...` on the db service."])
+    head = f"Postgres tuning ({basis}): {demand} connections demanded of {usable_conn} usable"
+    untuned = [key for key in recommended if key not in settings and value[key] != recommended[key]]
+
+    if worst_mb > pg_mb:
+        record("FAIL", f"{head} -- worst-case memory {worst_mb:.0f}M over-commits {pg_mb:.0f}M", detail)
+    elif demand > usable_conn:
+        record("FAIL", f"{head} -- pools exceed max_connections", detail)
+    elif untuned:
+        record("WARN", f"{head} -- {len(untuned)} setting(s) at image defaults: {', '.join(untuned)}", detail)
+    else:
+        record("PASS", head, detail)
+
+
+# -- Edge (Caddy) -------------------------------------------------------------
+
+CADDYFILE = "deploy/Caddyfile"
+# Content-hashed build output: safe to cache forever.
+HASHED_STATIC_PATHS = ["/_next/static/*"]
+# Route segment marking endpoints that send large or incremental bodies through the proxy.
+STREAM_ROUTE_SEGMENT = "stream"
+ENCODING_PREFERENCE = ["zstd", "gzip"]
+
+_CADDY_TOKEN_RX = re.compile(r'"(?:\\.|[^"\\])*"|`[^`]*`|\S+')
+
+
+class CaddyDirective(NamedTuple):
+    name: str
+    args: list[str]
+    line: int
+    body: list["CaddyDirective"]
+
+
+class CaddySite(NamedTuple):
+    addresses: list[str]
+    line: int
+    body: list[CaddyDirective]
+
+
+def _caddy_tokens(line: str) -> list[str]:
+    tokens = []
+    for tok in _CADDY_TOKEN_RX.findall(line):
+        if tok.startswith("#"):
+            break
+        tokens.append(tok[1:-1] if tok[0] in "\"`" and len(tok) > 1 else tok)
+    return tokens
+
+
+def parse_caddyfile(text: str) -> tuple[list[CaddyDirective], list[CaddySite]]:
+    """(global options, site blocks). Only a bare `{`/`}` token opens or closes a block."""
+    root: list[CaddyDirective] = []
+    stack = [root]
+    for lineno, line in enumerate(text.splitlines(), 1):
+        tokens = _caddy_tokens(line)
+        if not tokens:
+            continue
+        if tokens == ["}"]:
+            if len(stack) > 1:
+                stack.pop()
+            continue
+        opens = tokens[-1] == "{"
+        if opens:
+            tokens = tokens[:-1]
+        node = CaddyDirective(tokens[0] if tokens else "", tokens[1:], lineno, [])
+        stack[-1].append(node)
+        if opens:
+            stack.append(node.body)
+    global_opts: list[CaddyDirective] = []
+    sites: list[CaddySite] = []
+    for node in root:
+        if not node.name and not global_opts and not sites:
+            global_opts = node.body
+        elif node.name:
+            addresses = [a.rstrip(",") for a in [node.name, *node.args] if a.rstrip(",")]
+            sites.append(CaddySite(addresses, node.line, node.body))
+    return global_opts, sites
+
+
+def caddy_walk(body: list[CaddyDirective], parents: tuple[CaddyDirective, ...] = ()):
+    """Yield (directive, enclosing directives) depth-first."""
+    for d in body:
+        yield d, parents
+        yield from caddy_walk(d.body, parents + (d,))
+
+
+def caddy_matchers(site: CaddySite) -> dict[str, list[str]]:
+    """{@name: path patterns} for named matchers; non-path matchers map to []."""
+    matchers: dict[str, list[str]] = {}
+    for d, _ in caddy_walk(site.body):
+        if not d.name.startswith("@"):
+            continue
+        paths = d.args[1:] if d.args[:1] == ["path"] else []
+        for sub in d.body:
+            if sub.name == "path":
+                paths += sub.args
+        matchers[d.name] = paths
+    return matchers
+
+
+def caddy_scope(d: CaddyDirective, matchers: dict[str, list[str]]) -> list[str] | None:
+    """Path patterns a directive is limited to, or None when it applies to every path."""
+    first = d.args[0] if d.args else ""
+    if first.startswith("/") or first == "*":
+        return [first]
+    if first.startswith("@"):
+        return matchers.get(first, [])
+    return None
+
+
+def caddy_applies(d: CaddyDirective, parents: tuple[CaddyDirective, ...],
+                  matchers: dict[str, list[str]], path: str) -> bool:
+    """True when the directive (and every enclosing handle/route) matches path."""
+    for node in (*parents, d):
+        scope = caddy_scope(node, matchers)
+        if scope is not None and not any(fnmatch.fnmatchcase(path, pat) for pat in scope):
+            return False
+    return True
+
+
+def caddy_upstreams(site: CaddySite) -> set[str]:
+    return {
+        arg.split(":")[0] for d, _ in caddy_walk(site.body) if d.name == "reverse_proxy"
+        for arg in d.args if not arg.startswith(("/", "@", "*"))
+    }
+
+
+def caddy_sites() -> tuple[list[CaddyDirective], list[CaddySite]]:
+    return parse_caddyfile(read(CADDYFILE))
+
+
+def _sample_path(pattern: str) -> str:
+    return pattern.replace("*", "x")
+
+
+def stream_routes() -> dict[str, bool]:
+    """{Caddy path pattern: sends a known Content-Length} for app routes with a `stream` segment.
+
+    A route answering with a ReadableStream or text/event-stream body (and no
+    explicit Content-Length) goes out chunked; buffered bodies such as an
+    ArrayBuffer get a Content-Length from Next.js.
+    """
+    app = ROOT / "src/app"
+    patterns: dict[str, bool] = {}
+    for route in sorted(app.rglob("route.ts")) if app.exists() else []:
+        parts = route.relative_to(app).parent.parts
+        if STREAM_ROUTE_SEGMENT not in parts:
+            continue
+        segments = ["*" if p.startswith("[") else p for p in parts if not p.startswith("(")]
+        raw = route.read_text(encoding="utf-8", errors="replace")
+        chunked = ("text/event-stream" in raw or "ReadableStream" in mask_code(raw)) and not re.search(
+            r"content-length", raw, re.IGNORECASE)
+        patterns["/" + "/".join(segments)] = not chunked
+    return patterns
+
+
+def check_caddy_static_caching() -> None:
+    """
+    Hashed /_next/static files never change, so the edge should pin
+    `Cache-Control: public, max-age=31536000, immutable` instead of relying on
+    the upstream. Unhashed public/ assets need a bounded max-age.
+    """
+    _, sites = caddy_sites()
+    if not sites:
+        record("WARN", f"{CADDYFILE} not found or has no site blocks")
+        return
+    public = ROOT / "public"
+    public_paths = sorted(
+        f"/{p.name}/*" if p.is_dir() else f"/{p.name}" for p in public.iterdir()
+    ) if public.exists() else []
+    missing: list[tuple[Path, int, str]] = []
+    app_sites = 0
+    for site in sites:
+        if "nextjs" not in caddy_upstreams(site):
+            continue
+        app_sites += 1
+        matchers = caddy_matchers(site)
+        headers = [
+            (d, parents) for d, parents in caddy_walk(site.body) if d.name == "header"
+            and "cache-control" in " ".join(d.args + [t for b in d.body for t in [b.name, *b.args]]).lower()
+        ]
+
+        def cached(path: str, immutable: bool) -> bool:
+            for d, parents in headers:
+                value = " ".join(d.args + [t for b in d.body for t in [b.name, *b.args]]).lower()
+                if caddy_applies(d, parents, matchers, path) and "max-age" in value \
+                        and (not immutable or "immutable" in value):
+                    return True
+            return False
+
+        label = ", ".join(site.addresses)
+        for pattern in HASHED_STATIC_PATHS:
+            if not cached(_sample_path(pattern), immutable=True):
+                missing.append((ROOT / CADDYFILE, site.line, f"{label}: no immutable Cache-Control for {pattern}"))
+        for pattern in public_paths:
+            if not cached(_sample_path(pattern), immutable=False):
+                missing.append((ROOT / CADDYFILE, site.line, f"{label}: no max-age Cache-Control for public {pattern}"))
+    if missing:
+        record("WARN", f"Static asset caching -- {len(missing)} missing header(s) across {app_sites} app site(s)",
+               fmt_hits(missing) + "\nE.g. `header /_next/static/* Cache-Control \"public, max-age=31536000, immutable\"`"
+               + (f"\nand `header {public_paths[0]} Cache-Control \"public, max-age=86400\"`"
+                  " (public/ files are not hashed)." if public_paths else ""))
+    else:
+        record("PASS", f"Static asset caching pinned on {app_sites} app site(s)")
+
+
+def check_caddy_encoding() -> None:
+    """`encode` breaks Accept-Encoding ties by directive order; zstd should win over gzip."""
+    _, sites = caddy_sites()
+    problems: list[tuple[Path, int, str]] = []
+    for site in sites:
+        label = ", ".join(site.addresses)
+        encodes = [d for d, _ in caddy_walk(site.body) if d.name == "encode"]
+        if not encodes:
+            problems.append((ROOT / CADDYFILE, site.line, f"{label}: no encode directive"))
+            continue
+        for d in encodes:
+            formats = [a for a in d.args if a in ENCODING_PREFERENCE] + \
+                      [b.name for b in d.body if b.name in ENCODING_PREFERENCE]
+            expected = [f for f in ENCODING_PREFERENCE if f in formats]
+            if formats != expected or len(formats) < len(ENCODING_PREFERENCE):
+                problems.append((ROOT / CADDYFILE, d.line,
+                                 f"{label}: encode {' '.join(formats) or '(none)'} "
+                                 f"-> encode {' '.join(ENCODING_PREFERENCE)}"))
+    if problems:
+        record("WARN", f"Response compression -- {len(problems)} site block(s) to adjust", fmt_hits(problems))
+    else:
+        record("PASS", f"Response compression prefers {' over '.join(ENCODING_PREFERENCE)} on all {len(sites)} site(s)")
+
+
+def check_caddy_stream_proxying() -> None:
+    """
+    Document view/stream routes send whole files through Caddy. Caddy
+    flushes chunked and SSE responses immediately, but a response with a
+    known Content-Length may be buffered before the first byte reaches the
+    client unless the proxy sets `flush_interval -1`. `keepalive off` on the
+    upstream transport would reopen a connection to Next.js per request.
+    """
+    _, sites = caddy_sites()
+    all_routes = stream_routes()
+    routes = [route for route, known_length in all_routes.items() if known_length]
+    problems: list[tuple[Path, int, str]] = []
+    for site in sites:
+        if "nextjs" not in caddy_upstreams(site):
+            continue
+        label = ", ".join(site.addresses)
+        matchers = caddy_matchers(site)
+        proxies = [(d, parents) for d, parents in caddy_walk(site.body)
+                   if d.name == "reverse_proxy" and any(a.startswith("nextjs") for a in d.args)]
+        for d, _ in proxies:
+            for sub, _ in caddy_walk(d.body):
+                if sub.name == "keepalive" and sub.args[:1] == ["off"]:
+                    problems.append((ROOT / CADDYFILE, sub.line, f"{label}: upstream keepalive off"))
+        for route in routes:
+            path = _sample_path(route)
+            serving = [(d, parents) for d, parents in proxies if caddy_applies(d, parents, matchers, path)]
+            if not any(sub.name == "flush_interval" for d, _ in serving for sub in d.body):
+                problems.append((ROOT / CADDYFILE, (serving[0][0] if serving else site).line,
+                                 f"{label}: {route} proxied without flush_interval"))
+    if problems:
+        record("WARN", f"Stream route proxying -- {len(problems)} issue(s) for {len(routes)} stream route(s) "
+                       f"with Content-Length",
+               fmt_hits(problems)
+               + "\nAdd `@stream path " + " ".join(routes) + "` and"
+               "\n`reverse_proxy @stream nextjs:3000 { flush_interval -1 }` before the catch-all proxy."
+               "\nOnly routes that send a known Content-Length are listed; chunked and SSE"
+               "\nresponses are flushed immediately without the directive."
+               "\nCaddy keeps upstream connections alive by default (2m idle); only `keepalive off` is flagged.")
+    else:
+        record("PASS", f"Stream routes flushed immediately ({len(routes)} with Content-Length, "
+                       f"{len(all_routes) - len(routes)} chunked/SSE)")
+
+
+def check_caddy_http3() -> None:
+    """Caddy serves HTTP/3 by default, but only if UDP 443 reaches the container."""
+    global_opts, sites = caddy_sites()
+    if not sites:
+        return
+    protocols = [
+        (sub.line, sub.args) for d, _ in caddy_walk(global_opts) if d.name == "servers"
+        for sub in d.body if sub.name == "protocols"
+    ]
+    services = compose_services()
+    caddy = next((svc for svc in services.values()
+                  if str(svc.config.get("image", "")).startswith("caddy")), None)
+    ports = [str(p) for p in (caddy.config.get("ports") or [])] if caddy else []
+    udp = any(p.endswith("443/udp") for p in ports)
+    disabled = [(ROOT / CADDYFILE, line, f"protocols {' '.join(args)}")
+                for line, args in protocols if "h3" not in args]
+    if disabled:
+        record("WARN", "HTTP/3 disabled in Caddy global options", fmt_hits(disabled))
+    elif not udp:
+        record("WARN", f"HTTP/3: {COMPOSE_FILE} does not publish 443/udp for caddy",
+               f"ports: {', '.join(ports) or '(none)'} -- add \"443:443/udp\"")
+    else:
+        record("PASS", f"HTTP/3 available on {len(sites)} site(s) "
+                       f"({'protocols set' if protocols else 'Caddy default'}, 443/udp published)")
+
+
+# -- Next.js Build Config -----------------------------------------------------
+
+NEXT_CONFIG = "next.config.js"
+# Barrel-export packages that optimizePackageImports rewrites to per-module imports.
+BARREL_PACKAGES = [
+    "lucide-react", "date-fns", "lodash", "lodash-es", "ramda", "recharts", "react-icons",
+    "@radix-ui/react-icons", "@heroicons/react", "@tabler/icons-react", "rxjs", "@mui/material",
+    "@mui/icons-material",
+]
+# Packages Next.js already optimizes without configuration (next/dist/server/config.ts).
+NEXT_DEFAULT_OPTIMIZED = {
+    "lucide-react", "date-fns", "lodash-es", "ramda", "recharts", "react-icons", "@heroicons/react",
+    "@tabler/icons-react", "rxjs", "@mui/material", "@mui/icons-material",
+}
+RECOMMENDED_IMAGE_FORMATS = ["image/avif", "image/webp"]
+
+_NEXT_CONFIG_RX = re.compile(
+    r"(?:const\s+\w+\s*(?::[^=]+)?=|module\.exports\s*=|export\s+default)\s*(?=\{)")
+
+
+def next_config() -> str:
+    """The config object literal from next.config.js, or '' when not statically parseable."""
+    text = read(NEXT_CONFIG)
+    m = _NEXT_CONFIG_RX.search(text)
+    return text[m.end():match_close(text, m.end()) + 1] if m else ""
+
+
+def js_string_list(raw: str | None) -> list[str]:
+    if not raw or not raw.strip().startswith("["):
+        return []
+    return [yaml_scalar(v) for v in split_args(raw.strip()[1:match_close(raw.strip(), 0)])]
+
+
+def package_import_files(packages: list[str]) -> dict[str, int]:
+    """{package: files under src/ importing it}."""
+    counts = {pkg: 0 for pkg in packages}
+    for path in (ROOT / "src").rglob("*.ts*"):
+        text = path.read_text(encoding="utf-8", errors="replace")
+        for pkg in packages:
+            if re.search(rf"""from\s+['"]{re.escape(pkg)}(?:/[^'"]*)?['"]""", text):
+                counts[pkg] += 1
+    return {pkg: n for pkg, n in counts.items() if n}
+
+
+def check_next_config_profile() -> None:
+    """
+    next.config.js settings that apply to every response or to the image:
+    standalone output (the Dockerfile copies .next/standalone), Node-side
+    compression (Caddy already encodes), browser source maps, the
+    X-Powered-By header, image formats and barrel-import optimization.
+    """
+    cfg = next_config()
+    if not cfg:
+        record("WARN", f"{NEXT_CONFIG} not found or config object not statically parseable")
+        return
+    def value(path: str) -> str | None:
+        return yaml_scalar(object_path(cfg, path) or "") or None
+
+    fails: list[str] = []
+    warns: list[str] = []
+    rows: list[str] = []
+
+    def row(key: str, current: str | None, recommended: str, ok: bool, problems: list[str]) -> None:
+        rows.append(f"{key:<40} {current or '(default)':<22} recommended {recommended}")
+        if not ok:
+            problems.append(key)
+
+    output = value("output")
+    standalone_image = ".next/standalone" in read("Dockerfile")
+    row("output", output, "standalone", output == "standalone",
+        fails if standalone_image else warns)
+
+    caddy_encodes = any(
+        "nextjs" in caddy_upstreams(site) and any(d.name == "encode" for d, _ in caddy_walk(site.body))
+        for site in caddy_sites()[1]
+    )
+    compress = value("compress")
+    row("compress", compress, "false (Caddy encodes)" if caddy_encodes else "true",
+        compress == "false" if caddy_encodes else compress != "false", warns)
+
+    source_maps = value("productionBrowserSourceMaps")
+    row("productionBrowserSourceMaps", source_maps, "false", source_maps != "true", fails)
+
+    powered = value("poweredByHeader")
+    caddy_strips = "-x-powered-by" in read(CADDYFILE).lower()
+    row("poweredByHeader", powered, "false", powered == "false" or caddy_strips, warns)
+
+    image_users = len([p for p in (ROOT / "src").rglob("*.tsx")
+                       if "next/image" in p.read_text(encoding="utf-8", errors="replace")])
+    formats = js_string_list(object_path(cfg, "images.formats"))
+    patterns = object_path(cfg, "images.remotePatterns")
+    hosts = re.findall(r"""hostname\s*:\s*['"]([^'"]+)""", patterns or "")
+    if image_users:
+        row("images.formats", ", ".join(formats) or None, ", ".join(RECOMMENDED_IMAGE_FORMATS),
+            formats[:1] == RECOMMENDED_IMAGE_FORMATS[:1], warns)
+    else:
+        rows.append(f"{'images.formats / remotePatterns':<40} {', '.join(hosts) or '-':<22} "
+                    "next/image is not imported; optimizer unused")
+
+    used = package_import_files(BARREL_PACKAGES)
+    optimized = set(js_string_list(object_path(cfg, "experimental.optimizePackageImports")))
+    missing = [pkg for pkg in used if pkg not in optimized | NEXT_DEFAULT_OPTIMIZED]
+    row("experimental.optimizePackageImports", ", ".join(sorted(optimized)) or None,
+        ", ".join(missing) or "none beyond Next defaults", not missing, warns)
+    rows += [f"  {pkg}: {n} file(s){' (Next default)' if pkg in NEXT_DEFAULT_OPTIMIZED else ''}"
+             for pkg, n in used.items()]
+
+    if fails:
+        record("FAIL", f"{NEXT_CONFIG}: {', '.join(fails)} off the production profile", "\n".join(rows))
+    elif warns:
+        record("WARN", f"{NEXT_CONFIG}: {', '.join(warns)} differ from the production profile", "\n".join(rows))
+    else:
+        record("PASS", f"{NEXT_CONFIG} matches the production profile", "\n".join(rows))
+
+
+# -- Observability ------------------------------------------------------------
+
+PROMETHEUS_CONFIG = "deploy/prometheus/prometheus.yml"
+METRICS_ROUTE = "src/app/api/metrics/route.ts"
+# Series per metric above which a family needs a second look; unbounded labels always warn.
+METRIC_SERIES_WARN = 200
+_UNBOUNDED_LABEL_RX = re.compile(
+    r"(?i)(?:^|[._])(?:\w*id|user\w*|email|token\w*|path\w*|url|route|message|error|err|ip|key)$")
+
+# `name{label="${expr}",...} value` lines of the text exposition format inside template literals.
+_EXPOSITION_RX = re.compile(
+    r"(?P<name>(?:[a-zA-Z_:]|\$\{\w+\})(?:[\w:]|\$\{\w+\})*)"
+    r"\{(?P<labels>(?:\s*\w+=\"[^\"\n]*\"\s*,?)+)\}\s+\$\{")
+_LABEL_PAIR_RX = re.compile(r'(\w+)="([^"\n]*)"')
+_CONST_ARRAY_RX = re.compile(r"\bconst\s+(\w+)\s*(?::[^=]+)?=\s*(?=\[)")
+_FOR_OF_RX = re.compile(r"\bfor\s*\(\s*const\s+(\w+)\s+of\s+(\w+)\s*\)")
+_MAP_RX = re.compile(r"\b(\w+)\.(?:map|forEach|flatMap)\(\s*\(?\s*(\w+)")
+
+
+class MetricFamily(NamedTuple):
+    name:   str
+    path:   Path
+    line:   int
+    labels: dict[str, tuple[int | None, str]]   # label -> (cardinality or None if unbounded, source)
+    series: int | None                           # None when any label is unbounded
+    names:  int                                  # metric names a templated name expands to
+
+
+def bounded_domains(text: str) -> dict[str, int]:
+    """{identifier: distinct values} for const array literals and the loop variables over them."""
+    arrays = {}
+    for m in _CONST_ARRAY_RX.finditer(text):
+        start = m.end()
+        arrays[m.group(1)] = len(split_args(text[start + 1:match_close(text, start)]))
+    domains = dict(arrays)
+    for rx in (_FOR_OF_RX, _MAP_RX):
+        for m in rx.finditer(text):
+            var, arr = (m.group(1), m.group(2)) if rx is _FOR_OF_RX else (m.group(2), m.group(1))
+            if arr in arrays:
+                domains[var] = arrays[arr]
+    return domains
+
+
+def classify_label_value(value: str, domains: dict[str, int]) -> tuple[int | None, str]:
+    """(distinct values or None, description) for one label value expression or template."""
+    exprs = re.findall(r"\$\{([^}]+)\}", value) if "${" in value else [] if not value.strip() else [value]
+    if not exprs or (value.strip()[:1] in "'\"" and "${" not in value):
+        return 1, "literal"
+    total = 1
+    for expr in exprs:
+        expr = expr.strip()
+        root = re.match(r"[\w$]+", expr)
+        if root and root.group(0) in domains:
+            total *= domains[root.group(0)]
+            continue
+        if re.fullmatch(r"""['"][^'"]*['"]""", expr):
+            continue
+        kind = "id-like" if _UNBOUNDED_LABEL_RX.search(expr) else "unresolved"
+        return None, f"{kind} `{expr}`"
+    return total, f"enum x{total}" if total > 1 else "literal"
+
+
+def metric_families() -> list[MetricFamily]:
+    """Families written as text exposition lines (`name{label="${v}"} ${value}`).
+
+    /api/metrics builds the exposition by hand; there is no prom-client
+    dependency, so client-library metric definitions are not parsed.
+    """
+    families: dict[str, MetricFamily] = {}
+    for path in sorted((ROOT / "src").rglob("*.ts")):
+        text = path.read_text(encoding="utf-8", errors="replace")
+        if "# TYPE" not in text:
+            continue
+        domains = bounded_domains(text)
+        for m in _EXPOSITION_RX.finditer(text):
+            name = m.group("name")
+            labels = {k: classify_label_value(v, domains) for k, v in _LABEL_PAIR_RX.findall(m.group("labels"))}
+            expansions = [domains.get(v) for v in re.findall(r"\$\{(\w+)\}", name)]
+            series = None if any(c is None for c, _ in labels.values()) or None in expansions else 1
+            if series is not None:
+                for c, _ in labels.values():
+                    series *= c
+                for e in expansions:
+                    series *= e
+            families[name] = MetricFamily(name, path, line_at(text, m.start()), labels, series,
+                                          prod(e or 1 for e in expansions))
+    return sorted(families.values(), key=lambda f: (f.series is not None, -(f.series or 0), f.name))
+
+
+def scrape_interval_s(metrics_path: str) -> float | None:
+    """scrape_interval of the job scraping metrics_path (global default otherwise)."""
+    cfg = load_yaml(ROOT / PROMETHEUS_CONFIG)
+    default = parse_duration_s(compose_get(cfg, "global.scrape_interval")) or 60
+    for job in cfg.get("scrape_configs") or []:
+        if isinstance(job, dict) and job.get("metrics_path") == metrics_path:
+            return parse_duration_s(job.get("scrape_interval")) or default
+    return None
+
+
+def check_metrics_cardinality() -> None:
+    """
+    Every distinct label set is a separate Prometheus series held in memory
+    and re-scraped each interval. Label values drawn from ids, paths or error
+    messages grow without bound; enum-like values (queue names, job states)
+    stay fixed.
+    """
+    families = metric_families()
+    if not families:
+        record("WARN", f"No metric definitions found under src/ ({METRICS_ROUTE} missing?)")
+        return
+    interval = scrape_interval_s("/api/metrics")
+    rows = []
+    unbounded: list[MetricFamily] = []
+    large: list[MetricFamily] = []
+    for fam in families:
+        labels = ", ".join(f"{k}={src}" for k, (_, src) in fam.labels.items()) or "no labels"
+        rows.append(f"{fam.path.relative_to(ROOT)}:{fam.line}  {fam.name}"
+                    + (f" (x{fam.names} names)" if fam.names > 1 else "") + "  "
+                    f"{fam.series if fam.series is not None else 'unbounded'} series  ({labels})")
+        if fam.series is None:
+            unbounded.append(fam)
+        elif fam.series > METRIC_SERIES_WARN:
+            large.append(fam)
+    total = sum(f.series or 0 for f in families)
+    scrape = (f", {total * 60 / interval:.0f} samples/min at {interval:g}s scrape" if interval
+              else f"; /api/metrics is not scraped in {PROMETHEUS_CONFIG}")
+    head = f"{sum(f.names for f in families)} metrics, ~{total} series{scrape}"
+    if unbounded:
+        record("WARN", f"Unbounded metric labels in {len(unbounded)} family(ies) -- {head}",
+               "\n".join(rows) + "\nReplace ids/paths/messages with a bounded enum (route template, error code).")
+    elif large:
+        record("WARN", f"{len(large)} metric family(ies) over {METRIC_SERIES_WARN} series -- {head}", "\n".join(rows))
+    else:
+        record("PASS", f"Metric labels bounded -- {head}", "\n".join(rows))
+
+
 # -- Deploy Tooling -----------------------------------------------------------
 
 def check_verify_deploy_script() -> None:
@@ -803,7 +2839,19 @@ def main() -> int:
                         help="Skip TypeScript type-check (faster for quick iterative runs)")
     parser.add_argument("--strict", action="store_true",
                         help="Treat WARNs as failures -- blocks deploy on any warning")
+    parser.add_argument("--jobs-per-day", type=int, default=JOBS_PER_DAY_DEFAULT,
+                        help=f"Ad-hoc BullMQ jobs per queue per day for the Redis memory estimate "
+                             f"(default {JOBS_PER_DAY_DEFAULT})")
+    parser.add_argument("--job-failure-rate", type=float, default=JOB_FAILURE_RATE,
+                        help=f"Share of jobs that fail, sizing removeOnFail retention "
+                             f"(default {JOB_FAILURE_RATE:g})")
+    parser.add_argument("--host-memory", default=HOST_MEMORY_DEFAULT,
+                        help=f"Host RAM for the compose budget, e.g. 16g (default {HOST_MEMORY_DEFAULT})")
+    parser.add_argument("--host-cpus", type=float, default=HOST_CPUS_DEFAULT,
+                        help=f"Host vCPUs for the compose budget (default {HOST_CPUS_DEFAULT:g})")
     args = parser.parse_args()
+    if not 0 <= args.job_failure_rate <= 1:
+        parser.error("--job-failure-rate must be between 0 and 1")
 
     print(f"\n{BOLD}{'=' * 68}{RST}")
     print(f"{BOLD}  Lebensordner Pre-Deploy QA Audit{RST}")
@@ -841,6 +2889,36 @@ def main() -> int:
     check_api_routes_have_auth()
     check_critical_endpoints_fail_open()
 
+    section("Query Performance")
+    check_n_plus_one_queries()
+    check_select_star_overfetch()
+    check_unbounded_list_queries()
+    check_sequential_await_waterfalls()
+    check_index_coverage()
+
+    section("Background Jobs")
+    check_bullmq_config()
+    check_worker_loopback_fetches()
+    check_redis_connection_fanout()
+    check_redis_memory_policy(args.jobs_per_day, args.job_failure_rate)
+
+    section("Host Capacity")
+    check_compose_resource_budget(args.host_memory, args.host_cpus)
+    check_compose_healthcheck_load()
+    check_postgres_tuning(args.host_memory)
+
+    section("Edge (Caddy)")
+    check_caddy_static_caching()
+    check_caddy_encoding()
+    check_caddy_stream_proxying()
+    check_caddy_http3()
+
+    section("Next.js Build Config")
+    check_next_config_profile()
+
+    section("Observability")
+    check_metrics_cardinality()
+
     section("Deploy Tooling")
     check_verify_deploy_script()
     check_verify_deploy_internal_supabase_probe()
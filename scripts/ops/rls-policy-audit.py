@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+RLS policy performance regression guard.
+
+Replays the Supabase migrations (see sql_schema.py) and lints the row-level
+security policies that exist at the end:
+
+  - per-row-call: auth.uid() / auth.jwt() / current_setting() not wrapped as
+    `(select auth.uid())`. Unwrapped, Postgres re-evaluates the call for every
+    row the policy filters instead of once per statement (initPlan).
+  - unindexed-subquery: EXISTS / IN subqueries whose join or filter columns on
+    the inner table have no covering index, so every outer row runs a scan.
+  - overlapping-permissive: more than one permissive policy for the same table,
+    command and role. Postgres evaluates all of them and ORs the results.
+
+Fails only on findings that are not in rls-policy-baseline.json, so existing
+policies can be migrated incrementally. --update-baseline is a ratchet: it
+refuses to record new findings.
+
+Usage:
+    python scripts/ops/rls-policy-audit.py                    # regression guard
+    python scripts/ops/rls-policy-audit.py --details          # list every finding per table
+    python scripts/ops/rls-policy-audit.py --update-baseline  # ratchet baseline down
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+from sql_schema import Policy, Schema, covering_index, load_schema, table_name
+
+ROOT = Path(__file__).resolve().parents[2]
+BASELINE_FILE = Path(__file__).resolve().parent / "rls-policy-baseline.json"
+
+RULES = ("per-row-call", "unindexed-subquery", "overlapping-permissive")
+
+# Stable per-statement functions that Postgres only caches when wrapped in a sub-select.
+PER_ROW_CALL_RX = re.compile(r"\b(auth\.(?:uid|jwt|role|email)|current_setting)\s*\(", re.IGNORECASE)
+_WRAPPED_PREFIX_RX = re.compile(r"\(\s*select\s+$", re.IGNORECASE)
+_SUBQUERY_RX = re.compile(r"\(\s*SELECT\b", re.IGNORECASE)
+_FROM_RX = re.compile(
+    r"\bFROM\s+(?P<table>(?:\w+\.)?\w+)(?:\s+(?:AS\s+)?(?P<alias>(?!WHERE\b|JOIN\b|ON\b)\w+))?",
+    re.IGNORECASE,
+)
+_COLUMN_EQ_RX = re.compile(
+    r"(?:\b(?P<lq>\w+)\.)?\b(?P<left>\w+)\b(?!\s*\()\s*(?:=|\bIN\b)"
+    r"|(?:=)\s*(?:\b(?P<rq>\w+)\.)?\b(?P<right>\w+)\b(?!\s*\()",
+    re.IGNORECASE,
+)
+_COLUMN_IS_RX = re.compile(r"(?:\b\w+\.)?\b(\w+)\s+IS\b", re.IGNORECASE)
+
+COMMANDS = ("SELECT", "INSERT", "UPDATE", "DELETE")
+# service_role has BYPASSRLS in Supabase; its policies are never evaluated.
+BYPASS_ROLES = {"service_role"}
+CLIENT_ROLES = ("anon", "authenticated")
+
+
+class Finding(NamedTuple):
+    table:  str
+    rule:   str
+    key:    str   # stable identity stored in the baseline
+    detail: str
+    source: str
+
+
+def _paren_span(text: str, open_idx: int) -> int:
+    depth = 0
+    for j in range(open_idx, len(text)):
+        if text[j] == "(":
+            depth += 1
+        elif text[j] == ")":
+            depth -= 1
+            if depth == 0:
+                return j
+    return len(text)
+
+
+def per_row_calls(policy: Policy) -> list[Finding]:
+    counts: dict[str, int] = defaultdict(int)
+    for expr in (policy.using, policy.check):
+        for m in PER_ROW_CALL_RX.finditer(expr or ""):
+            if not _WRAPPED_PREFIX_RX.search(expr[:m.start()]):
+                counts[m.group(1).lower() + "()"] += 1
+    return [
+        Finding(
+            policy.table, "per-row-call", f"per-row-call|{policy.name}|{fn}",
+            f'"{policy.name}" ({policy.command}): {fn} x{n} -> (select {fn})', policy.source,
+        )
+        for fn, n in sorted(counts.items())
+    ]
+
+
+def subquery_join_columns(body: str, schema: Schema) -> tuple[str, set[str], set[str]] | None:
+    """(inner table, columns compared with = / IN, columns tested with IS) for one sub-select body."""
+    m = _FROM_RX.search(body)
+    if not m:
+        return None
+    inner = table_name(m.group("table"))
+    if inner not in schema.tables:
+        return None
+    qualifiers = {inner.split(".")[-1].lower()}
+    if m.group("alias"):
+        qualifiers.add(m.group("alias").lower())
+    known = schema.tables[inner].columns
+    cols: set[str] = set()
+    for eq in _COLUMN_EQ_RX.finditer(body[m.end():]):
+        qualifier = (eq.group("lq") or eq.group("rq") or "").lower()
+        col = (eq.group("left") or eq.group("right") or "").lower()
+        if col not in known:
+            continue
+        if qualifier in qualifiers or (not qualifier and col in known):
+            cols.add(col)
+    tested = {
+        t.group(1).lower() for t in _COLUMN_IS_RX.finditer(body[m.end():])
+        if t.group(1).lower() in known
+    }
+    return inner, cols, tested
+
+
+def unindexed_subqueries(policy: Policy, schema: Schema) -> list[Finding]:
+    findings = []
+    for expr in (policy.using, policy.check):
+        for m in _SUBQUERY_RX.finditer(expr or ""):
+            body = expr[m.start() + 1:_paren_span(expr, m.start())]
+            joined = subquery_join_columns(body, schema)
+            if not joined:
+                continue
+            inner, cols, tested = joined
+            if not cols:
+                continue
+            indexes = schema.indexes_on(inner)
+            if any(covering_index(indexes, col, cols - {col}, tested) for col in cols):
+                continue
+            key_cols = ", ".join(sorted(cols))
+            findings.append(Finding(
+                policy.table, "unindexed-subquery",
+                f"unindexed-subquery|{policy.name}|{inner}({key_cols})",
+                f'"{policy.name}" ({policy.command}): sub-select on {inner}({key_cols}) has no covering index',
+                policy.source,
+            ))
+    return findings
+
+
+def overlapping_permissive(policies: list[Policy]) -> list[Finding]:
+    """One finding per (table, command, set of overlapping policies), listing the roles."""
+    groups: dict[tuple[str, str, tuple[str, ...]], list[str]] = defaultdict(list)
+    sources: dict[tuple[str, str, tuple[str, ...]], str] = {}
+    explicit_roles = {r for p in policies for r in p.roles} - BYPASS_ROLES - {"public"}
+    for table in sorted({p.table for p in policies}):
+        table_policies = [p for p in policies if p.table == table and p.permissive]
+        for command in COMMANDS:
+            for role in sorted(set(CLIENT_ROLES) | explicit_roles):
+                applying = sorted(
+                    p.name for p in table_policies
+                    if p.command in ("ALL", command) and (role in p.roles or "public" in p.roles)
+                    and not set(p.roles) <= BYPASS_ROLES
+                )
+                if len(applying) > 1:
+                    key = (table, command, tuple(applying))
+                    groups[key].append(role)
+                    sources.setdefault(key, next(
+                        p.source for p in table_policies if p.name == applying[0]))
+    return [
+        Finding(
+            table, "overlapping-permissive",
+            f"overlapping-permissive|{command}|{'+'.join(names)}",
+            f"{command} to {', '.join(roles)}: {len(names)} permissive policies "
+            f"({'; '.join(names)}) -> merge into one",
+            sources[(table, command, names)],
+        )
+        for (table, command, names), roles in groups.items()
+    ]
+
+
+def collect_findings(schema: Schema) -> list[Finding]:
+    policies = list(schema.policies.values())
+    findings: list[Finding] = []
+    for policy in policies:
+        findings += per_row_calls(policy)
+        findings += unindexed_subqueries(policy, schema)
+    findings += overlapping_permissive(policies)
+    return sorted(findings, key=lambda f: (f.table, RULES.index(f.rule), f.key))
+
+
+def load_baseline() -> dict[str, set[str]]:
+    """{table: finding keys} from BASELINE_FILE."""
+    data = json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+    return {table: set(keys) for table, keys in data.get("findings", {}).items()}
+
+
+def write_baseline(findings: list[Finding]) -> None:
+    per_table: dict[str, list[str]] = defaultdict(list)
+    for f in findings:
+        per_table[f.table].append(f.key)
+    data = {
+        "updated": datetime.date.today().isoformat(),
+        "findings": {table: sorted(keys) for table, keys in sorted(per_table.items())},
+    }
+    tmp = BASELINE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    tmp.replace(BASELINE_FILE)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="RLS policy performance regression guard")
+    parser.add_argument(
+        "--details",
+        action="store_true",
+        help="List every finding per table, not only new ones",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Record current findings as the new baseline (refused if any are new)",
+    )
+    args = parser.parse_args()
+
+    if not BASELINE_FILE.exists():
+        print(f"FAIL: baseline file not found: {BASELINE_FILE.relative_to(ROOT)}")
+        return 1
+
+    schema = load_schema()
+    if not schema.policies:
+        print("FAIL: no CREATE POLICY statements found under supabase/.")
+        return 1
+
+    findings = collect_findings(schema)
+    baseline = load_baseline()
+    new = [f for f in findings if f.key not in baseline.get(f.table, set())]
+
+    by_table: dict[str, list[Finding]] = defaultdict(list)
+    for f in findings:
+        by_table[f.table].append(f)
+
+    print("RLS Policy Performance Audit (regression guard)")
+    print(f"{len(schema.policies)} policies on {len({p.table for p in schema.policies.values()})} tables")
+    print("Findings per table (current / baseline):")
+    for table in sorted(set(by_table) | set(baseline)):
+        current = by_table.get(table, [])
+        per_rule = ", ".join(
+            f"{rule} {n}" for rule in RULES
+            if (n := sum(1 for f in current if f.rule == rule))
+        )
+        print(f"- {table}: {len(current)} / {len(baseline.get(table, set()))}"
+              + (f"  ({per_rule})" if per_rule else ""))
+        if args.details:
+            for f in current:
+                print(f"    {f.rule}: {f.detail}  [{f.source}]")
+
+    if new:
+        print("\nFAIL: New RLS performance findings.")
+        for f in new:
+            print(f"- {f.table} {f.rule}: {f.detail}")
+            print(f"    {f.source}")
+        print(
+            "\nWrap auth.uid() as (select auth.uid()), index sub-select join columns,"
+            " and merge permissive policies per command."
+        )
+        if args.update_baseline:
+            print("Baseline not updated: the ratchet only accepts findings that stay or go away.")
+        return 1
+
+    if args.update_baseline:
+        write_baseline(findings)
+        print(f"\nBaseline updated: {BASELINE_FILE.relative_to(ROOT)}")
+
+    print("\nPASS: No new RLS performance findings beyond baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
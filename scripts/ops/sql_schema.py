@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Schema model of the Supabase migrations for the ops audit scripts.
+
+Replays supabase/legacy-bootstrap.sql, the numbered supabase/migration_0*.sql
+files and supabase/migrations/*.sql in order, tracking tables, their columns
+and every index that exists at the end: explicit CREATE INDEX statements plus
+the implicit ones behind PRIMARY KEY / UNIQUE constraints. DROP INDEX and
+DROP TABLE are applied, so a later migration can undo an earlier one.
+Row-level security policies are tracked the same way (CREATE / DROP POLICY).
+
+This is a pattern-level parser for the DDL this repo writes, not a Postgres
+grammar. Statements it does not recognise are ignored.
+
+Usage from another audit script in scripts/ops/:
+    from sql_schema import load_schema
+    schema = load_schema()
+    schema.tables["documents"].indexes
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+ROOT = Path(__file__).resolve().parents[2]
+SUPABASE_DIR = ROOT / "supabase"
+
+
+class Index(NamedTuple):
+    name:    str
+    table:   str
+    columns: tuple[str, ...]  # leading identifiers; expression keys are kept as written
+    unique:  bool
+    where:   str | None       # partial-index predicate
+    source:  str              # file:line of the defining statement
+
+
+class Table(NamedTuple):
+    name:    str
+    columns: dict[str, str]   # column -> declared type
+    indexes: dict[str, Index]
+    source:  str
+
+
+class Policy(NamedTuple):
+    name:       str
+    table:      str
+    command:    str              # ALL | SELECT | INSERT | UPDATE | DELETE
+    permissive: bool
+    roles:      tuple[str, ...]  # lower-cased; ("public",) when no TO clause
+    using:      str | None
+    check:      str | None
+    source:     str
+
+
+class Schema(NamedTuple):
+    tables:   dict[str, Table]
+    policies: dict[tuple[str, str], Policy]  # (table, policy name) -> Policy
+
+    def indexes_on(self, table: str) -> list[Index]:
+        t = self.tables.get(table)
+        return list(t.indexes.values()) if t else []
+
+
+def migration_files(root: Path = SUPABASE_DIR) -> list[Path]:
+    """Migration files in the order they are applied."""
+    files = []
+    bootstrap = root / "legacy-bootstrap.sql"
+    if bootstrap.exists():
+        files.append(bootstrap)
+    files += sorted(root.glob("migration_*.sql"))
+    files += sorted((root / "migrations").glob("*.sql"))
+    return files
+
+
+def split_statements(sql: str) -> list[tuple[str, int]]:
+    """(statement, 1-based start line) with comments removed.
+
+    Semicolons inside quotes and $tag$ bodies do not end a statement.
+    """
+    out: list[tuple[str, int]] = []
+    buf: list[str] = []
+    start_line = line = 1
+    started = False
+    i = 0
+    n = len(sql)
+    while i < n:
+        c = sql[i]
+        if sql.startswith("--", i):
+            nl = sql.find("\n", i)
+            i = n if nl < 0 else nl
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            line += sql.count("\n", i, end)
+            i = end
+            continue
+        if not started and not c.isspace():
+            start_line, started = line, True
+        if c == "$":
+            tag = re.match(r"\$(?:[A-Za-z_]\w*)?\$", sql[i:])
+            if tag:
+                end = sql.find(tag.group(0), i + len(tag.group(0)))
+                end = n if end < 0 else end + len(tag.group(0))
+                buf.append(sql[i:end])
+                line += sql.count("\n", i, end)
+                i = end
+                continue
+        if c == "'":
+            j = i + 1
+            while j < n:
+                if sql[j] == "'" and sql.startswith("''", j):
+                    j += 2
+                    continue
+                if sql[j] == "'":
+                    break
+                j += 1
+            buf.append(sql[i:j + 1])
+            line += sql.count("\n", i, j + 1)
+            i = j + 1
+            continue
+        if c == ";":
+            stmt = "".join(buf).strip()
+            if stmt:
+                out.append((stmt, start_line))
+            buf, started = [], False
+            i += 1
+            continue
+        if c == "\n":
+            line += 1
+        buf.append(c)
+        i += 1
+    stmt = "".join(buf).strip()
+    if stmt:
+        out.append((stmt, start_line))
+    return out
+
+
+def split_top_level(body: str, sep: str = ",") -> list[str]:
+    """Split body on sep outside parentheses and quotes."""
+    parts, depth, cur, quote = [], 0, [], False
+    for c in body:
+        if c == "'":
+            quote = not quote
+        elif not quote:
+            if c == "(":
+                depth += 1
+            elif c == ")":
+                depth -= 1
+            elif c == sep and depth == 0:
+                parts.append("".join(cur).strip())
+                cur = []
+                continue
+        cur.append(c)
+    if "".join(cur).strip():
+        parts.append("".join(cur).strip())
+    return parts
+
+
+def _paren_body(text: str, open_idx: int) -> tuple[str, int]:
+    """(contents, index after the closing paren) for the paren at text[open_idx]."""
+    depth = 0
+    for j in range(open_idx, len(text)):
+        if text[j] == "(":
+            depth += 1
+        elif text[j] == ")":
+            depth -= 1
+            if depth == 0:
+                return text[open_idx + 1:j], j + 1
+    return text[open_idx + 1:], len(text)
+
+
+def table_name(qualified: str) -> str:
+    """`public."documents"` -> documents; other schemas keep their prefix."""
+    name = qualified.replace('"', "").strip()
+    return name[len("public."):] if name.lower().startswith("public.") else name
+
+
+def _key_columns(body: str) -> tuple[str, ...]:
+    cols = []
+    for part in split_top_level(body):
+        m = re.match(r'"?(\w+)"?\s*(?:ASC|DESC|NULLS\s+\w+|\s)*$', part, re.IGNORECASE)
+        cols.append(m.group(1).lower() if m else part.strip())
+    return tuple(cols)
+
+
+_IDENT = r'(?:"?\w+"?\.)?"?\w+"?'
+_CREATE_TABLE_RX = re.compile(
+    rf"^CREATE\s+(?:UNLOGGED\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?P<name>{_IDENT})\s*\(",
+    re.IGNORECASE,
+)
+_CREATE_INDEX_RX = re.compile(
+    rf"^CREATE\s+(?P<unique>UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?"
+    rf"(?P<name>{_IDENT})?\s*ON\s+(?:ONLY\s+)?(?P<table>{_IDENT})\s*(?:USING\s+\w+\s*)?\(",
+    re.IGNORECASE,
+)
+_ALTER_TABLE_RX = re.compile(
+    rf"^ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?(?P<name>{_IDENT})\s+(?P<actions>.*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+_DROP_INDEX_RX = re.compile(
+    rf"^DROP\s+INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+EXISTS\s+)?(?P<names>{_IDENT}(?:\s*,\s*{_IDENT})*)",
+    re.IGNORECASE,
+)
+_DROP_TABLE_RX = re.compile(rf"^DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?P<name>{_IDENT})", re.IGNORECASE)
+_CONSTRAINT_KEY_RX = re.compile(
+    r"^(?:CONSTRAINT\s+\"?(?P<name>\w+)\"?\s+)?(?P<kind>PRIMARY\s+KEY|UNIQUE)\s*(?:NULLS\s+NOT\s+DISTINCT\s*)?\(",
+    re.IGNORECASE,
+)
+_CREATE_POLICY_RX = re.compile(
+    rf'^CREATE\s+POLICY\s+(?P<name>"[^"]+"|\w+)\s+ON\s+(?P<table>{_IDENT})'
+    r"(?:\s+AS\s+(?P<mode>PERMISSIVE|RESTRICTIVE))?"
+    r"(?:\s+FOR\s+(?P<command>ALL|SELECT|INSERT|UPDATE|DELETE))?"
+    r"(?:\s+TO\s+(?P<roles>.+?))?(?=\s+USING\b|\s+WITH\s+CHECK\b|$)",
+    re.IGNORECASE,
+)
+_DROP_POLICY_RX = re.compile(
+    rf'^DROP\s+POLICY\s+(?:IF\s+EXISTS\s+)?(?P<name>"[^"]+"|\w+)\s+ON\s+(?P<table>{_IDENT})',
+    re.IGNORECASE,
+)
+_NOT_A_COLUMN = {"constraint", "primary", "unique", "foreign", "check", "exclude", "like"}
+
+
+class _Builder:
+    def __init__(self) -> None:
+        self.tables: dict[str, Table] = {}
+        self.policies: dict[tuple[str, str], Policy] = {}
+
+    def table(self, name: str, source: str) -> Table:
+        if name not in self.tables:
+            self.tables[name] = Table(name, {}, {}, source)
+        return self.tables[name]
+
+    def add_index(self, index: Index) -> None:
+        self.table(index.table, index.source).indexes[index.name] = index
+
+    def column_def(self, table: str, definition: str, source: str) -> None:
+        m = re.match(r'"?(\w+)"?\s+(.*)$', definition, re.DOTALL)
+        if not m or m.group(1).lower() in _NOT_A_COLUMN:
+            return
+        col, rest = m.group(1).lower(), m.group(2)
+        self.table(table, source).columns[col] = rest.split()[0].lower() if rest.split() else ""
+        if re.search(r"\bPRIMARY\s+KEY\b", rest, re.IGNORECASE):
+            self.add_index(Index(f"{table}_pkey", table, (col,), True, None, source))
+        elif re.search(r"\bUNIQUE\b", rest, re.IGNORECASE):
+            self.add_index(Index(f"{table}_{col}_key", table, (col,), True, None, source))
+
+    def table_constraint(self, table: str, definition: str, source: str) -> bool:
+        m = _CONSTRAINT_KEY_RX.match(definition)
+        if not m:
+            return False
+        body, _ = _paren_body(definition, m.end() - 1)
+        cols = _key_columns(body)
+        primary = m.group("kind").upper().startswith("PRIMARY")
+        name = m.group("name") or (f"{table}_pkey" if primary else f"{table}_{'_'.join(cols)}_key")
+        self.add_index(Index(name, table, cols, True, None, source))
+        return True
+
+    def policy(self, m: re.Match[str], stmt: str, source: str) -> Policy:
+        clauses = stmt[m.end():]
+        using = check = None
+        if u := re.match(r"\s+USING\s*\(", clauses, re.IGNORECASE):
+            using, after = _paren_body(clauses, u.end() - 1)
+            clauses = clauses[after:]
+        if c := re.match(r"\s+WITH\s+CHECK\s*\(", clauses, re.IGNORECASE):
+            check, _ = _paren_body(clauses, c.end() - 1)
+        roles = tuple(r.strip().strip('"').lower() for r in (m.group("roles") or "public").split(","))
+        return Policy(
+            m.group("name").strip('"'), table_name(m.group("table")),
+            (m.group("command") or "ALL").upper(),
+            (m.group("mode") or "PERMISSIVE").upper() == "PERMISSIVE",
+            roles, using, check, source,
+        )
+
+    def apply(self, stmt: str, source: str) -> None:
+        if m := _CREATE_TABLE_RX.match(stmt):
+            name = table_name(m.group("name"))
+            body, _ = _paren_body(stmt, m.end() - 1)
+            self.table(name, source)
+            for part in split_top_level(body):
+                if not self.table_constraint(name, part, source):
+                    self.column_def(name, part, source)
+        elif m := _CREATE_INDEX_RX.match(stmt):
+            table = table_name(m.group("table"))
+            body, after = _paren_body(stmt, m.end() - 1)
+            where = re.search(r"\bWHERE\b(.*)$", stmt[after:], re.IGNORECASE | re.DOTALL)
+            name = table_name(m.group("name") or f"{table}_idx")
+            self.add_index(Index(
+                name, table, _key_columns(body), bool(m.group("unique")),
+                " ".join(where.group(1).split()) if where else None, source,
+            ))
+        elif m := _ALTER_TABLE_RX.match(stmt):
+            table = table_name(m.group("name"))
+            for action in split_top_level(m.group("actions")):
+                add_col = re.match(r"ADD\s+(?:COLUMN\s+)?(?:IF\s+NOT\s+EXISTS\s+)?(.*)$",
+                                   action, re.IGNORECASE | re.DOTALL)
+                if not add_col:
+                    continue
+                if not self.table_constraint(table, add_col.group(1), source):
+                    self.column_def(table, add_col.group(1), source)
+        elif m := _DROP_INDEX_RX.match(stmt):
+            for qualified in split_top_level(m.group("names")):
+                name = table_name(qualified)
+                for t in self.tables.values():
+                    t.indexes.pop(name, None)
+        elif m := _DROP_TABLE_RX.match(stmt):
+            dropped = table_name(m.group("name"))
+            self.tables.pop(dropped, None)
+            self.policies = {k: v for k, v in self.policies.items() if k[0] != dropped}
+        elif m := _CREATE_POLICY_RX.match(stmt):
+            policy = self.policy(m, stmt, source)
+            self.policies[(policy.table, policy.name)] = policy
+        elif m := _DROP_POLICY_RX.match(stmt):
+            self.policies.pop((table_name(m.group("table")), m.group("name").strip('"')), None)
+
+
+def load_schema(files: list[Path] | None = None) -> Schema:
+    """Schema after replaying every migration file in order."""
+    builder = _Builder()
+    for path in migration_files() if files is None else files:
+        rel = path.relative_to(ROOT).as_posix() if path.is_relative_to(ROOT) else str(path)
+        sql = path.read_text(encoding="utf-8", errors="replace")
+        for stmt, line in split_statements(sql):
+            builder.apply(" ".join(stmt.split()), f"{rel}:{line}")
+    return Schema(builder.tables, builder.policies)
+
+
+_PREDICATE_WORDS = {
+    "and", "or", "not", "is", "null", "true", "false", "in", "like", "ilike",
+    "between", "any", "all", "distinct", "from", "current_date", "current_timestamp",
+}
+
+
+def predicate_columns(where: str) -> set[str]:
+    """Lower-cased column names referenced by a partial-index predicate."""
+    where = re.sub(r"'(?:[^']|'')*'", " ", where)
+    where = re.sub(r"::\s*\w+", " ", where)
+    return {
+        m.group(1).lower()
+        for m in re.finditer(r"(?:\b\w+\.)?\b([A-Za-z_]\w*)\b(?!\s*\()", where)
+        if m.group(1).lower() not in _PREDICATE_WORDS
+    }
+
+
+def covering_index(indexes: list[Index], column: str, equality: set[str] = frozenset(),
+                   pinned: set[str] = frozenset()) -> Index | None:
+    """First index usable for a predicate or sort on column.
+
+    An index serves column when column is its leading key, or when every key
+    before it is pinned by an equality filter in the same query. A partial
+    index only counts when the query also constrains every column of its
+    WHERE predicate (column itself, equality or pinned, e.g. an IS NULL
+    filter); otherwise the planner cannot prove the predicate and skips it.
+    """
+    constrained = {column} | set(equality) | set(pinned)
+    for index in indexes:
+        if index.where and not predicate_columns(index.where) <= constrained:
+            continue
+        for key in index.columns:
+            if key == column:
+                return index
+            if key not in equality:
+                break
+    return None
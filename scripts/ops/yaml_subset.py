@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Minimal YAML reader for the deploy configs checked by the ops audit scripts.
+
+The CI guard jobs run on a bare Python without PyYAML, and the files they
+read (deploy/docker-compose.yml, Prometheus, Loki and Promtail configs) only
+use a small subset: block mappings, block lists (of scalars or mappings),
+one-line or multi-line flow lists and quoted/plain scalars. Flow lists and
+scalars are returned as raw strings; use flow_list() to split a flow list.
+Anchors, aliases and multi-document files are not supported.
+
+Usage from another audit script in scripts/ops/:
+    from yaml_subset import load_yaml
+    cfg = load_yaml(ROOT / "deploy/loki/loki-config.yml")
+    cfg["limits_config"]["retention_period"]
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+
+def yaml_scalar(raw: str) -> str:
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in "'\"":
+        return raw[1:-1]
+    return raw
+
+
+def flow_list(value: object) -> list[str]:
+    """Items of a block list or a `[a, "b"]` flow list; a plain scalar is a one-item list."""
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    if not isinstance(value, str) or not value.strip():
+        return []
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        return [yaml_scalar(v) for v in re.findall(r'"[^"]*"|\'[^\']*\'|[^,\s][^,]*', value[1:-1])]
+    return [value]
+
+
+def _yaml_lines(text: str) -> list[tuple[int, str, int]]:
+    """(indent, content, lineno) for each meaningful line; flow lists spanning lines are joined."""
+    out: list[tuple[int, str, int]] = []
+    pending: list[str] = []
+    for lineno, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if pending:
+            pending.append(stripped)
+            joined = " ".join(pending)
+            if joined.count("[") <= joined.count("]"):
+                indent, _, start = out[-1]
+                out[-1] = (indent, joined, start)
+                pending = []
+            continue
+        if not stripped or stripped.startswith("#"):
+            continue
+        content = re.sub(r"\s+#(?![^'\"]*['\"][^'\"]*$).*$", "", stripped)
+        out.append((len(line) - len(line.lstrip()), content, lineno))
+        if content.count("[") > content.count("]"):
+            pending = [content]
+    return out
+
+
+def _yaml_node(lines: list[tuple[int, str, int]], i: int, indent: int) -> tuple[object, int]:
+    if lines[i][1].startswith("- "):
+        items: list[object] = []
+        while i < len(lines) and lines[i][0] == indent and lines[i][1].startswith("- "):
+            item = lines[i][1][2:].strip()
+            if re.match(r"[\w.-]+:(?:\s|$)", item):
+                # `- key: value` opens a mapping whose keys sit two columns in;
+                # parse it from a local copy so `lines` is left untouched.
+                end = i + 1
+                while end < len(lines) and lines[end][0] > indent:
+                    end += 1
+                sub = [(indent + 2, item, lines[i][2])] + lines[i + 1:end]
+                items.append(_yaml_node(sub, 0, indent + 2)[0])
+                i = end
+                continue
+            items.append(yaml_scalar(item))
+            i += 1
+        return items, i
+    node: dict[str, object] = {}
+    while i < len(lines) and lines[i][0] == indent:
+        key, _, rest = lines[i][1].partition(":")
+        key = yaml_scalar(key)
+        i += 1
+        if rest.strip() and not rest.strip().startswith("&"):
+            node[key] = yaml_scalar(rest)
+        elif i < len(lines) and (lines[i][0] > indent or
+                                 (lines[i][0] == indent and lines[i][1].startswith("- "))):
+            node[key], i = _yaml_node(lines, i, lines[i][0])
+        else:
+            node[key] = ""
+    return node, i
+
+
+def parse_yaml(text: str) -> object:
+    lines = _yaml_lines(text)
+    return _yaml_node(lines, 0, lines[0][0])[0] if lines else {}
+
+
+def load_yaml(path: Path) -> dict:
+    """Top-level mapping of a YAML file ({} when missing or not a mapping)."""
+    if not path.exists():
+        return {}
+    top = parse_yaml(path.read_text(encoding="utf-8", errors="replace"))
+    return top if isinstance(top, dict) else {}